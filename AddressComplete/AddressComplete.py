@@ -1,12 +1,30 @@
+import contextvars
+import time
 import urllib.parse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-from .ErrorHandling import FindError, RetrieveError
+from .Coalescing import SingleFlight
+from .Decoding import get_decoder, project
+from .ErrorHandling import (
+    ERROR_CODE_TABLES,
+    get_error_class,
+    get_error_code,
+)
+from .KeyPool import KeyPool
+from .RateLimit import THROTTLE_ERROR_CODES
+from .Results import LookupResult
+from .Tracing import NULL_TRACE
+from .Transport import HTTP2Session, resolve_http2
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
-class AddressComplete:
-    """A client module for the Canada Post AddressComplete API."""
+class _AddressCompleteBase:
+    """Request building and response checking shared by the sync and
+    async clients."""
+
+    DEFAULT_BASE_URL = "https://ws1.postescanada-canadapost.ca"
 
     DEFAULT_RETRIEVE_ENDPOINT = (
         "https://ws1.postescanada-canadapost.ca/addresscomplete/interactive/"
@@ -20,17 +38,397 @@ class AddressComplete:
         "Find&version=2.1&endpoint=json3.ws"
         )
     
-    def __init__(self, api_key):
+    # Every exception an API error code can map to, per operation.
+    _API_ERRORS = {
+        operation: tuple(set(table.values()))
+        for operation, table in ERROR_CODE_TABLES.items()
+    }
+    
+    def _set_api_key(self, api_key):
+        """Sets the API key, or the key pool requests rotate over."""
+        if isinstance(api_key, KeyPool):
+            self.api_key = None
+            self.key_pool = api_key
+        else:
+            self.api_key = api_key
+            self.key_pool = None
+
+    def _set_base_url(self, base_url):
+        """Points the find and retrieve endpoints at ``base_url``."""
+        self.find_endpoint = self.DEFAULT_FIND_ENDPOINT
+        self.retrieve_endpoint = self.DEFAULT_RETRIEVE_ENDPOINT
+        if base_url is not None:
+            base_url = base_url.rstrip("/")
+            prefix = len(self.DEFAULT_BASE_URL)
+            self.find_endpoint = base_url + self.DEFAULT_FIND_ENDPOINT[prefix:]
+            self.retrieve_endpoint = (
+                base_url + self.DEFAULT_RETRIEVE_ENDPOINT[prefix:]
+            )
+
+    def _find_url(self, search_term, country, max_suggestions,
+                  language_preference, container=None):
+        """Builds the Find request URL. With a key pool, the key is
+        added per attempt by ``_keyed_url``."""
+        params = {} if self.key_pool is not None else {"Key": self.api_key}
+        params.update({
+            "SearchTerm": search_term,
+            "Country": country,
+            "MaxSuggestions": max_suggestions,
+            "LanguagePreference": language_preference,
+        })
+        if container is not None:
+            params["Container"] = container
+        return f"{self.find_endpoint}&{urllib.parse.urlencode(params)}"
+
+    def _retrieve_url(self, id):
+        """Builds the Retrieve request URL."""
+        key = "" if self.key_pool is not None else f"&Key={self.api_key}"
+        return (
+            f"{self.retrieve_endpoint}{key}"
+            f"&Id={urllib.parse.quote(id)}"
+        )
+
+    @staticmethod
+    def _keyed_url(url, key):
+        """Adds a key taken from the key pool to a request URL."""
+        return f"{url}&{urllib.parse.urlencode({'Key': key})}"
+
+    def _check_response(self, response, operation, key=None):
+        """Raises the mapped error if the decoded response contains one.
+        
+        With ``raise_errors=False`` the error is returned as a failed
+        ``LookupResult`` instead, unless the retry policy or circuit
+        breaker has to see it.
+        
+        Args:
+            response (dict): The decoded JSON response.
+            operation (str): "find" or "retrieve".
+            key (str): The API key the request was sent with.
+        """
+        error_code = get_error_code(response)
+        if error_code is None:
+            return response
+        if (self.rate_limiter is not None
+                and error_code in THROTTLE_ERROR_CODES):
+            self.rate_limiter.penalize(key or self.api_key)
+        error_class = get_error_class(error_code, operation)
+        if self.metrics is not None:
+            self.metrics.count_error(operation, error_class.__name__)
+        if not self.raise_errors and not self._is_handled(error_class):
+            return LookupResult(None, error_class, error_code)
+        error = error_class()
+        error.error_code = error_code
+        raise error
+
+    def _is_handled(self, error_class):
+        """Returns True if the key pool, the retry policy or the circuit
+        breaker acts on errors of ``error_class``."""
+        if (self.key_pool is not None
+                and self.key_pool.is_key_error(error_class)):
+            return True
+        if self.retry_policy is None and self.circuit_breaker is None:
+            return False
+        error = error_class()
+        return (
+            (self.retry_policy is not None
+             and self.retry_policy.is_retryable(error))
+            or (self.circuit_breaker is not None
+                and self.circuit_breaker.is_failure(error))
+        )
+
+    def _wrap_error(self, error, operation):
+        """Returns a failed ``LookupResult`` for an API error raised in
+        non-raising mode, or None if ``error`` is not an API error."""
+        if isinstance(error, self._API_ERRORS[operation]):
+            return LookupResult(None, type(error),
+                                getattr(error, "error_code", None))
+        return None
+
+    @staticmethod
+    def _wrap_response(response, fields):
+        """Projects a successful response on ``fields`` and wraps it in
+        a ``LookupResult`` if it is not one already."""
+        if isinstance(response, LookupResult):
+            return response
+        if fields is not None:
+            response = project(response, fields)
+        return LookupResult(response)
+
+    @staticmethod
+    def _unwrap(response):
+        """Returns the response of a ``LookupResult``, raising its error
+        if it failed."""
+        if isinstance(response, LookupResult):
+            return response.unwrap()
+        return response
+
+    def _before_attempt(self):
+        """Raises CircuitOpenError if the circuit breaker is open."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call()
+
+    def _abandon_attempt(self):
+        """Releases the circuit breaker probe of an attempt interrupted
+        before it had an outcome (cancelled or interrupted)."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release()
+
+    def _after_attempt(self, error, attempt, operation):
+        """Records the outcome of an attempt.
+        
+        Args:
+            error (Exception): The error raised by the attempt, or None.
+            attempt (int): The attempt number, starting at 1.
+            operation (str): "find" or "retrieve".
+        
+        Returns:
+            The seconds to wait before retrying, or None to stop.
+        """
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(error)
+        if error is None:
+            return None
+        policy = self.retry_policy
+        delay = None
+        if (policy is not None and attempt < policy.max_attempts
+                and policy.is_retryable(error)):
+            delay = policy.delay(attempt)
+        if self.metrics is not None:
+            # API errors were already counted by _check_response.
+            if not isinstance(error, self._API_ERRORS[operation]):
+                self.metrics.count_error(operation, type(error).__name__)
+            if delay is not None:
+                self.metrics.count_retry(operation)
+        return delay
+
+    def _start_trace(self, operation, key):
+        """Returns the trace of a new call, or a no-op trace if the
+        client has no tracer."""
+        if self.tracer is None:
+            return NULL_TRACE
+        return self.tracer.start(operation, key)
+
+    def _account(self, operation, outcome):
+        """Records the outcome of a call in the cost ledger."""
+        if self.ledger is not None:
+            self.ledger.record(operation, outcome)
+
+    def _account_fetch(self, operation, result):
+        """Records a call that reached the API: billable if it returned
+        a response, failed if the API answered with an error."""
+        if self.ledger is None:
+            return
+        if isinstance(result, Exception):
+            if isinstance(result, self._API_ERRORS[operation]):
+                self.ledger.record(operation, "failed")
+        elif isinstance(result, LookupResult):
+            self.ledger.record(operation, "failed")
+        else:
+            self.ledger.record(operation, "api")
+
+    def _over_budget(self, operation):
+        """Returns True if a degrading budget is spent and the call must
+        be answered without the API. Raises ``BudgetExceededError`` if
+        a rejecting budget is spent."""
+        return (self.ledger is not None
+                and self.ledger.check(operation) == "degrade")
+
+    def _index_lookup(self, operation, key, trace):
+        """Returns a find response answered by the postal code or prefix
+        index, or None if the API must be called."""
+        if operation != "find" or (self.prefix_index is None
+                                   and self.postal_index is None):
+            return None
+        search_term, country, max_suggestions, _, container = key
+        if container is not None:
+            return None
+        with trace.phase("index"):
+            for index in (self.postal_index, self.prefix_index):
+                if index is not None:
+                    response = index.lookup(search_term, country,
+                                            max_suggestions)
+                    if response is not None:
+                        return response
+        return None
+
+    def _index_add(self, operation, response):
+        """Adds the addresses of a successful retrieve response to the
+        prefix index."""
+        if (self.prefix_index is not None and operation == "retrieve"
+                and not isinstance(response, LookupResult)):
+            self.prefix_index.add_response(response)
+
+    def _register_caches(self):
+        """Reports the client's caches in its metrics."""
+        if self.metrics is None:
+            return
+        if self.find_cache is not None:
+            self.metrics.register_cache("find", self.find_cache)
+        if self.retrieve_cache is not None:
+            self.metrics.register_cache("retrieve", self.retrieve_cache)
+
+    @staticmethod
+    def _split_items(response, expand, max_fanout):
+        """Splits find items into items to yield and containers to
+        expand.
+        
+        Args:
+            response (dict): A find response.
+            expand (bool): Whether containers may be expanded further.
+            max_fanout (int): Maximum containers expanded per response.
+        
+        Returns:
+            tuple: (items to yield, container Ids to expand).
+        """
+        items = []
+        containers = []
+        for item in response.get("Items") or []:
+            if (expand and item.get("Next") == "Find"
+                    and (max_fanout is None or len(containers) < max_fanout)):
+                containers.append(item["Id"])
+            else:
+                items.append(item)
+        return items, containers
+
+    @staticmethod
+    def _unique(ids):
+        """Returns the Ids with duplicates removed, preserving order."""
+        return list(dict.fromkeys(ids))
+
+
+class AddressComplete(_AddressCompleteBase):
+    """A client module for the Canada Post AddressComplete API."""
+    
+    def __init__(self, api_key, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, max_retries=0, keep_alive=True,
+                 timeout=None, session=None, find_cache=None,
+                 retrieve_cache=None, coalesce=False, rate_limiter=None,
+                 retry_policy=None, circuit_breaker=None, decoder="json",
+                 raise_errors=True, metrics=None, tracer=None,
+                 base_url=None, prefix_index=None,
+                 postal_index=None, canonicalizer=None, ledger=None,
+                 http2=False):
         """Initializes an AddressComplete client.
         
+        The client owns a pooled HTTP session that is reused by every
+        call (and may be shared across threads), so repeated lookups
+        skip the TCP and TLS handshake. Call ``close()`` or use the
+        client as a context manager to release the pooled connections.
+        
         Args:
-            api_key (str): Your AddressComplete API key.
+            api_key (str or KeyPool): Your AddressComplete API key, or
+            a ``KeyPool`` to spread requests over several keys.
+            pool_connections (int): Number of per-host connection pools
+            to keep.
+            pool_maxsize (int): Maximum number of connections kept open
+            per host.
+            pool_block (bool): Block when the pool is exhausted instead
+            of opening extra, unpooled connections.
+            max_retries (int or urllib3.util.Retry): Connection-level
+            retries performed by the transport adapter.
+            keep_alive (bool): Keep connections open between requests.
+            timeout (float or tuple): Timeout passed to every request.
+            session (requests.Session): Use an existing session instead
+            of creating one. The caller remains responsible for its
+            adapter configuration.
+            find_cache (LRUCache): Cache for ``find`` responses, keyed on
+            the full set of find parameters (default is no caching).
+            retrieve_cache (SQLiteCache or LRUCache): Cache for
+            ``retrieve`` responses, keyed on the Id (default is no
+            caching).
+            coalesce (bool): Let concurrent calls with identical
+            parameters wait for the call already in flight instead of
+            issuing duplicates. The number of coalesced calls is kept
+            in ``single_flight.coalesced``.
+            rate_limiter (RateLimiter): Paces requests sent to the API
+            and slows down when the API reports throttling.
+            retry_policy (RetryPolicy): Retries transient failures with
+            jittered exponential backoff (default is no retries).
+            circuit_breaker (CircuitBreaker): Fails fast with
+            ``CircuitOpenError`` while the API keeps failing.
+            decoder (str or callable): Decodes raw response bodies:
+            "json", "orjson", "msgspec", "auto" or a callable (see
+            ``Decoding.get_decoder``).
+            raise_errors (bool): Raise API errors (the default). If
+            False, ``find`` and ``retrieve`` return a ``LookupResult``
+            carrying either the response or the mapped error class and
+            code, which avoids raising and catching an exception for
+            every invalid input in bulk jobs. Transport errors and
+            ``CircuitOpenError`` are still raised.
+            metrics (Metrics): Records latency, sizes, errors, retries
+            and cache statistics of the client's calls.
+            tracer (Tracer): Times each phase of every call (URL
+            build, cache, rate limiting, response headers, body read,
+            decoding and error mapping).
+            base_url (str): Scheme and host to send requests to instead
+            of the Canada Post API, e.g. a ``FakeAddressCompleteServer``.
+            prefix_index (PrefixIndex): Learns every retrieved address
+            and answers ``find`` locally when it holds enough matches.
+            postal_index (PostalCodeIndex): Answers postal code
+            ``find`` searches from a shared memory-mapped index.
+            canonicalizer (Canonicalizer): Rewrites find search terms
+            to a canonical form before caching, coalescing and sending,
+            so spelling variants share cache entries.
+            ledger (CostLedger): Accounts for billable calls and calls
+            answered for free, by label, and enforces its budgets.
+            http2 (bool): Send requests over HTTP/2, multiplexing
+            concurrent calls over ``pool_maxsize`` connections at most
+            (see ``Transport.HTTP2Session``). Servers without HTTP/2
+            are served over HTTP/1.1, and without httpx and h2
+            installed the client falls back to HTTP/1.1 with a
+            warning. ``keep_alive`` and the pool settings other than
+            ``pool_maxsize`` only apply to HTTP/1.1.
         """
-        self.api_key = api_key
+        self._set_api_key(api_key)
+        self._set_base_url(base_url)
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.raise_errors = raise_errors
+        self.find_cache = find_cache
+        self.retrieve_cache = retrieve_cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.decode = get_decoder(decoder)
+        self.metrics = metrics
+        self.tracer = tracer
+        self.prefix_index = prefix_index
+        self.postal_index = postal_index
+        self.canonicalizer = canonicalizer
+        self.ledger = ledger
+        self._register_caches()
+        if session is None and resolve_http2(http2):
+            session = HTTP2Session(max_connections=pool_maxsize,
+                                   max_retries=max_retries)
+            keep_alive = True
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=max_retries,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+        self.session = session
+
+    def close(self):
+        """Closes the pooled HTTP session and its connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
         
 
     def find(self, search_term, country="CAN", max_suggestions=10,
-             language_preference="en"):
+             language_preference="en", container=None):
         """Finds address suggestions based on the search term.
         
         Args:
@@ -40,73 +438,272 @@ class AddressComplete:
             return.
             language_preference (str): Language preference (2 or 4 
             digit language code).
+            container (str): The Id of a result whose ``Next`` is
+            "Find" (a street, building or postcode), to list the
+            addresses inside it.
+        
+        Returns:
+            dict, or ``LookupResult`` if ``raise_errors`` is False.
         """
-        params = {
-            "Key": self.api_key,
-            "SearchTerm": search_term,
-            "Country": country,
-            "MaxSuggestions": max_suggestions,
-            "LanguagePreference": language_preference,
-        }
+        if self.canonicalizer is not None:
+            search_term = self.canonicalizer(search_term,
+                                             language_preference)
+        key = (search_term, country, max_suggestions, language_preference,
+               container)
+        trace = self._start_trace("find", key)
+        with trace.phase("build"):
+            url = self._find_url(*key)
+        return self._call("find", key, url, self.find_cache, trace)
+    
+    def retrieve(self, id, fields=None):
+        """Retrieves detailed address information based on the ID.
         
-        url = f"{self.DEFAULT_FIND_ENDPOINT}&{urllib.parse.urlencode(params)}"
+        Args:
+            id (str): The unique identifier for the address.
+            fields (iterable of str): Only keep these fields in each
+            item, e.g. ("Line1", "City", "ProvinceCode", "PostalCode").
+            The cached response is left complete.
         
-        response = requests.get(url)
+        Returns:
+            dict, or ``LookupResult`` if ``raise_errors`` is False.
+        """
+        trace = self._start_trace("retrieve", id)
+        with trace.phase("build"):
+            url = self._retrieve_url(id)
+        return self._call("retrieve", id, url, self.retrieve_cache, trace,
+                          fields)
+
+    def _call(self, operation, key, url, cache, trace, fields=None):
+        """Looks up a response and shapes it for the caller."""
+        try:
+            response = self._lookup(operation, key, url, cache, trace)
+        except Exception as error:
+            trace.finish(error)
+            if self.raise_errors:
+                raise
+            result = self._wrap_error(error, operation)
+            if result is None:
+                raise
+            return result
+        trace.finish(getattr(response, "error_class", None))
+        self._index_add(operation, response)
+        if not self.raise_errors:
+            return self._wrap_response(response, fields)
+        if fields is not None:
+            response = project(response, fields)
+        return response
+
+    def _lookup(self, operation, key, url, cache, trace):
+        """Answers a call from the prefix index, the cache, an identical
+        call already in flight, or the API."""
+        indexed = self._index_lookup(operation, key, trace)
+        if indexed is not None:
+            self._account(operation, "index")
+            return indexed
+        if cache is not None:
+            with trace.phase("cache"):
+                cached = cache.get(key)
+            if cached is not None:
+                self._account(operation, "cache")
+                return cached
+        if self.single_flight is None:
+            return self._fetch(operation, key, url, cache, trace)
+        fetched = []
+
+        def fetch():
+            fetched.append(True)
+            return self._fetch(operation, key, url, cache, trace)
+
+        response = self.single_flight.do((operation, key), fetch)
+        if not fetched:
+            self._account(operation, "coalesced")
+        return response
+
+    def _fetch(self, operation, key, url, cache, trace):
+        """Calls the API, retrying transient failures, and caches a
+        successful response."""
+        if self._over_budget(operation):
+            return {"Items": []}
+        attempt = 1
+        while True:
+            self._before_attempt()
+            try:
+                response = self._send(operation, url, trace)
+            except Exception as error:
+                delay = self._after_attempt(error, attempt, operation)
+                if delay is None:
+                    self._account_fetch(operation, error)
+                    raise
+                with trace.phase("backoff"):
+                    time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self._abandon_attempt()
+                raise
+            self._after_attempt(None, attempt, operation)
+            break
+        self._account_fetch(operation, response)
+        if cache is not None and not isinstance(response, LookupResult):
+            cache.set(key, response)
+        return response
+
+    def _send(self, operation, url, trace):
+        """Sends one request and returns the checked response. With a
+        key pool, a request refused for its key is repeated on another
+        key."""
+        if self.key_pool is None:
+            return self._request(operation, url, self.api_key, trace)
+        while True:
+            key = self.key_pool.acquire()
+            try:
+                response = self._request(operation,
+                                         self._keyed_url(url, key), key,
+                                         trace)
+            except Exception as error:
+                if self.key_pool.release(key, error):
+                    continue
+                raise
+            self.key_pool.release(key)
+            return response
+
+    def _request(self, operation, url, key, trace):
+        """Sends one request with ``key`` and returns the checked
+        response."""
+        if self.rate_limiter is not None:
+            with trace.phase("throttle"):
+                self.rate_limiter.acquire(key)
+        started = time.perf_counter()
+        if trace is NULL_TRACE:
+            response = self.session.get(url, timeout=self.timeout)
+        else:
+            # Streaming returns after the headers, so the body read can
+            # be timed on its own.
+            with trace.phase("first_byte"):
+                response = self.session.get(url, timeout=self.timeout,
+                                            stream=True)
+        with trace.phase("read"):
+            content = response.content
+        if self.metrics is not None:
+            self.metrics.observe_request(operation,
+                                         time.perf_counter() - started,
+                                         len(content))
         response.raise_for_status()
+        with trace.phase("decode"):
+            decoded = self.decode(content)
+        with trace.phase("classify"):
+            return self._check_response(decoded, operation, key)
+
+    def iter_find(self, search_term, country="CAN", max_suggestions=10,
+                  language_preference="en", max_depth=3, max_fanout=None,
+                  max_workers=None):
+        """Finds addresses, following container results concurrently.
         
-        response = response.json()
-        # Check for top-level Error field
-        error_code = response.get("Error")
-        # Also check for errors in Items array (API sometimes returns errors there)
-        if error_code is None and response.get("Items"):
-            items = response.get("Items", [])
-            if items and isinstance(items, list) and len(items) > 0:
-                first_item = items[0]
-                if isinstance(first_item, dict) and "Error" in first_item:
-                    error_code = first_item["Error"]
-        
-        if error_code is not None:
-            # Convert string error codes to integers if needed
-            if isinstance(error_code, str):
-                try:
-                    error_code = int(error_code)
-                except ValueError:
-                    pass  # Keep as string if conversion fails
-            raise FindError(error_code)
-        else:
-            return response
-    
-    def retrieve(self, id):
-        """Retrieves detailed address information based on the ID.
+        Results whose ``Next`` is "Find" are containers (streets,
+        buildings, postcodes). They are queried again with their Id as
+        ``container`` until only addresses remain or ``max_depth`` is
+        reached. Items are yielded as soon as the branch returning them
+        completes, so the order is not deterministic.
         
         Args:
-            id (str): The unique identifier for the address.
+            search_term (str): The address search term.
+            country (str): The country code (default is "CAN").
+            max_suggestions (int): Maximum number of suggestions per
+            find call.
+            language_preference (str): Language preference (2 or 4 
+            digit language code).
+            max_depth (int): Maximum number of container levels to
+            expand. Containers below it are yielded unexpanded.
+            max_fanout (int): Maximum containers expanded per find
+            response (default is all). Containers over the limit are
+            yielded unexpanded.
+            max_workers (int): Maximum number of concurrent requests
+            (defaults to ``pool_maxsize``).
+        
+        Yields:
+            dict: Find items, normally with ``Next`` set to "Retrieve".
+            API errors are raised whatever ``raise_errors`` is.
         """
-        url = (
-            f"{self.DEFAULT_RETRIEVE_ENDPOINT}&Key={self.api_key}"
-            f"&Id={urllib.parse.quote(id)}"
-        )
+        if max_workers is None:
+            max_workers = self.pool_maxsize
         
-        response = requests.get(url)
-        response.raise_for_status()
-        response = response.json()
-        # Check for top-level Error field
-        error_code = response.get("Error")
-        # Also check for errors in Items array (API sometimes returns errors there)
-        if error_code is None and response.get("Items"):
-            items = response.get("Items", [])
-            if items and isinstance(items, list) and len(items) > 0:
-                first_item = items[0]
-                if isinstance(first_item, dict) and "Error" in first_item:
-                    error_code = first_item["Error"]
-        
-        if error_code is not None:
-            # Convert string error codes to integers if needed
-            if isinstance(error_code, str):
-                try:
-                    error_code = int(error_code)
-                except ValueError:
-                    pass  # Keep as string if conversion fails
-            raise RetrieveError(error_code)
-        else:
-            return response
\ No newline at end of file
+        def find_container(container):
+            return self._unwrap(self.find(search_term, country,
+                                          max_suggestions,
+                                          language_preference, container))
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        try:
+            response = find_container(None)
+            depth = 0
+            while True:
+                items, containers = self._split_items(
+                    response, depth < max_depth, max_fanout
+                )
+                yield from items
+                for container in containers:
+                    # Workers inherit the caller's cost ledger labels.
+                    future = executor.submit(
+                        contextvars.copy_context().run, find_container,
+                        container,
+                    )
+                    pending[future] = depth + 1
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                depth = pending.pop(future)
+                response = future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def find_all(self, search_term, country="CAN", max_suggestions=10,
+                 language_preference="en", max_depth=3, max_fanout=None,
+                 max_workers=None):
+        """Returns every item yielded by ``iter_find`` as a list."""
+        return list(self.iter_find(
+            search_term, country, max_suggestions, language_preference,
+            max_depth, max_fanout, max_workers,
+        ))
+
+    def retrieve_many(self, ids, max_workers=None, fields=None):
+        """Retrieves several addresses concurrently.
+        
+        Repeated Ids are only retrieved once. A failure for one Id does
+        not abort the batch; the exception is returned in its place.
+        
+        Args:
+            ids (iterable of str): The unique identifiers to retrieve.
+            max_workers (int): Maximum number of concurrent requests
+            (defaults to ``pool_maxsize`` so every worker gets a pooled
+            connection).
+            fields (iterable of str): Only keep these fields in each
+            item.
+        
+        Returns:
+            list: One entry per input Id, in input order. Each entry is
+            either the retrieve response or the exception raised for
+            that Id (e.g. ``IDInvalidError``). If ``raise_errors`` is
+            False, API errors are ``LookupResult`` entries instead and
+            only transport errors appear as exceptions.
+        """
+        ids = list(ids)
+        unique_ids = self._unique(ids)
+        if max_workers is None:
+            max_workers = self.pool_maxsize
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run,
+                                self.retrieve, id, fields)
+                for id in unique_ids
+            ]
+        
+        results = {}
+        for id, future in zip(unique_ids, futures):
+            error = future.exception()
+            results[id] = error if error is not None else future.result()
+        return [results[id] for id in ids]
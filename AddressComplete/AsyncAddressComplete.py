@@ -0,0 +1,410 @@
+import asyncio
+import time
+
+from .AddressComplete import _AddressCompleteBase
+from .Coalescing import AsyncSingleFlight
+from .Decoding import get_decoder, project
+from .Results import LookupResult
+from .Tracing import NULL_TRACE
+from .Transport import resolve_http2
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+class AsyncAddressComplete(_AddressCompleteBase):
+    """An asyncio client for the Canada Post AddressComplete API.
+
+    Mirrors ``AddressComplete`` but performs requests on a non-blocking
+    ``httpx.AsyncClient``, so many lookups can be in flight on one event
+    loop while sharing a single connection pool.
+    """
+
+    def __init__(self, api_key, max_connections=100,
+                 max_keepalive_connections=20, keepalive_expiry=5.0,
+                 max_retries=0, timeout=None, session=None,
+                 find_cache=None, retrieve_cache=None, coalesce=False,
+                 rate_limiter=None, retry_policy=None, circuit_breaker=None,
+                 decoder="json", raise_errors=True, metrics=None,
+                 tracer=None, base_url=None, prefix_index=None,
+                 postal_index=None, canonicalizer=None, ledger=None,
+                 http2=False):
+        """Initializes an async AddressComplete client.
+
+        Args:
+            api_key (str or KeyPool): Your AddressComplete API key, or
+            a ``KeyPool`` to spread requests over several keys.
+            max_connections (int): Maximum number of concurrent
+            connections in the pool.
+            max_keepalive_connections (int): Maximum number of idle
+            connections kept open.
+            keepalive_expiry (float): Seconds an idle connection is kept
+            before being closed.
+            max_retries (int): Connection-level retries performed by the
+            transport.
+            timeout (float or httpx.Timeout): Timeout applied to every
+            request (default is no timeout).
+            session (httpx.AsyncClient): Use an existing client instead
+            of creating one.
+            find_cache (LRUCache): Cache for ``find`` responses (default
+            is no caching).
+            retrieve_cache (SQLiteCache or LRUCache): Cache for
+            ``retrieve`` responses (default is no caching). Blocking
+            caches such as ``SQLiteCache`` are read and written in the
+            default executor, off the event loop.
+            coalesce (bool): Let concurrent calls with identical
+            parameters await the call already in flight instead of
+            issuing duplicates.
+            rate_limiter (RateLimiter): Paces requests sent to the API
+            and slows down when the API reports throttling.
+            retry_policy (RetryPolicy): Retries transient failures with
+            jittered exponential backoff (default is no retries).
+            circuit_breaker (CircuitBreaker): Fails fast with
+            ``CircuitOpenError`` while the API keeps failing.
+            decoder (str or callable): Decodes raw response bodies (see
+            ``Decoding.get_decoder``).
+            raise_errors (bool): Raise API errors (the default). If
+            False, ``find`` and ``retrieve`` return a ``LookupResult``
+            instead.
+            metrics (Metrics): Records latency, sizes, errors, retries
+            and cache statistics of the client's calls.
+            tracer (Tracer): Times each phase of every call, including
+            pool acquisition, connect, TLS and send.
+            base_url (str): Scheme and host to send requests to instead
+            of the Canada Post API.
+            prefix_index (PrefixIndex): Learns every retrieved address
+            and answers ``find`` locally when it holds enough matches.
+            postal_index (PostalCodeIndex): Answers postal code
+            ``find`` searches from a shared memory-mapped index.
+            canonicalizer (Canonicalizer): Rewrites find search terms
+            to a canonical form before caching, coalescing and sending,
+            so spelling variants share cache entries.
+            ledger (CostLedger): Accounts for billable calls and calls
+            answered for free, by label, and enforces its budgets.
+            http2 (bool): Negotiate HTTP/2, so concurrent calls share
+            a few multiplexed connections instead of one each. Servers
+            without HTTP/2 are served over HTTP/1.1, and without h2
+            installed the client falls back to HTTP/1.1 with a
+            warning.
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncAddressComplete requires httpx. Install it with "
+                "'pip install addresscomplete[async]'."
+            )
+        self._set_api_key(api_key)
+        self._set_base_url(base_url)
+        self.max_connections = max_connections
+        self.raise_errors = raise_errors
+        self.find_cache = find_cache
+        self.retrieve_cache = retrieve_cache
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.decode = get_decoder(decoder)
+        self.metrics = metrics
+        self.tracer = tracer
+        self.prefix_index = prefix_index
+        self.postal_index = postal_index
+        self.canonicalizer = canonicalizer
+        self.ledger = ledger
+        self._register_caches()
+        if session is None:
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            )
+            transport = httpx.AsyncHTTPTransport(
+                limits=limits, retries=max_retries,
+                http2=resolve_http2(http2),
+            )
+            session = httpx.AsyncClient(transport=transport, timeout=timeout)
+        self.session = session
+
+    async def aclose(self):
+        """Closes the underlying connection pool."""
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def find(self, search_term, country="CAN", max_suggestions=10,
+                   language_preference="en", container=None):
+        """Finds address suggestions based on the search term.
+
+        Args:
+            search_term (str): The address search term.
+            country (str): The country code (default is "CAN").
+            max_suggestions (int): Maximum number of suggestions to
+            return.
+            language_preference (str): Language preference (2 or 4
+            digit language code).
+            container (str): The Id of a result whose ``Next`` is
+            "Find", to list the addresses inside it.
+
+        Returns:
+            dict, or ``LookupResult`` if ``raise_errors`` is False.
+        """
+        if self.canonicalizer is not None:
+            search_term = self.canonicalizer(search_term,
+                                             language_preference)
+        key = (search_term, country, max_suggestions, language_preference,
+               container)
+        trace = self._start_trace("find", key)
+        with trace.phase("build"):
+            url = self._find_url(*key)
+        return await self._call("find", key, url, self.find_cache, trace)
+
+    async def retrieve(self, id, fields=None):
+        """Retrieves detailed address information based on the ID.
+
+        Args:
+            id (str): The unique identifier for the address.
+            fields (iterable of str): Only keep these fields in each
+            item.
+
+        Returns:
+            dict, or ``LookupResult`` if ``raise_errors`` is False.
+        """
+        trace = self._start_trace("retrieve", id)
+        with trace.phase("build"):
+            url = self._retrieve_url(id)
+        return await self._call("retrieve", id, url, self.retrieve_cache,
+                                trace, fields)
+
+    async def _call(self, operation, key, url, cache, trace, fields=None):
+        """Looks up a response and shapes it for the caller."""
+        try:
+            response = await self._lookup(operation, key, url, cache, trace)
+        except Exception as error:
+            trace.finish(error)
+            if self.raise_errors:
+                raise
+            result = self._wrap_error(error, operation)
+            if result is None:
+                raise
+            return result
+        trace.finish(getattr(response, "error_class", None))
+        self._index_add(operation, response)
+        if not self.raise_errors:
+            return self._wrap_response(response, fields)
+        if fields is not None:
+            response = project(response, fields)
+        return response
+
+    async def _lookup(self, operation, key, url, cache, trace):
+        """Answers a call from the prefix index, the cache, an identical
+        call already in flight, or the API."""
+        indexed = self._index_lookup(operation, key, trace)
+        if indexed is not None:
+            self._account(operation, "index")
+            return indexed
+        if cache is not None:
+            with trace.phase("cache"):
+                cached = await self._cache_call(cache.get, cache, key)
+            if cached is not None:
+                self._account(operation, "cache")
+                return cached
+        if self.single_flight is None:
+            return await self._fetch(operation, key, url, cache, trace)
+        fetched = []
+
+        def fetch():
+            fetched.append(True)
+            return self._fetch(operation, key, url, cache, trace)
+
+        response = await self.single_flight.do((operation, key), fetch)
+        if not fetched:
+            self._account(operation, "coalesced")
+        return response
+
+    async def _fetch(self, operation, key, url, cache, trace):
+        """Calls the API, retrying transient failures, and caches a
+        successful response."""
+        if self._over_budget(operation):
+            return {"Items": []}
+        attempt = 1
+        while True:
+            self._before_attempt()
+            try:
+                response = await self._send(operation, url, trace)
+            except Exception as error:
+                delay = self._after_attempt(error, attempt, operation)
+                if delay is None:
+                    self._account_fetch(operation, error)
+                    raise
+                with trace.phase("backoff"):
+                    await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self._abandon_attempt()
+                raise
+            self._after_attempt(None, attempt, operation)
+            break
+        self._account_fetch(operation, response)
+        if cache is not None and not isinstance(response, LookupResult):
+            await self._cache_call(cache.set, cache, key, response)
+        return response
+
+    @staticmethod
+    async def _cache_call(method, cache, *args):
+        """Calls a cache method, in the default executor if the cache
+        blocks on I/O."""
+        if getattr(cache, "blocking", False):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, method, *args)
+        return method(*args)
+
+    async def _send(self, operation, url, trace):
+        """Sends one request and returns the checked response. With a
+        key pool, a request refused for its key is repeated on another
+        key."""
+        if self.key_pool is None:
+            return await self._request(operation, url, self.api_key, trace)
+        while True:
+            key = self.key_pool.acquire()
+            try:
+                response = await self._request(
+                    operation, self._keyed_url(url, key), key, trace
+                )
+            except Exception as error:
+                if self.key_pool.release(key, error):
+                    continue
+                raise
+            self.key_pool.release(key)
+            return response
+
+    async def _request(self, operation, url, key, trace):
+        """Sends one request with ``key`` and returns the checked
+        response."""
+        if self.rate_limiter is not None:
+            with trace.phase("throttle"):
+                wait = self.rate_limiter.reserve(key)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+        started = time.perf_counter()
+        if trace is NULL_TRACE:
+            response = await self.session.get(url)
+        else:
+            response = await self.session.get(
+                url, extensions={"trace": trace.httpx_hook()}
+            )
+        if self.metrics is not None:
+            self.metrics.observe_request(operation,
+                                         time.perf_counter() - started,
+                                         len(response.content))
+        response.raise_for_status()
+        with trace.phase("decode"):
+            decoded = self.decode(response.content)
+        with trace.phase("classify"):
+            return self._check_response(decoded, operation, key)
+
+    async def iter_find(self, search_term, country="CAN", max_suggestions=10,
+                        language_preference="en", max_depth=3,
+                        max_fanout=None, max_workers=None):
+        """Finds addresses, following container results concurrently.
+
+        The async counterpart of ``AddressComplete.iter_find``.
+
+        Args:
+            search_term (str): The address search term.
+            country (str): The country code (default is "CAN").
+            max_suggestions (int): Maximum number of suggestions per
+            find call.
+            language_preference (str): Language preference (2 or 4
+            digit language code).
+            max_depth (int): Maximum number of container levels to
+            expand.
+            max_fanout (int): Maximum containers expanded per find
+            response (default is all).
+            max_workers (int): Maximum number of requests in flight
+            (defaults to ``max_connections``).
+
+        Yields:
+            dict: Find items, normally with ``Next`` set to "Retrieve".
+            API errors are raised whatever ``raise_errors`` is.
+        """
+        semaphore = asyncio.Semaphore(max_workers or self.max_connections)
+
+        async def find_container(container):
+            async with semaphore:
+                return self._unwrap(await self.find(
+                    search_term, country, max_suggestions,
+                    language_preference, container,
+                ))
+
+        pending = {}
+        try:
+            response = await find_container(None)
+            depth = 0
+            while True:
+                items, containers = self._split_items(
+                    response, depth < max_depth, max_fanout
+                )
+                for item in items:
+                    yield item
+                for container in containers:
+                    task = asyncio.ensure_future(find_container(container))
+                    pending[task] = depth + 1
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                task = done.pop()
+                depth = pending.pop(task)
+                response = task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def find_all(self, search_term, country="CAN", max_suggestions=10,
+                       language_preference="en", max_depth=3,
+                       max_fanout=None, max_workers=None):
+        """Returns every item yielded by ``iter_find`` as a list."""
+        return [item async for item in self.iter_find(
+            search_term, country, max_suggestions, language_preference,
+            max_depth, max_fanout, max_workers,
+        )]
+
+    async def retrieve_many(self, ids, max_workers=None, fields=None):
+        """Retrieves several addresses concurrently.
+
+        Repeated Ids are only retrieved once. A failure for one Id does
+        not abort the batch; the exception is returned in its place.
+
+        Args:
+            ids (iterable of str): The unique identifiers to retrieve.
+            max_workers (int): Maximum number of requests in flight
+            (defaults to ``max_connections``).
+            fields (iterable of str): Only keep these fields in each
+            item.
+
+        Returns:
+            list: One entry per input Id, in input order. Each entry is
+            either the retrieve response or the exception raised for
+            that Id (a ``LookupResult`` for API errors if
+            ``raise_errors`` is False).
+        """
+        ids = list(ids)
+        unique_ids = self._unique(ids)
+        semaphore = asyncio.Semaphore(max_workers or self.max_connections)
+
+        async def bounded_retrieve(id):
+            async with semaphore:
+                return await self.retrieve(id, fields)
+
+        outcomes = await asyncio.gather(
+            *(bounded_retrieve(id) for id in unique_ids),
+            return_exceptions=True,
+        )
+        results = dict(zip(unique_ids, outcomes))
+        return [results[id] for id in ids]
@@ -0,0 +1,271 @@
+"""Per-user autocomplete sessions built on ``find``."""
+import asyncio
+import re
+import threading
+import time
+
+from .Results import LookupResult
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _tokens(text):
+    """Splits text into case-folded word tokens."""
+    return _TOKEN_PATTERN.findall(text.casefold())
+
+
+def _matches(item, term_tokens):
+    """Returns True if every term token prefixes a token of the item."""
+    item_tokens = _tokens(
+        f"{item.get('Text', '')} {item.get('Description', '')}"
+    )
+    return all(
+        any(item_token.startswith(token) for item_token in item_tokens)
+        for token in term_tokens
+    )
+
+
+class _AutocompleteSessionBase:
+    """Keystroke refinement shared by the sync and async sessions."""
+
+    def __init__(self, client, country="CAN", max_suggestions=10,
+                 language_preference="en"):
+        """Initializes an autocomplete session.
+
+        Args:
+            client: The AddressComplete client used for network lookups.
+            country (str): The country code (default is "CAN").
+            max_suggestions (int): Maximum number of suggestions to
+            return.
+            language_preference (str): Language preference (2 or 4
+            digit language code).
+        """
+        self.client = client
+        self.country = country
+        self.max_suggestions = max_suggestions
+        self.language_preference = language_preference
+        self.local_hits = 0
+        self.remote_calls = 0
+        self._last_term = None
+        self._last_response = None
+        self._wrapped = False
+
+    def reset(self):
+        """Forgets the previous result, e.g. when the user clears the
+        input field."""
+        self._last_term = None
+        self._last_response = None
+
+    def _refine(self, search_term):
+        """Answers ``search_term`` from the previous result if possible.
+
+        The previous result is complete when it returned fewer than
+        ``max_suggestions`` items, so every suggestion for a longer term
+        that extends it is already among those items.
+
+        Returns:
+            The filtered response, wrapped in a ``LookupResult`` if the
+            client returns them, or None if the API must be called.
+        """
+        previous = self._last_response
+        if previous is None:
+            return None
+        term = search_term.casefold()
+        last_term = self._last_term.casefold()
+        if term == last_term:
+            self.local_hits += 1
+            return self._shape(previous)
+        if not term.startswith(last_term):
+            return None
+        items = previous.get("Items") or []
+        if len(items) >= self.max_suggestions:
+            return None
+        term_tokens = _tokens(search_term)
+        refined = [item for item in items if _matches(item, term_tokens)]
+        if not refined:
+            # The API matches more loosely than we do; let it decide.
+            return None
+        self.local_hits += 1
+        return self._shape({**previous, "Items": refined})
+
+    def _shape(self, response):
+        """Wraps a locally answered response like the client's own."""
+        return LookupResult(response) if self._wrapped else response
+
+    def _remember(self, search_term, result):
+        """Keeps a successful result for the next keystroke. Results of
+        clients created with ``raise_errors=False`` are unwrapped, and
+        failed ones are not kept."""
+        response = result
+        self._wrapped = isinstance(result, LookupResult)
+        if self._wrapped:
+            if not result.ok:
+                self.reset()
+                return result
+            response = result.response
+        self._last_term = search_term
+        self._last_response = response
+        return result
+
+
+class AutocompleteSession(_AutocompleteSessionBase):
+    """Answers successive keystrokes of one user, calling ``find`` only
+    when the previous result cannot answer the new term locally.
+
+    When the new term extends the previous one and the previous result
+    was not truncated at ``max_suggestions``, the previous suggestions
+    are filtered locally instead of calling the API. A session tracks a
+    single input field and is not meant to be shared between users.
+    """
+
+    def find(self, search_term):
+        """Finds address suggestions for the current search term.
+
+        Args:
+            search_term (str): The address search term typed so far.
+        """
+        response = self._refine(search_term)
+        if response is None:
+            self.remote_calls += 1
+            response = self.client.find(
+                search_term, self.country, self.max_suggestions,
+                self.language_preference,
+            )
+        return self._remember(search_term, response)
+
+
+class AsyncAutocompleteSession(_AutocompleteSessionBase):
+    """``AutocompleteSession`` for ``AsyncAddressComplete`` clients."""
+
+    async def find(self, search_term):
+        """Finds address suggestions for the current search term.
+
+        Args:
+            search_term (str): The address search term typed so far.
+        """
+        response = self._refine(search_term)
+        if response is None:
+            self.remote_calls += 1
+            response = await self.client.find(
+                search_term, self.country, self.max_suggestions,
+                self.language_preference,
+            )
+        return self._remember(search_term, response)
+
+
+class _DebouncedSessionBase:
+    """Counters shared by the sync and async debounced sessions."""
+
+    def __init__(self, target, delay=0.15):
+        """Initializes a debounced session.
+
+        Args:
+            target: Anything with a ``find(search_term)`` method, such as
+            a client or an ``AutocompleteSession``.
+            delay (float): Seconds to wait for a newer keystroke before
+            calling ``target.find``.
+        """
+        self.target = target
+        self.delay = delay
+        self.sent = 0
+        self.debounced = 0
+        self.discarded = 0
+
+
+class DebouncedSession(_DebouncedSessionBase):
+    """Debounces the keystrokes of one user across request threads.
+
+    Each call waits ``delay`` seconds. If a newer call arrives in the
+    meantime, the older call returns None at once without reaching the
+    API. If a newer call arrives while a request is in flight, the
+    older result is discarded and None is returned, so only the latest
+    term's result is delivered.
+    """
+
+    def __init__(self, target, delay=0.15):
+        super().__init__(target, delay)
+        self._generation = 0
+        self._changed = threading.Condition()
+
+    def find(self, search_term):
+        """Finds suggestions for ``search_term`` unless it is superseded.
+
+        Args:
+            search_term (str): The address search term typed so far.
+
+        Returns:
+            The find response, or None if a newer term superseded this
+            one.
+        """
+        with self._changed:
+            self._generation += 1
+            generation = self._generation
+            self._changed.notify_all()
+            deadline = time.monotonic() + self.delay
+            while generation == self._generation:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            if generation != self._generation:
+                self.debounced += 1
+                return None
+            self.sent += 1
+
+        response = self.target.find(search_term)
+
+        with self._changed:
+            if generation != self._generation:
+                self.discarded += 1
+                return None
+        return response
+
+
+class AsyncDebouncedSession(_DebouncedSessionBase):
+    """Debounces the keystrokes of one user on an event loop.
+
+    A newer call cancels the pending call, whether it is still waiting
+    out the delay or already in flight, and the superseded call returns
+    None.
+    """
+
+    def __init__(self, target, delay=0.15):
+        super().__init__(target, delay)
+        self._task = None
+
+    async def find(self, search_term):
+        """Finds suggestions for ``search_term`` unless it is superseded.
+
+        Args:
+            search_term (str): The address search term typed so far.
+
+        Returns:
+            The find response, or None if a newer term superseded this
+            one.
+        """
+        sent = False
+
+        async def debounced_find():
+            nonlocal sent
+            await asyncio.sleep(self.delay)
+            sent = True
+            self.sent += 1
+            return await self.target.find(search_term)
+
+        if self._task is not None:
+            self._task.cancel()
+        task = self._task = asyncio.ensure_future(debounced_find())
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if task is self._task:
+                # This caller was cancelled, not superseded.
+                raise
+            if sent:
+                self.discarded += 1
+            else:
+                self.debounced += 1
+            return None
+        finally:
+            if task is self._task:
+                self._task = None
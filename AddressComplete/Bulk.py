@@ -0,0 +1,274 @@
+"""Streaming bulk address validation for CSV and JSON Lines files."""
+import contextvars
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .ErrorHandling import (
+    AccountOutOfCreditError,
+    AccountSuspendedError,
+    BudgetExceededError,
+    CircuitOpenError,
+    KeyDailyLimitExceededError,
+    KeyExpiredError,
+    KeyPoolExhaustedError,
+    SurgeProtectorTriggeredError,
+    UnknownKeyError,
+    UserLookupLimitExceededError,
+)
+from .Results import LookupResult
+
+# Errors that will fail every remaining row, so the job stops instead of
+# burning through the file. Throttling errors are included: the rows
+# after them would fail too, and resuming later retries them without
+# spending credit on the rows already written.
+STOP_ERRORS = (
+    AccountOutOfCreditError,
+    AccountSuspendedError,
+    BudgetExceededError,
+    CircuitOpenError,
+    KeyDailyLimitExceededError,
+    KeyExpiredError,
+    KeyPoolExhaustedError,
+    SurgeProtectorTriggeredError,
+    UnknownKeyError,
+    UserLookupLimitExceededError,
+)
+
+DEFAULT_FIELDS = (
+    "Id", "Line1", "Line2", "City", "ProvinceCode", "PostalCode",
+    "CountryIso2",
+)
+
+
+def _file_format(path):
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+class BulkValidator:
+    """Validates the addresses in a file with find then retrieve.
+
+    Rows are read lazily, validated with bounded concurrency and
+    written in input order as soon as they complete, so memory use does
+    not grow with the size of the file. Progress is checkpointed, and a
+    job that crashed or stopped on an account-level error resumes after
+    the last checkpointed row instead of spending credit again.
+    """
+
+    def __init__(self, client, search_field="address", fields=DEFAULT_FIELDS,
+                 country="CAN", language_preference="en", max_suggestions=5,
+                 max_workers=None, max_in_flight=None, checkpoint_every=100):
+        """Initializes the validator.
+
+        Args:
+            client (AddressComplete): The client used for lookups.
+            search_field (str): Column (CSV) or key (JSON Lines) holding
+            the address to validate.
+            fields (tuple): Retrieve fields copied to the output.
+            country (str): The country code (default is "CAN").
+            language_preference (str): Language preference (2 or 4
+            digit language code).
+            max_suggestions (int): Suggestions requested per find call.
+            max_workers (int): Rows validated concurrently (defaults to
+            the client's ``pool_maxsize``).
+            max_in_flight (int): Rows read ahead of the output (defaults
+            to twice ``max_workers``). Reading blocks when it is
+            reached.
+            checkpoint_every (int): Rows written between checkpoints.
+        """
+        self.client = client
+        self.search_field = search_field
+        self.fields = tuple(fields)
+        self.country = country
+        self.language_preference = language_preference
+        self.max_suggestions = max_suggestions
+        self.max_workers = max_workers or client.pool_maxsize
+        self.max_in_flight = max_in_flight or 2 * self.max_workers
+        self.checkpoint_every = checkpoint_every
+
+    def validate(self, search_term):
+        """Validates one address.
+
+        Clients created with ``raise_errors=False`` report invalid
+        inputs as ``LookupResult`` objects, so rows that fail validation
+        do not raise and catch an exception each.
+
+        Returns:
+            dict: ``status`` ("ok", "no_match" or "error"), ``error``
+            (the error class name) and the retrieved ``fields``.
+        """
+        result = {"status": "no_match", "error": ""}
+        result.update((field, "") for field in self.fields)
+        if not search_term:
+            return result
+        try:
+            address_id = self._find_address_id(search_term)
+            if address_id is None:
+                return result
+            if isinstance(address_id, LookupResult):
+                return self._failed(result, address_id)
+            response = self.client.retrieve(address_id)
+            if isinstance(response, LookupResult):
+                if not response.ok:
+                    return self._failed(result, response)
+                response = response.response
+        except STOP_ERRORS:
+            raise
+        except Exception as error:
+            result["status"] = "error"
+            result["error"] = type(error).__name__
+            return result
+        items = response.get("Items") or []
+        if items:
+            result["status"] = "ok"
+            for field in self.fields:
+                value = items[0].get(field)
+                result[field] = "" if value is None else value
+        return result
+
+    @staticmethod
+    def _failed(result, lookup):
+        """Records a failed ``LookupResult``, raising it if it is one of
+        ``STOP_ERRORS``."""
+        if issubclass(lookup.error_class, STOP_ERRORS):
+            lookup.unwrap()
+        result["status"] = "error"
+        result["error"] = lookup.error_class.__name__
+        return result
+
+    def _find_address_id(self, search_term):
+        """Returns the Id of the best address match, expanding one
+        container level if the best match is a container. A failed
+        ``LookupResult`` is returned as is."""
+        container = None
+        for _ in range(2):
+            response = self.client.find(
+                search_term, self.country, self.max_suggestions,
+                self.language_preference, container,
+            )
+            if isinstance(response, LookupResult):
+                if not response.ok:
+                    return response
+                response = response.response
+            items = response.get("Items") or []
+            for item in items:
+                if item.get("Next") == "Retrieve":
+                    return item["Id"]
+            if not items or items[0].get("Next") != "Find":
+                return None
+            container = items[0]["Id"]
+        return None
+
+    def run(self, input_path, output_path, checkpoint_path=None):
+        """Validates every row of ``input_path`` into ``output_path``.
+
+        The format of each file (CSV or JSON Lines) follows its
+        extension. If ``checkpoint_path`` names an existing checkpoint,
+        the output is truncated to the last checkpointed row and the
+        job resumes from there.
+
+        Args:
+            input_path (str): The file to validate.
+            output_path (str): The file to write results to.
+            checkpoint_path (str): Where progress is recorded (default
+            is ``output_path`` + ".checkpoint").
+
+        Returns:
+            dict: Row counts for this run by status.
+
+        Raises:
+            One of ``STOP_ERRORS`` after checkpointing the rows written
+            so far.
+        """
+        if checkpoint_path is None:
+            checkpoint_path = f"{output_path}.checkpoint"
+        checkpoint = self._load_checkpoint(checkpoint_path)
+        if checkpoint is not None and os.path.exists(output_path):
+            with open(output_path, "r+b") as output:
+                output.truncate(checkpoint["output_offset"])
+        else:
+            checkpoint = {"rows_done": 0, "output_offset": 0}
+        summary = {"ok": 0, "no_match": 0, "error": 0}
+        rows_done = checkpoint["rows_done"]
+        in_flight = deque()
+        writer = None
+
+        def write_oldest():
+            nonlocal rows_done, writer
+            row, future = in_flight.popleft()
+            result = future.result()
+            if writer is None:
+                writer = _RowWriter(sink, _file_format(output_path),
+                                    list(row) + list(result))
+            writer.write({**row, **result})
+            summary[result["status"]] += 1
+            rows_done += 1
+            if rows_done % self.checkpoint_every == 0:
+                self._save_checkpoint(checkpoint_path, sink, rows_done)
+
+        with open(input_path, newline="", encoding="utf-8") as source, \
+                open(output_path, "a", newline="", encoding="utf-8") as sink, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            rows = self._reader(source, _file_format(input_path))
+            for _ in range(rows_done):
+                next(rows, None)
+            try:
+                for row in rows:
+                    # Workers inherit the caller's cost ledger labels.
+                    future = executor.submit(
+                        contextvars.copy_context().run, self.validate,
+                        row.get(self.search_field),
+                    )
+                    in_flight.append((row, future))
+                    if len(in_flight) >= self.max_in_flight:
+                        write_oldest()
+                while in_flight:
+                    write_oldest()
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
+                self._save_checkpoint(checkpoint_path, sink, rows_done)
+        return summary
+
+    @staticmethod
+    def _reader(source, file_format):
+        if file_format == "jsonl":
+            return (json.loads(line) for line in source if line.strip())
+        return csv.DictReader(source)
+
+    @staticmethod
+    def _load_checkpoint(path):
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    @staticmethod
+    def _save_checkpoint(path, sink, rows_done):
+        sink.flush()
+        os.fsync(sink.fileno())
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"rows_done": rows_done, "output_offset": sink.tell()}, file
+            )
+        os.replace(temporary_path, path)
+
+
+class _RowWriter:
+    """Writes result rows as CSV or JSON Lines."""
+
+    def __init__(self, sink, file_format, fieldnames):
+        if file_format == "jsonl":
+            self._write = lambda row: sink.write(json.dumps(row) + "\n")
+            return
+        writer = csv.DictWriter(sink, fieldnames=fieldnames,
+                                extrasaction="ignore")
+        if sink.tell() == 0:
+            writer.writeheader()
+        self._write = writer.writerow
+
+    def write(self, row):
+        self._write(row)
@@ -0,0 +1,330 @@
+"""Response caches for the AddressComplete clients."""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+def estimate_size(value):
+    """Estimates the size of a decoded response in bytes.
+
+    Uses the length of the compact JSON encoding, which tracks the size
+    of the response as received from the API.
+    """
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+class LRUCache:
+    """A thread-safe in-memory cache with LRU eviction and per-entry TTL.
+
+    Cached values are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None,
+                 sizeof=estimate_size):
+        """Initializes the cache.
+
+        Args:
+            max_entries (int): Maximum number of entries kept.
+            max_bytes (int): Maximum total size of the cached values, as
+            measured by ``sizeof`` (default is unbounded).
+            ttl (float): Seconds an entry stays valid (default is no
+            expiry).
+            sizeof (callable): Returns the size of a value in bytes.
+            Only used when ``max_bytes`` is set.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the cached value for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Stores ``value`` under ``key``, evicting old entries if needed."""
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Removes every entry. Counters are left unchanged."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def stats(self):
+        """Returns a snapshot of the cache counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+class SQLiteCache:
+    """A persistent response cache stored in a SQLite database.
+
+    The database runs in WAL mode, so several processes on the same host
+    can share one cache file. Values are stored as zlib-compressed JSON.
+    Once the stored payloads exceed ``max_bytes`` the oldest entries are
+    deleted and the freed pages are returned to the file system.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS responses ("
+        "key TEXT PRIMARY KEY, "
+        "value BLOB NOT NULL, "
+        "size INTEGER NOT NULL, "
+        "stored_at REAL NOT NULL, "
+        "expires_at REAL)"
+    )
+
+    # Reads and writes block on disk I/O, so the async client runs them
+    # in an executor instead of on the event loop.
+    blocking = True
+
+    def __init__(self, path, ttl=None, max_bytes=None, compression_level=6,
+                 vacuum_interval=1000, busy_timeout=30.0, max_connections=4):
+        """Initializes the cache, creating the database if needed.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            ttl (float): Seconds an entry stays valid (default is no
+            expiry).
+            max_bytes (int): Maximum total size of the compressed
+            payloads (default is unbounded).
+            compression_level (int): zlib compression level (0-9).
+            vacuum_interval (int): Number of writes between expiry and
+            size-cap sweeps.
+            busy_timeout (float): Seconds to wait for a lock held by
+            another connection or process.
+            max_connections (int): Maximum number of open connections.
+            They are reused by every thread, so short-lived worker
+            threads do not leave connections behind; a thread waits
+            when all of them are in use.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.vacuum_interval = vacuum_interval
+        self.busy_timeout = busy_timeout
+        self.max_connections = max_connections
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self._writes = 0
+        self._idle = []
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        with self._connection():
+            pass
+
+    def _connect(self):
+        # Connections move between threads, one thread at a time.
+        connection = sqlite3.connect(
+            self.path, timeout=self.busy_timeout, isolation_level=None,
+            check_same_thread=False,
+        )
+        # auto_vacuum only takes effect before the first table exists.
+        connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(self._SCHEMA)
+        return connection
+
+    @contextmanager
+    def _connection(self):
+        """Lends a connection from the pool, opening one if fewer than
+        ``max_connections`` are open and waiting otherwise."""
+        with self._released:
+            while not self._idle and self._opened >= self.max_connections:
+                self._released.wait()
+            connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                self._opened += 1
+        if connection is None:
+            try:
+                connection = self._connect()
+            except BaseException:
+                with self._released:
+                    self._opened -= 1
+                    self._released.notify()
+                raise
+        try:
+            yield connection
+        finally:
+            with self._released:
+                self._idle.append(connection)
+                self._released.notify()
+
+    @property
+    def connections(self):
+        """The number of open connections."""
+        return self._opened
+
+    @staticmethod
+    def _key(key):
+        return key if isinstance(key, str) else json.dumps(key)
+
+    def get(self, key):
+        """Returns the cached value for ``key``, or None on a miss."""
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?",
+                (self._key(key),),
+            ).fetchone()
+        expired = (row is not None and row[1] is not None
+                   and row[1] <= time.time())
+        with self._lock:
+            if row is None or expired:
+                self.misses += 1
+                self.expirations += expired
+                return None
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, key, value):
+        """Stores ``value`` under ``key``."""
+        payload = zlib.compress(
+            json.dumps(value, separators=(",", ":")).encode("utf-8"),
+            self.compression_level,
+        )
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, value, size, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self._key(key), payload, len(payload), now, expires_at),
+            )
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % self.vacuum_interval == 0
+        if sweep:
+            self.vacuum()
+
+    def vacuum(self):
+        """Deletes expired entries and enforces ``max_bytes``.
+
+        The oldest entries are deleted first. Freed pages are released
+        with an incremental vacuum.
+        """
+        with self._connection() as connection:
+            deleted = connection.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            evicted = []
+            if self.max_bytes is not None:
+                (total,) = connection.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+                excess = total - self.max_bytes
+                if excess > 0:
+                    rows = connection.execute(
+                        "SELECT key, size FROM responses ORDER BY stored_at"
+                    )
+                    for key, size in rows:
+                        evicted.append((key,))
+                        excess -= size
+                        if excess <= 0:
+                            break
+                    rows.close()
+                    connection.executemany(
+                        "DELETE FROM responses WHERE key = ?", evicted
+                    )
+            if deleted or evicted:
+                connection.execute("PRAGMA incremental_vacuum")
+        with self._lock:
+            self.evictions += len(evicted)
+
+    def clear(self):
+        """Removes every entry. Counters are left unchanged."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+            connection.execute("PRAGMA incremental_vacuum")
+
+    def close(self):
+        """Closes the idle connections. Connections in use are returned
+        to the pool, so the cache can still be used afterwards."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+        for connection in idle:
+            connection.close()
+
+    def __len__(self):
+        with self._connection() as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+        return count
+
+    @property
+    def stats(self):
+        """Returns a snapshot of the cache counters."""
+        with self._connection() as connection:
+            entries, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": entries,
+            "bytes": size,
+        }
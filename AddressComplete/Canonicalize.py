@@ -0,0 +1,217 @@
+"""Canonicalization of find search terms."""
+import re
+import threading
+import unicodedata
+
+# Canada Post street type abbreviations. Spellings that are already
+# abbreviated are left as typed; only long forms are shortened.
+STREET_TYPES_EN = {
+    "avenue": "ave", "boulevard": "blvd", "circle": "cir",
+    "concession": "conc", "court": "crt", "crescent": "cres",
+    "drive": "dr", "expressway": "expy", "gardens": "gdns",
+    "heights": "hts", "highway": "hwy", "parkway": "pky",
+    "place": "pl", "plateau": "plat", "point": "pt", "road": "rd",
+    "square": "sq", "street": "st", "terrace": "terr",
+}
+STREET_TYPES_FR = {
+    "autoroute": "aut", "avenue": "av", "boulevard": "boul",
+    "carre": "car", "chemin": "ch", "croissant": "crois",
+    "impasse": "imp", "montee": "mtee", "place": "pl",
+    "promenade": "prom", "route": "rte", "terrasse": "tsse",
+}
+DIRECTIONS_EN = {
+    "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se",
+    "southwest": "sw",
+}
+DIRECTIONS_FR = {
+    "nord": "n", "sud": "s", "est": "e", "ouest": "o",
+    "nordest": "ne", "nordouest": "no", "sudest": "se", "sudouest": "so",
+}
+UNIT_DESIGNATORS = frozenset((
+    "#", "apartment", "apt", "app", "appartement", "bureau", "suite",
+    "ste", "unit", "unite",
+))
+
+# Keeps letters, digits and the characters of unit numbers ("#12",
+# "12-345") and fractions ("1/2").
+_SEPARATORS = re.compile(r"[^\w#/-]+|_")
+# Hyphens that do not join two digits, as in "Saint-Laurent".
+_WORD_HYPHEN = re.compile(r"(?<!\d)-|-(?!\d)")
+_NUMBER_SIGN = re.compile(r"#(?=\w)")
+
+
+def _is_unit(token):
+    """Returns True if ``token`` looks like a unit number ("12", "3b",
+    "b")."""
+    return any(char.isdigit() for char in token) or (
+        len(token) == 1 and token.isalpha()
+    )
+
+
+def _is_civic(token):
+    return token[:1].isdigit()
+
+
+class Canonicalizer:
+    """Rewrites find search terms to a canonical form.
+
+    "123 Main Street", "123  MAIN ST." and "123 main st" all become
+    "123 main st", so they share one cache entry and one in-flight
+    request. Terms are case-folded, accents are stripped, punctuation
+    and whitespace collapse to single spaces, long street types and
+    directions are abbreviated the way Canada Post writes them, and
+    unit forms ("Apt 4, 123 Main St", "123 Main St #4") become the
+    Canadian "4-123 main st" form. French tables are used when the
+    find language preference is French.
+
+    Street types are only abbreviated where the street type goes: last
+    in English, or before a trailing direction ("King Street West"),
+    and first after the civic number in French ("Boulevard
+    Saint-Laurent"). Street names such as "Avenue Road" or "Place
+    Ville Marie" keep their meaning. Likewise, directions are only
+    abbreviated at the end of the term or after a street type, so
+    "North Rd" is left alone.
+
+    The canonicalizer counts how many distinct raw terms collapse to
+    each canonical form; see ``stats`` and ``top()``.
+    """
+
+    def __init__(self, street_types=True, directions=True, units=True,
+                 strip_accents=True, replacements=None, max_tracked=10000):
+        """Initializes the canonicalizer.
+
+        Args:
+            street_types (bool): Abbreviate the street type.
+            directions (bool): Abbreviate trailing directions.
+            units (bool): Rewrite unit forms to "unit-civic".
+            strip_accents (bool): Remove accents ("Montréal" becomes
+            "montreal").
+            replacements (dict): Extra word replacements applied to
+            every term, e.g. {"saint": "st"}.
+            max_tracked (int): Maximum number of canonical forms whose
+            raw terms are tracked for ``top()``.
+        """
+        self.street_types = street_types
+        self.directions = directions
+        self.units = units
+        self.strip_accents = strip_accents
+        self.replacements = dict(replacements or {})
+        self.max_tracked = max_tracked
+        self.terms = 0
+        self.rewritten = 0
+        self._forms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, search_term, language_preference="en"):
+        return self.canonicalize(search_term, language_preference)
+
+    def canonicalize(self, search_term, language_preference="en"):
+        """Returns the canonical form of ``search_term`` and records it
+        in the statistics.
+
+        Args:
+            search_term (str): The raw search term.
+            language_preference (str): The find language preference;
+            French ("fr", "fr-CA") selects the French abbreviations.
+        """
+        canonical = self.transform(search_term, language_preference)
+        with self._lock:
+            self.terms += 1
+            if canonical != search_term:
+                self.rewritten += 1
+            raw_terms = self._forms.get(canonical)
+            if raw_terms is None and len(self._forms) < self.max_tracked:
+                raw_terms = self._forms[canonical] = set()
+            if raw_terms is not None:
+                raw_terms.add(search_term)
+        return canonical
+
+    def transform(self, search_term, language_preference="en"):
+        """Returns the canonical form of ``search_term`` without
+        recording it."""
+        french = (language_preference or "").lower().startswith("fr")
+        text = unicodedata.normalize("NFKC", search_term).casefold()
+        if self.strip_accents:
+            text = unicodedata.normalize("NFKD", text)
+            text = "".join(char for char in text
+                           if not unicodedata.combining(char))
+        text = _NUMBER_SIGN.sub("# ", _WORD_HYPHEN.sub(" ", text))
+        tokens = _SEPARATORS.sub(" ", text).split()
+        if self.units:
+            tokens = self._join_unit(tokens)
+        street_types = STREET_TYPES_FR if french else STREET_TYPES_EN
+        directions = DIRECTIONS_FR if french else DIRECTIONS_EN
+        abbreviations = set(street_types.values())
+        tokens = [self.replacements.get(token, token) for token in tokens]
+        type_index = self._street_type_index(tokens, directions, french)
+        words = []
+        for index, token in enumerate(tokens):
+            if self.street_types and index == type_index:
+                token = street_types.get(token, token)
+            if (self.directions and token in directions
+                    and (index == len(tokens) - 1
+                         or words and words[-1] in abbreviations)):
+                token = directions[token]
+            words.append(token)
+        return " ".join(words)
+
+    @staticmethod
+    def _street_type_index(tokens, directions, french):
+        """Returns the position of the street type: first after the
+        civic number in French, last or before a trailing direction
+        otherwise."""
+        if french:
+            return 1 if tokens and _is_civic(tokens[0]) else 0
+        index = len(tokens) - 1
+        if index > 0 and (tokens[index] in directions
+                          or tokens[index] in directions.values()):
+            index -= 1
+        return index
+
+    @staticmethod
+    def _join_unit(tokens):
+        """Rewrites a leading or trailing unit designator to the
+        "unit-civic" form."""
+        if (len(tokens) >= 3 and tokens[0] in UNIT_DESIGNATORS
+                and _is_unit(tokens[1]) and _is_civic(tokens[2])):
+            return [f"{tokens[1]}-{tokens[2]}"] + tokens[3:]
+        if (len(tokens) >= 4 and _is_civic(tokens[0])
+                and tokens[-2] in UNIT_DESIGNATORS and _is_unit(tokens[-1])):
+            return [f"{tokens[-1]}-{tokens[0]}"] + tokens[1:-2]
+        return tokens
+
+    def top(self, count=10):
+        """Returns the canonical forms with the most distinct raw terms,
+        as (canonical form, number of raw terms) pairs."""
+        with self._lock:
+            sizes = [(form, len(raw)) for form, raw in self._forms.items()]
+        sizes.sort(key=lambda pair: pair[1], reverse=True)
+        return sizes[:count]
+
+    def raw_terms(self, canonical):
+        """Returns the raw terms seen for a canonical form."""
+        with self._lock:
+            return sorted(self._forms.get(canonical, ()))
+
+    def clear(self):
+        """Resets the statistics."""
+        with self._lock:
+            self.terms = 0
+            self.rewritten = 0
+            self._forms = {}
+
+    @property
+    def stats(self):
+        """Returns a snapshot of the counters: ``terms`` canonicalized,
+        ``rewritten`` (changed by canonicalization), ``forms`` (distinct
+        canonical forms tracked) and ``collapsed`` (raw terms that share
+        a form with another raw term)."""
+        with self._lock:
+            return {
+                "terms": self.terms,
+                "rewritten": self.rewritten,
+                "forms": len(self._forms),
+                "collapsed": sum(len(raw) - 1 for raw in self._forms.values()
+                                 if len(raw) > 1),
+            }
@@ -0,0 +1,102 @@
+"""Request coalescing for identical concurrent lookups."""
+import asyncio
+import threading
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls made from several threads.
+
+    The first caller for a key runs the call. Callers arriving with the
+    same key while it is in flight wait for it and receive its result,
+    or have its exception raised, instead of issuing a duplicate.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Runs ``func()`` unless a call with ``key`` is already running.
+
+        Args:
+            key (hashable): Identifies identical calls.
+            func (callable): Performs the call.
+
+        Returns:
+            The result of the call that ran for ``key``.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Coalesces identical concurrent calls on one event loop.
+
+    The call runs in its own task, so cancelling one waiting caller does
+    not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, func):
+        """Awaits ``func()`` unless a call with ``key`` is already running.
+
+        Args:
+            key (hashable): Identifies identical calls.
+            func (callable): Returns the coroutine performing the call.
+
+        Returns:
+            The result of the call that ran for ``key``.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller left.
+            task.exception()
@@ -0,0 +1,63 @@
+"""JSON decoders for raw API response bodies."""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+
+def get_decoder(decoder="json"):
+    """Returns a callable that decodes a raw response body.
+
+    Args:
+        decoder (str or callable): "json" (the standard library),
+        "orjson", "msgspec", "auto" (the fastest one installed), or a
+        callable taking ``bytes`` and returning the decoded object.
+
+    Raises:
+        ImportError: If the requested library is not installed.
+        ValueError: If the decoder name is unknown.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder == "auto":
+        if orjson is not None:
+            decoder = "orjson"
+        elif msgspec is not None:
+            decoder = "msgspec"
+        else:
+            decoder = "json"
+    if decoder == "json":
+        return json.loads
+    if decoder == "orjson":
+        if orjson is None:
+            raise ImportError("The 'orjson' decoder requires orjson. Install "
+                              "it with 'pip install addresscomplete[fast]'.")
+        return orjson.loads
+    if decoder == "msgspec":
+        if msgspec is None:
+            raise ImportError("The 'msgspec' decoder requires msgspec. "
+                              "Install it with 'pip install msgspec'.")
+        return msgspec.json.Decoder().decode
+    raise ValueError(f"Unknown decoder: {decoder!r}")
+
+
+def project(response, fields):
+    """Returns a copy of a response keeping only ``fields`` in each item.
+
+    Args:
+        response (dict): A decoded retrieve response.
+        fields (iterable of str): The item fields to keep.
+    """
+    fields = tuple(fields)
+    items = [
+        {field: item[field] for field in fields if field in item}
+        for item in response.get("Items") or []
+    ]
+    return {**response, "Items": items}
@@ -20,12 +20,7 @@ class FindError(ResponseError):
         self._raise_error(error_code)
         
     def _raise_error(self, error_code):
-        if error_code in GENERAL_ERROR_CODE_MAP:
-            raise GENERAL_ERROR_CODE_MAP[error_code]
-        elif error_code in FIND_ERROR_CODE_MAP:
-            raise FIND_ERROR_CODE_MAP[error_code]
-        else:
-            raise UnknownError()
+        raise get_error_class(error_code, "find")()
 
 class RetrieveError(ResponseError):
     """Base exception for retrieve errors."""
@@ -34,12 +29,7 @@ class RetrieveError(ResponseError):
         
     
     def _raise_error(self, error_code):
-        if error_code in GENERAL_ERROR_CODE_MAP:
-            raise GENERAL_ERROR_CODE_MAP[error_code]
-        elif error_code in RETRIEVE_ERROR_CODE_MAP:
-            raise RETRIEVE_ERROR_CODE_MAP[error_code]
-        else:
-            raise UnknownError()
+        raise get_error_class(error_code, "retrieve")()
 
 class CountryInvalidError(Exception):
     """Country code is invalid."""
@@ -73,6 +63,31 @@ class NotAvailableError(Exception):
         super().__init__("The requested record contains data that is not "
                          "available on your account.")
 
+class CircuitOpenError(Exception):
+    """Raised without calling the API while the circuit breaker is open."""
+    def __init__(self):
+        super().__init__("Circuit breaker is open; the API is failing")
+
+class KeyPoolExhaustedError(Exception):
+    """Raised without calling the API when every key of a key pool is
+    out of quota or disabled."""
+    def __init__(self):
+        super().__init__("Every API key in the pool is exhausted or "
+                         "disabled")
+
+class BudgetExceededError(Exception):
+    """Raised without calling the API when a cost ledger budget covering
+    the call is spent."""
+    def __init__(self, labels, limit):
+        super().__init__(f"Budget of {limit} credits for {labels} is spent")
+        self.labels = labels
+        self.limit = limit
+
+class ReplayMissError(KeyError):
+    """Raised by a replay session for a request that was not recorded."""
+    def __init__(self, operation, params):
+        super().__init__(f"No recorded {operation} response for {params}")
+
 # API Errors
 
 class APIError(Exception):
@@ -256,6 +271,26 @@ GENERAL_ERROR_CODE_MAP = {
     23: AgreementNotSignedError,
 }
 
+# One table per operation; general codes take precedence over the
+# operation-specific ones, which reuse the same numbers.
+ERROR_CODE_TABLES = {
+    "find": {**FIND_ERROR_CODE_MAP, **GENERAL_ERROR_CODE_MAP},
+    "retrieve": {**RETRIEVE_ERROR_CODE_MAP, **GENERAL_ERROR_CODE_MAP},
+}
+
+
+def get_error_class(error_code, operation="find"):
+    """Return the exception class mapped to an error code.
+    
+    Args:
+        error_code: The error code reported by the API.
+        operation (str): "find" or "retrieve".
+    
+    Returns:
+        The mapped exception class, or UnknownError for unmapped codes.
+    """
+    return ERROR_CODE_TABLES[operation].get(error_code, UnknownError)
+
 
 def raise_error(error_code, context=None):
     """Raise the appropriate error based on the error code and context.
@@ -270,3 +305,35 @@ def raise_error(error_code, context=None):
     else:
         # Default to FindError behavior (also when context="find" or None)
         FindError(error_code)
+
+
+def get_error_code(response):
+    """Extract the error code from a decoded API response.
+    
+    The API reports errors either in a top-level ``Error`` field or in
+    the first entry of the ``Items`` array.
+    
+    Args:
+        response (dict): The decoded JSON response.
+    
+    Returns:
+        The error code (converted to int when possible), or None if the
+        response does not contain an error.
+    """
+    # Check for top-level Error field
+    error_code = response.get("Error")
+    # Also check for errors in Items array (API sometimes returns errors there)
+    if error_code is None:
+        items = response.get("Items")
+        if items and isinstance(items, list):
+            first_item = items[0]
+            if isinstance(first_item, dict) and "Error" in first_item:
+                error_code = first_item["Error"]
+    
+    # Convert string error codes to integers if needed
+    if isinstance(error_code, str):
+        try:
+            error_code = int(error_code)
+        except ValueError:
+            pass  # Keep as string if conversion fails
+    return error_code
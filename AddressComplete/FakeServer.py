@@ -0,0 +1,313 @@
+"""A local stand-in for the AddressComplete Find and Retrieve APIs.
+
+The server answers the same json3.ws endpoints as Canada Post with
+synthetic addresses, so the clients can be load tested without
+spending credit. Point a client at it with ``base_url=server.url``.
+"""
+import json
+import random
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .AddressComplete import _AddressCompleteBase
+from .ErrorHandling import ERROR_CODE_TABLES
+
+_STREETS = (
+    "Main St", "King St W", "Queen St E", "Yonge St", "Bay St",
+    "Elm Ave", "Maple Dr", "Oak Cres", "Cedar Rd", "Pine Blvd",
+    "Rue Sainte-Catherine", "Boul Saint-Laurent", "Wellington St",
+    "Bank St", "Portage Ave", "Jasper Ave", "Granville St", "Robson St",
+)
+
+# City, province code, province name and the first letter of its
+# postal codes.
+_CITIES = (
+    ("Toronto", "ON", "Ontario", "M"),
+    ("Ottawa", "ON", "Ontario", "K"),
+    ("Montreal", "QC", "Quebec", "H"),
+    ("Vancouver", "BC", "British Columbia", "V"),
+    ("Calgary", "AB", "Alberta", "T"),
+    ("Edmonton", "AB", "Alberta", "T"),
+    ("Winnipeg", "MB", "Manitoba", "R"),
+    ("Halifax", "NS", "Nova Scotia", "B"),
+    ("Regina", "SK", "Saskatchewan", "S"),
+)
+
+_LETTERS = "ABCEGHJKLMNPRSTVXY"
+
+
+def _path(endpoint):
+    return urllib.parse.urlsplit(endpoint).path
+
+
+FIND_PATH = _path(_AddressCompleteBase.DEFAULT_FIND_ENDPOINT)
+RETRIEVE_PATH = _path(_AddressCompleteBase.DEFAULT_RETRIEVE_ENDPOINT)
+
+
+def lognormal_latency(median=0.05, sigma=0.5, seed=None):
+    """Returns a latency function drawing from a log-normal
+    distribution, the usual shape of API response times.
+
+    Args:
+        median (float): Median latency in seconds.
+        sigma (float): Spread; larger values give a longer tail.
+        seed (int): Seed for reproducible draws.
+    """
+    generator = random.Random(seed)
+    lock = threading.Lock()
+
+    def latency():
+        with lock:
+            return generator.lognormvariate(0, sigma) * median
+
+    return latency
+
+
+def synthetic_addresses(count=1000, seed=0):
+    """Returns ``count`` reproducible synthetic retrieve items."""
+    generator = random.Random(seed)
+    addresses = []
+    for index in range(count):
+        number = str(generator.randint(1, 9999))
+        street = generator.choice(_STREETS)
+        city, province_code, province_name, letter = generator.choice(
+            _CITIES
+        )
+        postal_code = (
+            f"{letter}{generator.randint(0, 9)}"
+            f"{generator.choice(_LETTERS)} {generator.randint(0, 9)}"
+            f"{generator.choice(_LETTERS)}{generator.randint(0, 9)}"
+        )
+        line1 = f"{number} {street}"
+        addresses.append({
+            "Id": f"FAKE|{index}",
+            "DomesticId": str(index),
+            "Language": "ENG",
+            "LanguageAlternatives": "ENG,FRE",
+            "BuildingNumber": number,
+            "Street": street,
+            "City": city,
+            "Line1": line1,
+            "Province": province_code,
+            "ProvinceName": province_name,
+            "ProvinceCode": province_code,
+            "PostalCode": postal_code,
+            "CountryName": "Canada",
+            "CountryIso2": "CA",
+            "CountryIso3": "CAN",
+            "CountryIsoNumber": "124",
+            "Label": (f"{line1}\n{city.upper()} {province_code}  "
+                      f"{postal_code}\nCANADA"),
+            "DataLevel": "Premise",
+            "Type": "Residential",
+        })
+    return addresses
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent benchmark clients open many connections at once.
+    request_queue_size = 128
+
+
+class FakeAddressCompleteServer:
+    """Serves synthetic Find and Retrieve responses over HTTP.
+
+    Find matches the search term against each address's text, returns
+    street containers (``Next`` is "Find") for search terms without a
+    digit, and lists a street's addresses when called with its
+    container Id. Retrieve returns the full synthetic record.
+
+    A search term or Id of the form "ERROR:<code>" returns that error
+    code. Errors can also be injected at random with ``error_rate``.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=None,
+                 error_rate=0.0, error_codes=(-1,), addresses=1000,
+                 seed=0):
+        """Initializes the server. Call ``start()`` to serve.
+
+        Args:
+            host (str): The address to bind.
+            port (int): The port to listen on (0 picks a free one).
+            latency (float or callable): Seconds to wait before each
+            response, or a function returning them (see
+            ``lognormal_latency``). Default is no added latency.
+            error_rate (float): Fraction of requests answered with an
+            error.
+            error_codes (tuple): Codes injected by ``error_rate``, from
+            the ``ErrorHandling`` maps.
+            addresses (int): Number of synthetic addresses.
+            seed (int): Seed for the addresses and injected errors.
+        """
+        if not callable(latency):
+            delay = latency or 0.0
+            latency = lambda: delay
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.addresses = synthetic_addresses(addresses, seed)
+        self.requests_served = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._by_id = {item["Id"]: item for item in self.addresses}
+        self._search_text = [
+            f"{item['Line1']} {item['City']} {item['ProvinceCode']} "
+            f"{item['PostalCode']}".lower()
+            for item in self.addresses
+        ]
+        self._streets = {}
+        for item in self.addresses:
+            self._streets.setdefault(item["Street"], []).append(item)
+        self._server = _Server((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self):
+        """The base URL to pass as a client's ``base_url``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serves requests from a daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and closes the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def respond(self, path, params):
+        """Returns the response body for a request.
+
+        Args:
+            path (str): The request path.
+            params (dict): The query parameters (one value each).
+        """
+        with self._lock:
+            self.requests_served += 1
+            inject = self.error_rate and self._random.random() < (
+                self.error_rate
+            )
+            code = self._random.choice(self.error_codes) if inject else None
+        if path == FIND_PATH:
+            operation = "find"
+        elif path == RETRIEVE_PATH:
+            operation = "retrieve"
+        else:
+            return None
+        if not params.get("Key"):
+            code = 2
+        target = params.get("SearchTerm" if operation == "find" else "Id", "")
+        if target.startswith("ERROR:"):
+            code = int(target[len("ERROR:"):])
+        if code is not None:
+            return self._error(operation, code)
+        if operation == "retrieve":
+            item = self._by_id.get(target)
+            if item is None:
+                return self._error(operation, 1001)
+            return {"Items": [item]}
+        return {"Items": self._find(params)}
+
+    def _find(self, params):
+        limit = int(params.get("MaxSuggestions") or 10)
+        container = params.get("Container")
+        if container is not None:
+            street = container[len("FAKE|STREET|"):]
+            return [self._find_item(item)
+                    for item in self._streets.get(street, [])[:limit]]
+        term = params.get("SearchTerm", "").lower().strip()
+        if term and not any(char.isdigit() for char in term):
+            streets = [street for street in self._streets
+                       if term in street.lower()]
+            if streets:
+                return [self._container_item(street)
+                        for street in streets[:limit]]
+        items = []
+        for item, text in zip(self.addresses, self._search_text):
+            if term in text:
+                items.append(self._find_item(item))
+                if len(items) == limit:
+                    break
+        return items
+
+    @staticmethod
+    def _find_item(item):
+        return {
+            "Id": item["Id"],
+            "Text": item["Line1"],
+            "Highlight": "",
+            "Cursor": 0,
+            "Description": (f"{item['City']}, {item['ProvinceCode']}, "
+                            f"{item['PostalCode']}"),
+            "Next": "Retrieve",
+        }
+
+    def _container_item(self, street):
+        return {
+            "Id": f"FAKE|STREET|{street}",
+            "Text": street,
+            "Highlight": "",
+            "Cursor": 0,
+            "Description": f"{len(self._streets[street])} Addresses",
+            "Next": "Find",
+        }
+
+    @staticmethod
+    def _error(operation, code):
+        error_class = ERROR_CODE_TABLES[operation].get(code)
+        description = error_class.__name__ if error_class else "Unknown"
+        return {"Items": [{
+            "Error": str(code),
+            "Description": description,
+            "Cause": "Injected by FakeAddressCompleteServer",
+            "Resolution": "",
+        }]}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections open so pooled clients can reuse them.
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this,
+            # Nagle's algorithm delays keep-alive responses.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                params = dict(urllib.parse.parse_qsl(query))
+                delay = server.latency()
+                if delay > 0:
+                    time.sleep(delay)
+                body = server.respond(path, params)
+                if body is None:
+                    self.send_error(404)
+                    return
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type",
+                                 "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,170 @@
+"""Quota-aware rotation across several AddressComplete API keys."""
+import threading
+import time
+
+from .ErrorHandling import (
+    AccountOutOfCreditError,
+    KeyDailyLimitExceededError,
+    KeyExpiredError,
+    KeyPoolExhaustedError,
+)
+
+SECONDS_PER_DAY = 86400
+
+# Errors that take a key out of the pool. The daily limit lifts at the
+# next day boundary; the others are probed again after ``cooldown``.
+KEY_ERRORS = (KeyDailyLimitExceededError, KeyExpiredError,
+              AccountOutOfCreditError)
+
+
+class _KeyState:
+    """Usage and availability of one key."""
+
+    __slots__ = ("quota", "used", "day", "disabled_until", "last_error")
+
+    def __init__(self, quota):
+        self.quota = quota
+        self.used = 0
+        self.day = None
+        self.disabled_until = None
+        self.last_error = None
+
+    def remaining(self):
+        if self.quota is None:
+            return float("inf")
+        return max(0, self.quota - self.used)
+
+
+class KeyPool:
+    """Spreads requests over several API keys by remaining daily quota.
+
+    Pass the pool as the ``api_key`` of a client. Each request goes to
+    the available key with the most quota left today (the least used
+    key when quotas are unknown). A key that answers with
+    ``KeyDailyLimitExceededError`` is set aside until the next day,
+    and one that answers with ``KeyExpiredError`` or
+    ``AccountOutOfCreditError`` until ``cooldown`` has passed; the
+    client then repeats the request on another key. When no key is
+    left, calls raise ``KeyPoolExhaustedError``.
+
+    Days start at ``day_start`` seconds after midnight UTC. One pool
+    can be shared by several clients and threads.
+    """
+
+    def __init__(self, keys, cooldown=3600.0, day_start=0):
+        """Initializes the pool.
+
+        Args:
+            keys (iterable or dict): The API keys, or a dict mapping
+            each key to its daily request quota (None for unknown).
+            cooldown (float): Seconds a key that expired or ran out of
+            credit is set aside before it is tried again.
+            day_start (float): Seconds after midnight UTC at which
+            daily quotas reset.
+        """
+        if not isinstance(keys, dict):
+            keys = dict.fromkeys(keys)
+        if not keys:
+            raise ValueError("A key pool needs at least one key")
+        self.cooldown = cooldown
+        self.day_start = day_start
+        self.rotations = 0
+        self._keys = {key: _KeyState(quota) for key, quota in keys.items()}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _today(self, now):
+        return int((now - self.day_start) // SECONDS_PER_DAY)
+
+    def _refresh(self, state, now):
+        """Resets a key's usage on a new day and lifts an expired
+        suspension."""
+        today = self._today(now)
+        if state.day != today:
+            state.day = today
+            state.used = 0
+        if state.disabled_until is not None and now >= state.disabled_until:
+            state.disabled_until = None
+
+    def acquire(self):
+        """Returns the key to use for the next request and counts the
+        request against its quota. Every attempt is counted, so the
+        remaining quota errs on the low side.
+
+        Raises:
+            KeyPoolExhaustedError: If every key is out of quota or set
+            aside.
+        """
+        now = time.time()
+        with self._lock:
+            best = None
+            best_rank = None
+            for key, state in self._keys.items():
+                self._refresh(state, now)
+                if state.disabled_until is not None:
+                    continue
+                remaining = state.remaining()
+                if remaining <= 0:
+                    continue
+                rank = (remaining, -state.used)
+                if best_rank is None or rank > best_rank:
+                    best, best_rank = key, rank
+            if best is None:
+                raise KeyPoolExhaustedError()
+            self._keys[best].used += 1
+            return best
+
+    def release(self, key, error=None):
+        """Records the outcome of a request sent with ``key``.
+
+        Args:
+            key (str): The key returned by ``acquire``.
+            error (Exception): The error the request raised, or None.
+
+        Returns:
+            bool: True if ``key`` was set aside and the request should
+            be repeated on another key.
+        """
+        if not isinstance(error, KEY_ERRORS):
+            return False
+        now = time.time()
+        if isinstance(error, KeyDailyLimitExceededError):
+            until = ((self._today(now) + 1) * SECONDS_PER_DAY
+                     + self.day_start)
+        else:
+            until = now + self.cooldown
+        with self._lock:
+            state = self._keys[key]
+            state.disabled_until = until
+            state.last_error = type(error)
+            self.rotations += 1
+        return True
+
+    @staticmethod
+    def is_key_error(error_class):
+        """Returns True for errors the pool handles by switching
+        keys."""
+        return issubclass(error_class, KEY_ERRORS)
+
+    @property
+    def stats(self):
+        """Returns, per key, the requests ``used`` today, the
+        ``remaining`` quota (None if unknown), whether it is
+        ``available`` and the ``last_error`` that set it aside."""
+        now = time.time()
+        with self._lock:
+            stats = {}
+            for key, state in self._keys.items():
+                self._refresh(state, now)
+                stats[key] = {
+                    "used": state.used,
+                    "remaining": (None if state.quota is None
+                                  else state.remaining()),
+                    "available": (state.disabled_until is None
+                                  and state.remaining() > 0),
+                    "last_error": (state.last_error.__name__
+                                   if state.last_error else None),
+                }
+            return stats
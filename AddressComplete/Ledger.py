@@ -0,0 +1,195 @@
+"""Credit accounting and budgets for AddressComplete calls."""
+import contextvars
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from .ErrorHandling import BudgetExceededError
+
+# Where a call's response came from. Only "api" spends credit.
+OUTCOMES = ("api", "cache", "coalesced", "index", "failed", "rejected",
+            "degraded")
+SAVED_OUTCOMES = ("cache", "coalesced", "index")
+
+_LABELS = contextvars.ContextVar("addresscomplete_labels", default=())
+
+
+class _Budget:
+    """A spending cap on the calls matching some labels."""
+
+    __slots__ = ("labels", "limit", "action", "spent")
+
+    def __init__(self, labels, limit, action):
+        self.labels = labels
+        self.limit = limit
+        self.action = action
+        self.spent = 0.0
+
+    def matches(self, labels):
+        return self.labels.items() <= labels.items()
+
+
+class CostLedger:
+    """Accounts for the credit spent by client calls.
+
+    Every ``find`` and ``retrieve`` is recorded with its outcome: "api"
+    (a billable request answered by the API), "cache", "coalesced" or
+    "index" (answered without spending credit), "failed" (the API
+    answered with an error), "rejected" or "degraded" (stopped by a
+    budget). Calls are grouped by their labels: the operation plus any
+    labels set with ``labels()``, such as a tenant or a job Id.
+
+    Budgets cap the credit spent by the calls matching some labels.
+    Once a budget is spent, billable calls it covers are rejected with
+    ``BudgetExceededError`` or degraded; cache, coalesced and index
+    answers keep working because they are free. Concurrent calls may
+    overshoot a budget by the calls already in flight.
+    """
+
+    def __init__(self, prices=None):
+        """Initializes an empty ledger.
+
+        Args:
+            prices (dict): Credit spent per billable call, by operation
+            (default is 1.0 for both "find" and "retrieve"; set it to
+            match your plan).
+        """
+        self.prices = {"find": 1.0, "retrieve": 1.0}
+        self.prices.update(prices or {})
+        self._counts = {}
+        self._budgets = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    @contextmanager
+    def labels(**labels):
+        """Labels every call made inside the ``with`` block, in this
+        thread or task and in the workers the client starts for it.
+
+        Blocks can be nested; inner labels are added to outer ones.
+        """
+        merged = dict(_LABELS.get())
+        merged.update((name, str(value)) for name, value in labels.items())
+        token = _LABELS.set(tuple(sorted(merged.items())))
+        try:
+            yield
+        finally:
+            _LABELS.reset(token)
+
+    def set_budget(self, limit, action="reject", **labels):
+        """Caps the credit spent by the calls carrying ``labels``.
+
+        Args:
+            limit (float): Credit allowed.
+            action (str): "reject" raises ``BudgetExceededError`` once
+            the budget is spent. "degrade" answers find calls with no
+            suggestions instead, so autocomplete keeps working without
+            spending credit, and rejects retrieve calls.
+            **labels: The labels a call must carry to count against the
+            budget, e.g. ``tenant="acme"``. No labels covers every
+            call.
+        """
+        if action not in ("reject", "degrade"):
+            raise ValueError(f"Unknown budget action: {action!r}")
+        labels = {name: str(value) for name, value in labels.items()}
+        with self._lock:
+            self._budgets = [budget for budget in self._budgets
+                             if budget.labels != labels]
+            self._budgets.append(_Budget(labels, limit, action))
+
+    def _call_labels(self, operation):
+        labels = dict(_LABELS.get())
+        labels["operation"] = operation
+        return labels
+
+    def check(self, operation):
+        """Returns None if a billable call may be made, or "degrade" if
+        it must be answered without calling the API.
+
+        Raises:
+            BudgetExceededError: If a budget covering the call is spent
+            and rejects further calls.
+        """
+        labels = self._call_labels(operation)
+        with self._lock:
+            exceeded = [budget for budget in self._budgets
+                        if budget.matches(labels)
+                        and budget.spent >= budget.limit]
+        if not exceeded:
+            return None
+        budget = exceeded[0]
+        if all(budget.action == "degrade" for budget in exceeded) and (
+                operation == "find"):
+            self.record(operation, "degraded")
+            return "degrade"
+        self.record(operation, "rejected")
+        raise BudgetExceededError(budget.labels, budget.limit)
+
+    def record(self, operation, outcome):
+        """Records the outcome of a call under the current labels."""
+        labels = self._call_labels(operation)
+        cost = self.prices.get(operation, 0.0) if outcome == "api" else 0.0
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = Counter()
+            counts[outcome] += 1
+            if cost:
+                counts["cost"] += cost
+                for budget in self._budgets:
+                    if budget.matches(labels):
+                        budget.spent += cost
+
+    def report(self, *group_by):
+        """Returns the recorded calls grouped by labels.
+
+        Args:
+            *group_by (str): Label names to group by, e.g. "tenant".
+            Default is every label.
+
+        Returns:
+            list: One dict per group with its labels, a count per
+            outcome, ``calls``, ``cost`` and ``saved`` (the credit the
+            cache, coalesced and index answers would have cost).
+        """
+        with self._lock:
+            entries = [(dict(key), Counter(counts))
+                       for key, counts in self._counts.items()]
+        groups = {}
+        for labels, counts in entries:
+            price = self.prices.get(labels["operation"], 0.0)
+            counts["saved"] = price * sum(counts[outcome]
+                                          for outcome in SAVED_OUTCOMES)
+            if group_by:
+                labels = {name: labels.get(name) for name in group_by}
+            key = tuple(labels.items())
+            if key not in groups:
+                groups[key] = (labels, Counter())
+            groups[key][1].update(counts)
+        rows = []
+        for labels, counts in groups.values():
+            row = dict(labels)
+            for outcome in OUTCOMES:
+                row[outcome] = counts[outcome]
+            row["calls"] = sum(counts[outcome] for outcome in OUTCOMES)
+            row["cost"] = counts["cost"]
+            row["saved"] = counts["saved"]
+            rows.append(row)
+        return rows
+
+    def budgets(self):
+        """Returns the budgets as dicts of ``labels``, ``limit``,
+        ``spent`` and ``action``."""
+        with self._lock:
+            return [{"labels": dict(budget.labels), "limit": budget.limit,
+                     "spent": budget.spent, "action": budget.action}
+                    for budget in self._budgets]
+
+    def reset(self):
+        """Forgets the recorded calls and the spending of every
+        budget."""
+        with self._lock:
+            self._counts = {}
+            for budget in self._budgets:
+                budget.spent = 0.0
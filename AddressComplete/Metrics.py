@@ -0,0 +1,293 @@
+"""Request metrics for the AddressComplete clients."""
+import bisect
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds of the latency buckets, in seconds.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0,
+    10.0,
+)
+
+QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+# (stats key, exported name, type) of the cache metrics.
+_CACHE_FAMILIES = (
+    ("hits", "cache_hits_total", "counter"),
+    ("misses", "cache_misses_total", "counter"),
+    ("evictions", "cache_evictions_total", "counter"),
+    ("expirations", "cache_expirations_total", "counter"),
+    ("entries", "cache_entries", "gauge"),
+    ("bytes", "cache_bytes", "gauge"),
+)
+
+
+def _escape(value):
+    return (str(value).replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n"))
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"'
+                    for name, value in labels.items())
+
+
+class Histogram:
+    """A fixed-bucket histogram, as exported to Prometheus.
+
+    Memory use does not grow with the number of observations.
+    Quantiles are estimated by linear interpolation inside the bucket
+    holding them, so their precision follows the bucket bounds.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initializes an empty histogram.
+
+        Args:
+            buckets (tuple): Upper bounds of the buckets. A final
+            unbounded bucket is always added.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Records one value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Returns the estimated ``q`` quantile, or None if empty.
+
+        Values in the unbounded bucket are reported as the largest
+        bucket bound.
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+class Metrics:
+    """A thread-safe registry of client metrics.
+
+    Clients created with ``metrics=`` record, per operation, the
+    latency and size of every API response, the number of requests,
+    errors by exception class and retries. Their caches are registered
+    so their hit ratios are reported too. One registry can be shared by
+    several clients.
+
+    Read the numbers with ``snapshot()``, export them in the Prometheus
+    text format with ``to_prometheus()``, or let Prometheus scrape them
+    from ``serve()``.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace="addresscomplete"):
+        """Initializes an empty registry.
+
+        Args:
+            buckets (tuple): Latency bucket bounds in seconds.
+            namespace (str): Prefix of the exported metric names.
+        """
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._caches = {}
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears every recorded value. Registered caches are kept."""
+        with self._lock:
+            self._latency = {}
+            self._requests = Counter()
+            self._bytes = Counter()
+            self._errors = Counter()
+            self._retries = Counter()
+
+    def register_cache(self, name, cache):
+        """Reports the ``stats`` of ``cache`` under ``name``."""
+        with self._lock:
+            self._caches[name] = cache
+
+    def observe_request(self, operation, seconds, size):
+        """Records one API response.
+
+        Args:
+            operation (str): "find" or "retrieve".
+            seconds (float): Time until the response was received.
+            size (int): Size of the response body in bytes.
+        """
+        with self._lock:
+            histogram = self._latency.get(operation)
+            if histogram is None:
+                histogram = self._latency[operation] = Histogram(
+                    self.buckets
+                )
+            histogram.observe(seconds)
+            self._requests[operation] += 1
+            self._bytes[operation] += size
+
+    def count_error(self, operation, error):
+        """Counts one error, by exception class name."""
+        with self._lock:
+            self._errors[operation, error] += 1
+
+    def count_retry(self, operation):
+        """Counts one retried attempt."""
+        with self._lock:
+            self._retries[operation] += 1
+
+    def snapshot(self):
+        """Returns the current values as a dictionary.
+
+        Returns:
+            dict: ``operations`` maps each operation to its
+            ``requests``, ``bytes``, ``retries``, ``errors`` (by class
+            name) and ``latency`` (``count``, ``sum``, ``p50``,
+            ``p95`` and ``p99`` in seconds). ``caches`` maps each
+            registered cache to its stats plus ``hit_ratio``.
+        """
+        with self._lock:
+            operations = {}
+            names = (set(self._requests) | set(self._retries)
+                     | {operation for operation, _ in self._errors})
+            for operation in sorted(names):
+                histogram = self._latency.get(operation) or Histogram(
+                    self.buckets
+                )
+                latency = {"count": histogram.count, "sum": histogram.sum}
+                for name, q in QUANTILES.items():
+                    latency[name] = histogram.quantile(q)
+                operations[operation] = {
+                    "requests": self._requests[operation],
+                    "bytes": self._bytes[operation],
+                    "retries": self._retries[operation],
+                    "errors": {
+                        error: count
+                        for (name, error), count in sorted(
+                            self._errors.items()
+                        )
+                        if name == operation
+                    },
+                    "latency": latency,
+                }
+            caches = dict(self._caches)
+        return {
+            "operations": operations,
+            "caches": {
+                name: self._cache_stats(cache)
+                for name, cache in sorted(caches.items())
+            },
+        }
+
+    @staticmethod
+    def _cache_stats(cache):
+        stats = dict(cache.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else None
+        return stats
+
+    def to_prometheus(self):
+        """Returns the metrics in the Prometheus text exposition
+        format."""
+        prefix = self.namespace
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        with self._lock:
+            latency = {
+                operation: (list(histogram.counts), histogram.count,
+                            histogram.sum)
+                for operation, histogram in sorted(self._latency.items())
+            }
+            counters = (
+                ("requests_total", "API requests sent.", self._requests),
+                ("response_bytes_total", "Bytes of API responses received.",
+                 self._bytes),
+                ("retries_total", "Attempts retried after a failure.",
+                 self._retries),
+            )
+            counters = [(name, help_text, sorted(values.items()))
+                        for name, help_text, values in counters]
+            errors = sorted(self._errors.items())
+            caches = sorted(self._caches.items())
+
+        family("request_duration_seconds", "histogram",
+               "Latency of API requests.")
+        for operation, (counts, count, total) in latency.items():
+            cumulative = 0
+            bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                labels = _labels(operation=operation, le=bound)
+                lines.append(f"{prefix}_request_duration_seconds_bucket"
+                             f"{{{labels}}} {cumulative}")
+            labels = _labels(operation=operation)
+            lines.append(f"{prefix}_request_duration_seconds_sum"
+                         f"{{{labels}}} {total}")
+            lines.append(f"{prefix}_request_duration_seconds_count"
+                         f"{{{labels}}} {count}")
+        for name, help_text, values in counters:
+            family(name, "counter", help_text)
+            for operation, value in values:
+                lines.append(f"{prefix}_{name}"
+                             f"{{{_labels(operation=operation)}}} {value}")
+        family("errors_total", "counter", "Errors by exception class.")
+        for (operation, error), value in errors:
+            labels = _labels(operation=operation, error=error)
+            lines.append(f"{prefix}_errors_total{{{labels}}} {value}")
+        if caches:
+            stats = [(name, cache.stats) for name, cache in caches]
+            for key, name, kind in _CACHE_FAMILIES:
+                family(name, kind, f"Response cache {key}.")
+                for cache_name, values in stats:
+                    lines.append(f"{prefix}_{name}"
+                                 f"{{{_labels(cache=cache_name)}}} "
+                                 f"{values[key]}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serves ``to_prometheus()`` over HTTP from a daemon thread.
+
+        Args:
+            port (int): The port to listen on (0 picks a free one).
+            host (str): The address to bind.
+
+        Returns:
+            ThreadingHTTPServer: The running server; call its
+            ``shutdown()`` to stop it.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type",
+                                 "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
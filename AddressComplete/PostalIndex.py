@@ -0,0 +1,232 @@
+"""A memory-mapped postal code index of retrieved addresses."""
+import mmap
+import os
+import re
+import struct
+
+from .PrefixIndex import PrefixIndex, _FIELD, _STORED_FIELDS
+
+_MAGIC = b"ACPOST1\n"
+# Magic, number of entries.
+_HEADER = struct.Struct("<8sI")
+# Compact postal code, record offset and record length.
+_ENTRY = struct.Struct("<6sII")
+
+_NON_ALNUM = re.compile(r"[^0-9A-Za-z]+")
+# "A" stands for a letter and "9" for a digit.
+_POSTAL_CODE_SHAPE = "A9A9A9"
+
+
+def compact_postal_code(text):
+    """Returns ``text`` upper-cased without spaces or punctuation, e.g.
+    "k1a 0b1" becomes "K1A0B1"."""
+    return _NON_ALNUM.sub("", text).upper()
+
+
+def _is_postal_prefix(text):
+    """Returns True if compact ``text`` is the start of a postal
+    code."""
+    return 0 < len(text) <= len(_POSTAL_CODE_SHAPE) and all(
+        char.isalpha() if kind == "A" else char.isdigit()
+        for char, kind in zip(text, _POSTAL_CODE_SHAPE)
+    )
+
+
+def _entries(items):
+    """Yields (compact postal code, record) for every Canadian address
+    among retrieve items or responses."""
+    for item in items:
+        if "Items" in item:
+            yield from _entries(item["Items"])
+            continue
+        if "Error" in item or not item.get("Id"):
+            continue
+        if item.get("CountryIso3", "CAN") not in ("", "CAN"):
+            continue
+        postal_code = compact_postal_code(item.get("PostalCode") or "")
+        text = item.get("Line1") or item.get("Text") or ""
+        if len(postal_code) != 6 or not _is_postal_prefix(postal_code):
+            continue
+        if not text:
+            continue
+        fields = [item["Id"], text]
+        fields.extend(item.get(name) or "" for name in _STORED_FIELDS)
+        yield postal_code.encode("ascii"), _FIELD.join(fields).encode("utf-8")
+
+
+class PostalCodeIndex:
+    """Answers postal code ``find`` searches from a memory-mapped file.
+
+    The file holds a sorted table of fixed-size entries (a compact
+    postal code and the position of its address) followed by the
+    addresses themselves. Opening it maps the file instead of reading
+    it, so startup does not depend on its size, and every process that
+    opens the same file shares one copy in the page cache. Searches
+    binary search the table and only decode the addresses they return.
+
+    Build the file with ``PostalCodeIndex.build`` from accumulated
+    retrieve results, e.g. the items of a ``PrefixIndex``. The index is
+    read-only; rebuild the file and call ``reload()`` to pick up new
+    addresses.
+    """
+
+    def __init__(self, path, min_matches=None):
+        """Opens an index file.
+
+        Args:
+            path (str): A file written by ``PostalCodeIndex.build``.
+            min_matches (int): Matches needed to answer a find call
+            (default is the call's ``max_suggestions``, a full page).
+        """
+        self.path = path
+        self.min_matches = min_matches
+        self.hits = 0
+        self.misses = 0
+        self._state = None
+        self._signature = None
+        self.reload()
+
+    @classmethod
+    def build(cls, path, items):
+        """Writes an index file of the Canadian addresses in ``items``.
+
+        The file is written next to ``path`` and moved into place, so
+        processes that have the previous file open keep reading it
+        until they call ``reload()``.
+
+        Args:
+            path (str): The index file to write.
+            items (iterable): Retrieve items or retrieve responses.
+            Addresses without a valid postal code are skipped, as are
+            repeated Ids.
+
+        Returns:
+            int: The number of addresses indexed.
+        """
+        seen = set()
+        entries = []
+        for postal_code, record in _entries(items):
+            address_id = record.split(_FIELD.encode(), 1)[0]
+            if address_id not in seen:
+                seen.add(address_id)
+                entries.append((postal_code, record))
+        entries.sort()
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, len(entries)))
+            offset = _HEADER.size + _ENTRY.size * len(entries)
+            for postal_code, record in entries:
+                file.write(_ENTRY.pack(postal_code, offset, len(record)))
+                offset += len(record)
+            for _, record in entries:
+                file.write(record)
+        os.replace(temporary, path)
+        return len(entries)
+
+    def reload(self):
+        """Maps the index file again if it was rebuilt.
+
+        Returns:
+            bool: True if a new file was mapped.
+        """
+        status = os.stat(self.path)
+        signature = (status.st_ino, status.st_size, status.st_mtime_ns)
+        if signature == self._signature:
+            return False
+        with open(self.path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC:
+            mapped.close()
+            raise ValueError(f"{self.path} is not a postal code index")
+        # Searches read the state once, so swapping it is safe while
+        # other threads search; the old map closes when unreferenced.
+        self._state = (mapped, count)
+        self._signature = signature
+        return True
+
+    def close(self):
+        """Unmaps the index file."""
+        if self._state is not None:
+            self._state[0].close()
+            self._state = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._state[1]
+
+    def _scan(self, prefix, limit=None):
+        """Yields the records whose postal code starts with
+        ``prefix``."""
+        mapped, count = self._state
+        prefix = prefix.encode("ascii")
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            start = _HEADER.size + middle * _ENTRY.size
+            if mapped[start:start + 6] < prefix:
+                low = middle + 1
+            else:
+                high = middle
+        found = 0
+        for index in range(low, count):
+            if limit is not None and found >= limit:
+                return
+            postal_code, offset, length = _ENTRY.unpack_from(
+                mapped, _HEADER.size + index * _ENTRY.size
+            )
+            if not postal_code.startswith(prefix):
+                return
+            found += 1
+            yield mapped[offset:offset + length].decode("utf-8").split(_FIELD)
+
+    @staticmethod
+    def _prefix(search_term):
+        """Returns the compact postal code prefix in ``search_term``, or
+        None if it is not a postal code search."""
+        prefix = compact_postal_code(search_term)
+        return prefix if _is_postal_prefix(prefix) else None
+
+    def search(self, search_term, limit=10):
+        """Returns find items for the addresses whose postal code starts
+        with ``search_term`` ("K1A", "K1A 0B1"), or an empty list if it
+        is not a postal code."""
+        prefix = self._prefix(search_term)
+        if prefix is None:
+            return []
+        return [PrefixIndex._find_item(record)
+                for record in self._scan(prefix, limit)]
+
+    def places(self, search_term):
+        """Returns the sorted (City, ProvinceCode) pairs indexed for a
+        postal code or FSA, to pre-filter a search locally."""
+        prefix = self._prefix(search_term)
+        if prefix is None:
+            return []
+        return sorted({(record[2], record[3])
+                       for record in self._scan(prefix)})
+
+    def lookup(self, search_term, country=None, max_suggestions=10):
+        """Returns a find response from the index, or None if the API
+        must be called.
+
+        Only postal code searches of at least a full FSA ("K1A") in
+        Canada are answered; other searches are not counted as misses.
+        """
+        if country not in (None, "CAN"):
+            return None
+        prefix = self._prefix(search_term)
+        if prefix is None or len(prefix) < 3:
+            return None
+        items = self.search(prefix, max_suggestions)
+        required = self.min_matches or max_suggestions
+        if len(items) < min(required, max_suggestions):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"Items": items}
@@ -0,0 +1,255 @@
+"""A local prefix index of retrieved addresses that can answer find."""
+import heapq
+import json
+import re
+import threading
+import unicodedata
+from array import array
+from itertools import accumulate, chain
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Separates the fields of a stored record, and the keys of a run.
+_FIELD = "\x1f"
+_KEY_SEPARATOR = "\n"
+
+# Keys buffered before they are sorted into a run.
+_RUN_SIZE = 4096
+
+# Fields stored after the Id and the address line.
+_STORED_FIELDS = ("City", "ProvinceCode", "PostalCode", "CountryIso3")
+
+
+def normalize(text):
+    """Case-folds ``text``, strips accents and reduces punctuation and
+    whitespace to single spaces."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+class _Run:
+    """Sorted keys packed into one string, with an array of their
+    offsets and an array of the record number of each key."""
+
+    __slots__ = ("_text", "_offsets", "_numbers")
+
+    def __init__(self, pairs):
+        """Packs a sorted list of (key, record number) pairs."""
+        keys = [key for key, _ in pairs]
+        self._text = _KEY_SEPARATOR.join(keys)
+        self._offsets = array("L", [0])
+        self._offsets.extend(accumulate(len(key) + 1 for key in keys))
+        self._numbers = array("L", (number for _, number in pairs))
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def _key(self, index):
+        return self._text[self._offsets[index]:self._offsets[index + 1] - 1]
+
+    def pairs(self):
+        """Returns the (key, record number) pairs in order."""
+        return zip(self._text.split(_KEY_SEPARATOR), self._numbers)
+
+    def scan(self, prefix):
+        """Yields the (key, record number) pairs whose key starts with
+        ``prefix``, in order."""
+        low, high = 0, len(self._numbers)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < prefix:
+                low = middle + 1
+            else:
+                high = middle
+        for index in range(low, len(self._numbers)):
+            key = self._key(index)
+            if not key.startswith(prefix):
+                return
+            yield key, self._numbers[index]
+
+    @classmethod
+    def merge(cls, first, second):
+        # Timsort finds the two sorted runs and merges them in linear
+        # time.
+        return cls(sorted(chain(first.pairs(), second.pairs())))
+
+
+class PrefixIndex:
+    """Answers ``find`` for addresses that were retrieved before.
+
+    Each address is stored once as a single string, and searched
+    through normalized keys (the full address line with its city,
+    province and postal code, and the postal code on its own). New keys
+    are buffered and sorted into runs packed in a few strings and
+    arrays. Runs of similar size are merged, so adding an address costs
+    O(log n) amortized and a lookup is a binary search in each of the
+    O(log n) runs followed by a short scan. Addresses can be added
+    while other threads search.
+
+    A client created with ``prefix_index=`` adds every address it
+    retrieves, and answers ``find`` from the index when it holds at
+    least ``min_matches`` matches, so results are never cut short.
+    """
+
+    def __init__(self, min_length=3, min_matches=None):
+        """Initializes an empty index.
+
+        Args:
+            min_length (int): Shortest normalized search term the index
+            answers; shorter terms match too broadly.
+            min_matches (int): Matches needed to answer a find call
+            (default is the call's ``max_suggestions``, a full page).
+        """
+        self.min_length = min_length
+        self.min_matches = min_matches
+        self.hits = 0
+        self.misses = 0
+        self._runs = []
+        self._pending = []
+        self._records = []
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, item):
+        """Adds one retrieve item. Items already present are skipped.
+
+        Returns:
+            bool: True if the item was added.
+        """
+        address_id = item.get("Id")
+        if not address_id or address_id in self._ids:
+            return False
+        text = item.get("Line1") or item.get("Text") or ""
+        if not text:
+            return False
+        fields = [address_id, text]
+        fields.extend(item.get(name) or "" for name in _STORED_FIELDS)
+        record = _FIELD.join(fields)
+        postal_code = item.get("PostalCode") or ""
+        keys = {normalize(" ".join(fields[1:5]))}
+        if postal_code:
+            keys.add(normalize(postal_code).replace(" ", ""))
+        with self._lock:
+            if address_id in self._ids:
+                return False
+            number = len(self._records)
+            self._records.append(record)
+            self._ids[address_id] = number
+            self._pending.extend((key, number) for key in keys)
+            if len(self._pending) >= _RUN_SIZE:
+                self._flush()
+        return True
+
+    def _flush(self):
+        """Sorts the buffered keys into a run, then merges the newest
+        runs while the last is at least as long as the one before it,
+        so run sizes keep decreasing. Called with the lock held."""
+        self._runs.append(_Run(sorted(self._pending)))
+        self._pending = []
+        runs = self._runs
+        while len(runs) > 1 and len(runs[-2]) <= len(runs[-1]):
+            last = runs.pop()
+            runs[-1] = _Run.merge(runs[-1], last)
+
+    def add_response(self, response):
+        """Adds every item of a retrieve response."""
+        for item in response.get("Items") or []:
+            if "Error" not in item:
+                self.add(item)
+
+    def search(self, search_term, country=None, limit=10):
+        """Returns find items for addresses whose key starts with the
+        normalized ``search_term``.
+
+        Args:
+            search_term (str): The text typed so far.
+            country (str): Only return addresses from this ISO 3166
+            alpha-3 country code.
+            limit (int): Maximum number of items.
+        """
+        prefix = normalize(search_term)
+        if not prefix:
+            return []
+        compact = prefix.replace(" ", "")
+        seen = set()
+        items = []
+        with self._lock:
+            for term in dict.fromkeys((prefix, compact)):
+                pending = sorted(pair for pair in self._pending
+                                 if pair[0].startswith(term))
+                matches = heapq.merge(pending,
+                                      *(run.scan(term) for run in self._runs))
+                for _, number in matches:
+                    if len(items) >= limit:
+                        break
+                    if number in seen:
+                        continue
+                    seen.add(number)
+                    record = self._records[number].split(_FIELD)
+                    if country and record[5] and record[5] != country:
+                        continue
+                    items.append(self._find_item(record))
+        return items
+
+    @staticmethod
+    def _find_item(record):
+        address_id, text, city, province_code, postal_code, _ = record
+        description = ", ".join(
+            part for part in (city, province_code, postal_code) if part
+        )
+        return {
+            "Id": address_id,
+            "Type": "Address",
+            "Text": text,
+            "Highlight": "",
+            "Cursor": 0,
+            "Description": description,
+            "Next": "Retrieve",
+        }
+
+    def lookup(self, search_term, country=None, max_suggestions=10):
+        """Returns a find response from the index, or None if the index
+        cannot answer confidently and the API must be called."""
+        if len(normalize(search_term)) < self.min_length:
+            self.misses += 1
+            return None
+        items = self.search(search_term, country, max_suggestions)
+        required = self.min_matches or max_suggestions
+        if len(items) < min(required, max_suggestions):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {"Items": items}
+
+    def items(self):
+        """Yields the indexed addresses as retrieve items with the
+        fields the index keeps, e.g. to build a ``PostalCodeIndex``."""
+        with self._lock:
+            records = list(self._records)
+        for record in records:
+            values = record.split(_FIELD)
+            yield dict(zip(("Id", "Line1") + _STORED_FIELDS, values))
+
+    def save(self, path):
+        """Writes the indexed addresses to ``path`` as JSON Lines."""
+        with open(path, "w", encoding="utf-8") as file:
+            for item in self.items():
+                file.write(json.dumps(item) + "\n")
+
+    def load(self, path):
+        """Adds the addresses in a JSON Lines file of retrieve items,
+        such as one written by ``save``.
+
+        Returns:
+            int: The number of addresses added.
+        """
+        added = 0
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    added += self.add(json.loads(line))
+        return added
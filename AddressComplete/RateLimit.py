@@ -0,0 +1,135 @@
+"""Client-side rate limiting for the AddressComplete clients."""
+import threading
+import time
+
+# SurgeProtectorTriggeredError and UserLookupLimitExceededError.
+THROTTLE_ERROR_CODES = frozenset({10, 17})
+
+
+class TokenBucket:
+    """A thread-safe token bucket whose rate adapts to throttling.
+
+    Tokens refill at ``rate`` per second up to ``capacity``. ``penalize``
+    multiplies the rate by ``backoff`` (down to ``min_rate``); the rate
+    then recovers linearly to the configured rate over
+    ``recovery_time`` seconds.
+    """
+
+    def __init__(self, rate, capacity=None, backoff=0.5, min_rate=None,
+                 recovery_time=60.0):
+        """Initializes the bucket, full.
+
+        Args:
+            rate (float): Requests per second.
+            capacity (float): Largest burst allowed (default is one
+            second's worth of requests).
+            backoff (float): Factor applied to the rate on each penalty.
+            min_rate (float): Lowest rate a penalty can reach (default
+            is a tenth of ``rate``).
+            recovery_time (float): Seconds to climb back from
+            ``min_rate`` to ``rate``.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.backoff = backoff
+        self.min_rate = min_rate if min_rate is not None else rate / 10
+        self.recovery_per_second = (rate - self.min_rate) / recovery_time
+        self.penalties = 0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rate < self.max_rate:
+            self.rate = min(
+                self.max_rate, self.rate + elapsed * self.recovery_per_second
+            )
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def reserve(self):
+        """Takes a token and returns the seconds to wait before using it.
+
+        The bucket may go into debt, so concurrent callers are queued
+        fairly behind each other.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Blocks until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self):
+        """Slows the bucket down after the API reported throttling."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.backoff)
+            self._tokens = min(self._tokens, 0)
+            self.penalties += 1
+
+
+class RateLimiter:
+    """Paces requests below a configured rate, optionally per API key.
+
+    One limiter can be shared by several clients and threads. Clients
+    call ``penalize`` when the API reports a surge protector or user
+    lookup limit error, which tightens the rate until it recovers.
+    """
+
+    def __init__(self, rate, burst=None, per_key=False, backoff=0.5,
+                 min_rate=None, recovery_time=60.0):
+        """Initializes the limiter.
+
+        Args:
+            rate (float): Requests per second (per key if ``per_key``).
+            burst (float): Largest burst allowed.
+            per_key (bool): Keep a separate bucket for each API key.
+            backoff (float): Factor applied to the rate on each penalty.
+            min_rate (float): Lowest rate a penalty can reach.
+            recovery_time (float): Seconds to climb back to ``rate``.
+        """
+        self.per_key = per_key
+        self._settings = {
+            "rate": rate,
+            "capacity": burst,
+            "backoff": backoff,
+            "min_rate": min_rate,
+            "recovery_time": recovery_time,
+        }
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key=None):
+        """Returns the bucket used for ``key``."""
+        if not self.per_key:
+            key = None
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(
+                        **self._settings
+                    )
+        return bucket
+
+    def reserve(self, key=None):
+        """Takes a token for ``key`` and returns the seconds to wait."""
+        return self.bucket(key).reserve()
+
+    def acquire(self, key=None):
+        """Blocks until a request for ``key`` may be sent."""
+        self.bucket(key).acquire()
+
+    def penalize(self, key=None):
+        """Tightens the rate for ``key`` after throttling."""
+        self.bucket(key).penalize()
@@ -0,0 +1,412 @@
+"""Record and replay API exchanges for offline load testing.
+
+A recording session wraps a client's HTTP session and appends every
+find and retrieve exchange to a gzip-compressed JSON Lines file: the
+request parameters (without the API key), the status, the body and
+the timing. A replay session answers the same requests from that file
+without a network or credit, either at full speed or with the recorded
+latencies, and ``replay`` re-issues the recorded traffic through a
+client to compare builds.
+"""
+import asyncio
+import gzip
+import json
+import threading
+import time
+import urllib.parse
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .AddressComplete import _AddressCompleteBase
+from .ErrorHandling import ReplayMissError
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+def _path(endpoint):
+    return urllib.parse.urlsplit(endpoint).path
+
+
+_OPERATIONS = {
+    _path(_AddressCompleteBase.DEFAULT_FIND_ENDPOINT): "find",
+    _path(_AddressCompleteBase.DEFAULT_RETRIEVE_ENDPOINT): "retrieve",
+}
+
+
+def _parse(url):
+    """Returns the operation and the parameters, without the key, of a
+    request URL."""
+    parts = urllib.parse.urlsplit(str(url))
+    params = dict(urllib.parse.parse_qsl(parts.query,
+                                         keep_blank_values=True))
+    params.pop("Key", None)
+    return _OPERATIONS.get(parts.path), params
+
+
+def _match_key(operation, params):
+    return operation, tuple(sorted(params.items()))
+
+
+def read_exchanges(path):
+    """Yields the exchanges recorded in ``path``, in recording order.
+
+    Each exchange is a dict with ``t`` (seconds since the recording
+    started), ``op``, ``params``, ``status``, ``elapsed`` (seconds)
+    and ``body``.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+class _Recorder:
+    """Appends exchanges to a recording file."""
+
+    def __init__(self, path):
+        self.recorded = 0
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def write(self, url, started, status, body):
+        operation, params = _parse(url)
+        exchange = {
+            "t": round(started - self._started, 6),
+            "op": operation,
+            "params": params,
+            "status": status,
+            "elapsed": round(time.monotonic() - started, 6),
+            "body": body.decode("utf-8"),
+        }
+        line = json.dumps(exchange, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RecordingSession:
+    """Wraps a ``requests.Session`` and records every exchange.
+
+    Pass it as the ``session`` of an ``AddressComplete`` client.
+    Attributes other than ``get`` and ``close`` are those of the
+    wrapped session.
+    """
+
+    def __init__(self, path, session=None):
+        """Initializes the session.
+
+        Args:
+            path (str): The recording file; new exchanges are appended.
+            session (requests.Session): The session that sends the
+            requests (default is a new one).
+        """
+        if session is None:
+            session = requests.Session()
+        self.session = session
+        self._recorder = _Recorder(path)
+
+    @property
+    def recorded(self):
+        """The number of exchanges recorded."""
+        return self._recorder.recorded
+
+    def get(self, url, **kwargs):
+        started = time.monotonic()
+        response = self.session.get(url, **kwargs)
+        self._recorder.write(url, started, response.status_code,
+                             response.content)
+        return response
+
+    def close(self):
+        """Closes the wrapped session and the recording file."""
+        self.session.close()
+        self._recorder.close()
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+class AsyncRecordingSession:
+    """Wraps an ``httpx.AsyncClient`` and records every exchange.
+
+    Pass it as the ``session`` of an ``AsyncAddressComplete`` client.
+    """
+
+    def __init__(self, path, session=None):
+        """Initializes the session.
+
+        Args:
+            path (str): The recording file; new exchanges are appended.
+            session (httpx.AsyncClient): The client that sends the
+            requests (default is a new one).
+        """
+        if session is None:
+            if httpx is None:
+                raise ImportError(
+                    "AsyncRecordingSession requires httpx. Install it with "
+                    "'pip install addresscomplete[async]'."
+                )
+            session = httpx.AsyncClient()
+        self.session = session
+        self._recorder = _Recorder(path)
+
+    @property
+    def recorded(self):
+        """The number of exchanges recorded."""
+        return self._recorder.recorded
+
+    async def get(self, url, **kwargs):
+        started = time.monotonic()
+        response = await self.session.get(url, **kwargs)
+        self._recorder.write(url, started, response.status_code,
+                             response.content)
+        return response
+
+    async def aclose(self):
+        """Closes the wrapped client and the recording file."""
+        await self.session.aclose()
+        self._recorder.close()
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+class ReplayResponse:
+    """A recorded response, with the parts of the response API the
+    clients use."""
+
+    __slots__ = ("status_code", "content", "url")
+
+    def __init__(self, status_code, content, url):
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        """Raises ``requests.HTTPError`` for 4xx and 5xx statuses, as
+        for either client."""
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error",
+                                     response=self)
+
+
+class _Replay:
+    """Looks up recorded exchanges by request.
+
+    Identical requests recorded several times are answered with their
+    recorded responses in turn, cycling, so a replay is deterministic.
+    """
+
+    def __init__(self, path, speed):
+        self.speed = speed
+        self.served = 0
+        self.misses = 0
+        self._exchanges = defaultdict(deque)
+        # Only what is needed to answer is kept for each exchange.
+        for exchange in read_exchanges(path):
+            key = _match_key(exchange["op"], exchange["params"])
+            self._exchanges[key].append(
+                (exchange["status"], exchange["body"], exchange["elapsed"])
+            )
+        self._lock = threading.Lock()
+
+    def take(self, url):
+        operation, params = _parse(url)
+        with self._lock:
+            queue = self._exchanges.get(_match_key(operation, params))
+            if not queue:
+                self.misses += 1
+                raise ReplayMissError(operation, params)
+            status, body, elapsed = queue[0]
+            queue.rotate(-1)
+            self.served += 1
+        delay = 0.0
+        if self.speed is not None:
+            delay = elapsed / self.speed
+        response = ReplayResponse(status, body.encode("utf-8"), url)
+        return response, delay
+
+
+class ReplaySession:
+    """Answers requests from a recording instead of the network.
+
+    Pass it as the ``session`` of an ``AddressComplete`` client.
+    Requests that were not recorded raise ``ReplayMissError``.
+    """
+
+    def __init__(self, path, speed=None):
+        """Loads the recording.
+
+        Args:
+            path (str): A file written by a recording session.
+            speed (float): Replay the recorded latencies divided by
+            ``speed`` (1.0 is the original profile). Default is no
+            latency at all.
+        """
+        self._replay = _Replay(path, speed)
+        self.headers = {}
+
+    @property
+    def served(self):
+        """The number of requests answered."""
+        return self._replay.served
+
+    @property
+    def misses(self):
+        """The number of requests that were not recorded."""
+        return self._replay.misses
+
+    def get(self, url, **kwargs):
+        response, delay = self._replay.take(url)
+        if delay > 0:
+            time.sleep(delay)
+        return response
+
+    def close(self):
+        pass
+
+
+class AsyncReplaySession(ReplaySession):
+    """The ``AsyncAddressComplete`` counterpart of ``ReplaySession``."""
+
+    async def get(self, url, **kwargs):
+        response, delay = self._replay.take(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
+
+    async def aclose(self):
+        pass
+
+
+def _client_call(client, exchange):
+    """Returns the client method and arguments that sent
+    ``exchange``."""
+    params = exchange["params"]
+    if exchange["op"] == "retrieve":
+        return client.retrieve, (params.get("Id", ""),)
+    return client.find, (
+        params.get("SearchTerm", ""),
+        params.get("Country", "CAN"),
+        int(params.get("MaxSuggestions", 10)),
+        params.get("LanguagePreference", "en"),
+        params.get("Container"),
+    )
+
+
+def _failed(outcome):
+    """Returns True for an exception or a failed ``LookupResult``."""
+    if isinstance(outcome, Exception):
+        return True
+    return getattr(outcome, "ok", True) is False
+
+
+def _recorded_calls(path):
+    """Yields the recorded find and retrieve exchanges, one at a time."""
+    for exchange in read_exchanges(path):
+        if exchange["op"] is not None:
+            yield exchange
+
+
+def replay(client, path, speed=None, max_workers=16):
+    """Re-issues the calls recorded in ``path`` through ``client``.
+
+    Pair it with a ``ReplaySession`` to run a recorded day of traffic
+    against a new client build offline, then compare the summary and
+    the client's cache or metrics statistics. The recording is read
+    lazily and at most twice ``max_workers`` calls are pending, so
+    memory use does not grow with the length of the recording.
+
+    Args:
+        client (AddressComplete): The client under test.
+        path (str): A recording file.
+        speed (float): Send the calls at their recorded times divided
+        by ``speed`` (1.0 is real time). Default is as fast as
+        possible.
+        max_workers (int): Maximum number of concurrent calls.
+
+    Returns:
+        dict: ``calls``, ``errors``, ``seconds`` and
+        ``calls_per_second``.
+    """
+    pending = threading.BoundedSemaphore(2 * max_workers)
+    lock = threading.Lock()
+    counts = {"calls": 0, "errors": 0}
+
+    def call(exchange):
+        try:
+            method, args = _client_call(client, exchange)
+            outcome = method(*args)
+        except Exception as error:
+            outcome = error
+        finally:
+            pending.release()
+        with lock:
+            counts["calls"] += 1
+            counts["errors"] += _failed(outcome)
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for exchange in _recorded_calls(path):
+            if speed is not None:
+                wait = started + exchange["t"] / speed - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            pending.acquire()
+            executor.submit(call, exchange)
+    return _summary(counts, time.monotonic() - started)
+
+
+async def async_replay(client, path, speed=None, max_workers=100):
+    """The ``AsyncAddressComplete`` counterpart of ``replay``."""
+    semaphore = asyncio.Semaphore(max_workers)
+    counts = {"calls": 0, "errors": 0}
+    tasks = set()
+
+    async def call(exchange):
+        try:
+            method, args = _client_call(client, exchange)
+            outcome = await method(*args)
+        except Exception as error:
+            outcome = error
+        finally:
+            semaphore.release()
+        counts["calls"] += 1
+        counts["errors"] += _failed(outcome)
+
+    started = time.monotonic()
+    for exchange in _recorded_calls(path):
+        if speed is not None:
+            wait = started + exchange["t"] / speed - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        await semaphore.acquire()
+        task = asyncio.ensure_future(call(exchange))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+    return _summary(counts, time.monotonic() - started)
+
+
+def _summary(counts, seconds):
+    calls = counts["calls"]
+    return {
+        "calls": calls,
+        "errors": counts["errors"],
+        "seconds": seconds,
+        "calls_per_second": calls / seconds if seconds else None,
+    }
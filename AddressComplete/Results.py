@@ -0,0 +1,152 @@
+"""Compact typed result classes for find and retrieve responses."""
+import sys
+
+# Values repeated across many results, kept as one shared string each.
+_INTERNED_FIELDS = frozenset({
+    "AdminAreaName", "City", "CountryIso2", "CountryIso3", "CountryName",
+    "DataLevel", "Language", "LanguageAlternatives", "Next", "Province",
+    "ProvinceCode", "ProvinceName", "Street", "Type",
+})
+
+RETRIEVE_FIELDS = (
+    "Id", "DomesticId", "Language", "LanguageAlternatives", "Department",
+    "Company", "SubBuilding", "BuildingNumber", "BuildingName",
+    "SecondaryStreet", "Street", "Block", "Neighbourhood", "District",
+    "City", "Line1", "Line2", "Line3", "Line4", "Line5", "AdminAreaName",
+    "AdminAreaCode", "Province", "ProvinceName", "ProvinceCode",
+    "PostalCode", "CountryName", "CountryIso2", "CountryIso3",
+    "CountryIsoNumber", "SortingNumber1", "SortingNumber2", "Barcode",
+    "POBoxNumber", "Label", "DataLevel", "Type",
+) + tuple(f"Field{number}" for number in range(1, 21))
+
+
+def _value(name, value):
+    if isinstance(value, str) and name in _INTERNED_FIELDS:
+        return sys.intern(value)
+    return value
+
+
+class _Result:
+    """Base class for slotted results built from API dictionaries."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds a result from one decoded ``Items`` entry."""
+        result = cls.__new__(cls)
+        for name in cls.__slots__:
+            if not name.startswith("_"):
+                setattr(result, name, _value(name, data.get(name, "")))
+        return result
+
+    @classmethod
+    def from_response(cls, response):
+        """Builds one result per entry of a response's ``Items``."""
+        return [cls.from_dict(item) for item in response.get("Items") or []]
+
+    def to_dict(self):
+        """Returns the fields as a dictionary."""
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__ if not name.startswith("_")
+        }
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        # Hashes the fields compared by __eq__; results must not be
+        # modified while they are in a set or used as dict keys.
+        return hash((type(self), frozenset(self.to_dict().items())))
+
+    def __repr__(self):
+        return f"{type(self).__name__}(Id={self.Id!r})"
+
+
+class FindItem(_Result):
+    """One suggestion returned by ``find``."""
+
+    __slots__ = ("Id", "Type", "Text", "Highlight", "Cursor", "Description",
+                 "Next")
+
+
+class Address(_Result):
+    """One address returned by ``retrieve``.
+
+    The commonly used fields are stored in slots. Every other non-empty
+    field is kept in a compact tuple and looked up only when accessed;
+    empty fields read as "".
+    """
+
+    __slots__ = ("Id", "Company", "SubBuilding", "BuildingNumber", "Street",
+                 "Line1", "Line2", "City", "Province", "ProvinceCode",
+                 "PostalCode", "CountryIso2", "Type", "_extra")
+
+    _KNOWN_FIELDS = frozenset(RETRIEVE_FIELDS)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Builds an address from one decoded ``Items`` entry."""
+        result = super().from_dict(data)
+        result._extra = tuple(
+            (name, _value(name, value)) for name, value in data.items()
+            if value not in ("", None) and name not in cls.__slots__
+        )
+        return result
+
+    def __getattr__(self, name):
+        # Only called for names that are not slots.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        for field, value in self._extra:
+            if field == name:
+                return value
+        if name in self._KNOWN_FIELDS:
+            return ""
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def to_dict(self):
+        """Returns every field, including the rarely used ones."""
+        data = super().to_dict()
+        data.update(self._extra)
+        return data
+
+
+class LookupResult:
+    """The outcome of a call made by a client with ``raise_errors=False``.
+
+    API errors are reported here instead of being raised: ``ok`` is
+    False, ``response`` is None, and ``error_class`` and ``error_code``
+    describe the error.
+    """
+
+    __slots__ = ("response", "error_class", "error_code")
+
+    def __init__(self, response=None, error_class=None, error_code=None):
+        self.response = response
+        self.error_class = error_class
+        self.error_code = error_code
+
+    @property
+    def ok(self):
+        """True if the call succeeded."""
+        return self.error_class is None
+
+    def unwrap(self):
+        """Returns the response, or raises the error if the call failed."""
+        if self.error_class is not None:
+            error = self.error_class()
+            error.error_code = self.error_code
+            raise error
+        return self.response
+
+    def __repr__(self):
+        if self.error_class is None:
+            return "LookupResult(ok)"
+        return (f"LookupResult({self.error_class.__name__}, "
+                f"error_code={self.error_code!r})")
@@ -0,0 +1,170 @@
+"""Retry policies and circuit breaking for the AddressComplete clients."""
+import random
+import threading
+import time
+
+import requests
+
+from .ErrorHandling import (
+    AccountSuspendedError,
+    CircuitOpenError,
+    KeyExpiredError,
+    NoResponseError,
+    SurgeProtectorTriggeredError,
+    UnknownKeyError,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+TRANSIENT_ERRORS = (
+    requests.Timeout,
+    requests.ConnectionError,
+    NoResponseError,
+    SurgeProtectorTriggeredError,
+)
+if httpx is not None:
+    TRANSIENT_ERRORS += (httpx.TimeoutException, httpx.TransportError)
+
+HTTP_STATUS_ERRORS = (requests.HTTPError,)
+if httpx is not None:
+    HTTP_STATUS_ERRORS += (httpx.HTTPStatusError,)
+
+FATAL_ERRORS = (UnknownKeyError, KeyExpiredError, AccountSuspendedError)
+
+
+def is_transient(error):
+    """Returns True if ``error`` suggests the upstream is struggling:
+    timeouts, connection failures, HTTP 5xx or 429 responses, the find
+    no-response error (1005) and the surge protector."""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    if isinstance(error, HTTP_STATUS_ERRORS):
+        response = getattr(error, "response", None)
+        status_code = getattr(response, "status_code", None)
+        return status_code is not None and (
+            status_code >= 500 or status_code == 429
+        )
+    return False
+
+
+class RetryPolicy:
+    """Retries transient failures with jittered exponential backoff."""
+
+    def __init__(self, max_attempts=3, backoff=0.1, max_backoff=5.0,
+                 jitter=True, retryable=is_transient, fatal=FATAL_ERRORS):
+        """Initializes the policy.
+
+        Args:
+            max_attempts (int): Total attempts, including the first.
+            backoff (float): Base delay in seconds, doubled on each
+            attempt.
+            max_backoff (float): Upper bound for the delay.
+            jitter (bool): Pick the delay uniformly between zero and the
+            backoff ("full jitter"), so retries of many callers spread
+            out.
+            retryable (callable): Returns True for errors worth
+            retrying.
+            fatal (tuple): Errors that are never retried, whatever
+            ``retryable`` says.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retryable = retryable
+        self.fatal = fatal
+
+    def is_retryable(self, error):
+        """Returns True if ``error`` should be retried."""
+        if isinstance(error, self.fatal):
+            return False
+        return self.retryable(error)
+
+    def delay(self, attempt):
+        """Returns the seconds to wait after failed attempt ``attempt``."""
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+
+class CircuitBreaker:
+    """Fails fast while the upstream keeps failing.
+
+    After ``failure_threshold`` consecutive transient failures the
+    circuit opens and calls raise ``CircuitOpenError`` without reaching
+    the API. After ``reset_timeout`` seconds a single probe call is let
+    through; its success closes the circuit and its failure reopens it.
+    A probe that is abandoned without an outcome, e.g. a cancelled task,
+    is released, and a probe that has not reported back within
+    ``reset_timeout`` is replaced by a new one.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0,
+                 is_failure=is_transient):
+        """Initializes a closed circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the
+            circuit.
+            reset_timeout (float): Seconds to stay open before probing.
+            is_failure (callable): Returns True for errors that count as
+            upstream failures. Other errors show the upstream is
+            answering and count as successes.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+        self.state = self.CLOSED
+        self.rejected = 0
+        self._failures = 0
+        self._opened_at = None
+        self._probed_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raises ``CircuitOpenError`` if the call must not be made."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            since = self._opened_at if self.state == self.OPEN else (
+                self._probed_at)
+            if now - since >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probed_at = now
+                return
+            self.rejected += 1
+        raise CircuitOpenError()
+
+    def release(self):
+        """Gives up the probe of a call abandoned without an outcome, so
+        the next call probes instead."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record(self, error=None):
+        """Records the outcome of a call.
+
+        Args:
+            error (Exception): The error raised by the call, or None if
+            it succeeded.
+        """
+        with self._lock:
+            if error is None or not self.is_failure(error):
+                self._failures = 0
+                self.state = self.CLOSED
+                return
+            self._failures += 1
+            if (self.state == self.HALF_OPEN
+                    or self._failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
@@ -0,0 +1,220 @@
+"""Per-phase tracing of AddressComplete calls."""
+import heapq
+import itertools
+import threading
+import time
+from contextlib import nullcontext
+
+# httpx/httpcore trace events, by prefix, and the phase they time.
+_HTTPX_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.connect_unix_socket": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http11.send_request_body": "send",
+    "http11.receive_response_headers": "first_byte",
+    "http11.receive_response_body": "read",
+    "http2.send_connection_init": "send",
+    "http2.send_request_headers": "send",
+    "http2.send_request_body": "send",
+    "http2.receive_response_headers": "first_byte",
+    "http2.receive_response_body": "read",
+}
+
+
+class Span:
+    """One timed phase of a call."""
+
+    __slots__ = ("name", "start", "duration")
+
+    def __init__(self, name, start, duration):
+        self.name = name
+        self.start = start
+        self.duration = duration
+
+    def __repr__(self):
+        return f"Span({self.name!r}, {self.duration * 1000:.3f} ms)"
+
+
+class _Phase:
+    """Times a ``with`` block as a span of ``trace``."""
+
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.trace.add(self.name, self.start,
+                       time.perf_counter() - self.start)
+
+
+class Trace:
+    """The phases of one ``find`` or ``retrieve`` call.
+
+    Phases can repeat when a call is retried; ``breakdown()`` sums them.
+    The API key is never recorded: ``key`` is the search parameters of
+    a find call or the Id of a retrieve call.
+    """
+
+    __slots__ = ("operation", "key", "started", "duration", "spans",
+                 "error", "_tracer")
+
+    def __init__(self, tracer, operation, key):
+        self.operation = operation
+        self.key = key
+        self.started = time.perf_counter()
+        self.duration = None
+        self.spans = []
+        self.error = None
+        self._tracer = tracer
+
+    def phase(self, name):
+        """Returns a context manager timing a phase called ``name``."""
+        return _Phase(self, name)
+
+    def add(self, name, start, duration):
+        """Records a phase that was timed elsewhere."""
+        span = Span(name, start, duration)
+        self.spans.append(span)
+        self._tracer._span_finished(self, span)
+
+    def finish(self, error=None):
+        """Ends the call.
+
+        Args:
+            error (Exception or type): The error the call failed with.
+        """
+        self.duration = time.perf_counter() - self.started
+        if error is not None:
+            self.error = error if isinstance(error, type) else type(error)
+        self._tracer._trace_finished(self)
+
+    def breakdown(self):
+        """Returns the seconds spent in each phase, in first-seen
+        order."""
+        totals = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        return totals
+
+    def httpx_hook(self):
+        """Returns an httpx ``trace`` extension recording the
+        connection phases of an async request.
+
+        The time between the hook's creation and the first connection
+        event is recorded as "acquire" (waiting for a pooled
+        connection).
+        """
+        requested = time.perf_counter()
+        starts = {}
+
+        async def hook(event_name, info):
+            now = time.perf_counter()
+            if "acquire" not in starts:
+                starts["acquire"] = now
+                self.add("acquire", requested, now - requested)
+            prefix, _, stage = event_name.rpartition(".")
+            phase = _HTTPX_PHASES.get(prefix)
+            if phase is None:
+                return
+            if stage == "started":
+                starts[prefix] = now
+            elif stage in ("complete", "failed"):
+                start = starts.pop(prefix, None)
+                if start is not None:
+                    self.add(phase, start, now - start)
+
+        return hook
+
+    def __repr__(self):
+        return (f"Trace({self.operation!r}, {self.key!r}, "
+                f"duration={self.duration})")
+
+
+class _NullTrace:
+    """Stands in for a trace when tracing is disabled."""
+
+    __slots__ = ()
+
+    _PHASE = nullcontext()
+
+    def phase(self, name):
+        return self._PHASE
+
+    def add(self, name, start, duration):
+        pass
+
+    def finish(self, error=None):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Tracer:
+    """Collects per-phase timings of client calls.
+
+    The phases of a call are, in order: "build" (the request URL),
+    "index" (the postal code and prefix indexes, find only), "cache"
+    (the cache lookup), "throttle" (the rate limiter), "acquire",
+    "connect", "tls" and "send" (async client only), "first_byte"
+    (until the response headers arrived; for the sync client this
+    includes connecting and sending), "read" (the body), "decode" (JSON
+    decoding) and "classify" (error mapping). A retried call also has
+    "backoff" phases.
+    """
+
+    def __init__(self, on_span=None, on_trace=None, slow_calls=0):
+        """Initializes the tracer.
+
+        Args:
+            on_span (callable): Called as ``on_span(trace, span)`` when
+            a phase ends.
+            on_trace (callable): Called with the ``Trace`` when a call
+            ends.
+            slow_calls (int): Number of slowest calls to keep, with
+            their phases, for ``slowest()`` (default is none).
+        """
+        self.on_span = on_span
+        self.on_trace = on_trace
+        self.slow_calls = slow_calls
+        self._slowest = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def start(self, operation, key):
+        """Returns a new ``Trace`` for a call."""
+        return Trace(self, operation, key)
+
+    def _span_finished(self, trace, span):
+        if self.on_span is not None:
+            self.on_span(trace, span)
+
+    def _trace_finished(self, trace):
+        if self.on_trace is not None:
+            self.on_trace(trace)
+        if self.slow_calls <= 0:
+            return
+        entry = (trace.duration, next(self._order), trace)
+        with self._lock:
+            if len(self._slowest) < self.slow_calls:
+                heapq.heappush(self._slowest, entry)
+            elif entry[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self):
+        """Returns the slowest calls kept, slowest first."""
+        with self._lock:
+            entries = sorted(self._slowest, reverse=True)
+        return [trace for _, _, trace in entries]
+
+    def clear(self):
+        """Forgets the slowest calls."""
+        with self._lock:
+            self._slowest = []
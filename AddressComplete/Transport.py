@@ -0,0 +1,146 @@
+"""HTTP/2 transport for the AddressComplete clients."""
+import warnings
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+try:
+    import h2
+except ImportError:  # pragma: no cover - optional dependency
+    h2 = None
+
+
+def resolve_http2(http2):
+    """Returns True if HTTP/2 was requested and can be used.
+
+    Without httpx or h2 installed, warns and returns False so the
+    client falls back to HTTP/1.1.
+    """
+    if not http2:
+        return False
+    if httpx is None or h2 is None:
+        warnings.warn(
+            "HTTP/2 requires httpx and h2; falling back to HTTP/1.1. "
+            "Install them with 'pip install addresscomplete[http2]'.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+        return False
+    return True
+
+
+def _timeout(timeout):
+    """Converts a requests timeout (seconds or a (connect, read) tuple)
+    to an httpx one."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(None, connect=connect, read=read)
+    return timeout
+
+
+def _retries(max_retries):
+    """Converts a requests ``max_retries`` (a count or a
+    ``urllib3.util.Retry``) to the connection retry count httpx takes."""
+    if isinstance(max_retries, int):
+        return max_retries
+    # httpx only retries failed connections.
+    for count in (getattr(max_retries, "connect", None),
+                  getattr(max_retries, "total", None)):
+        if isinstance(count, int) and not isinstance(count, bool):
+            return count
+    raise TypeError(
+        "With http2=True, max_retries must be an int or a Retry with an "
+        f"integer connect or total count, not {max_retries!r}"
+    )
+
+
+def _request_error(error):
+    """Returns the ``requests`` exception matching an httpx one."""
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.ConnectTimeout(error)
+    if isinstance(error, httpx.ReadTimeout):
+        return requests.ReadTimeout(error)
+    if isinstance(error, httpx.TimeoutException):
+        return requests.Timeout(error)
+    if isinstance(error, httpx.TransportError):
+        return requests.ConnectionError(error)
+    return requests.RequestException(error)
+
+
+def _response(response):
+    """Wraps an httpx response in a ``requests.Response``, so
+    ``raise_for_status`` raises ``requests.HTTPError``. The httpx
+    response is kept as ``raw``."""
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.url = str(response.url)
+    converted.reason = response.reason_phrase
+    converted.encoding = response.encoding
+    converted.raw = response
+    converted._content = response.content
+    return converted
+
+
+class HTTP2Session:
+    """A ``requests.Session`` stand-in that sends requests over HTTP/2.
+
+    Concurrent requests from many threads are multiplexed as streams
+    over a few connections instead of needing one connection each.
+    The protocol is negotiated per connection, so servers and proxies
+    that only speak HTTP/1.1 are still served, over HTTP/1.1. Only the
+    parts of the session API the ``AddressComplete`` client uses are
+    provided. Responses and errors are ``requests`` ones, as with a
+    ``requests.Session``.
+    """
+
+    def __init__(self, max_connections=10, keepalive_expiry=5.0,
+                 max_retries=0):
+        """Initializes the session.
+
+        Args:
+            max_connections (int): Maximum number of connections; with
+            HTTP/2 one connection per host is usually enough.
+            keepalive_expiry (float): Seconds an idle connection is kept
+            before being closed.
+            max_retries (int or urllib3.util.Retry): Connection-level
+            retries performed by the transport. Only the connect (or
+            total) count of a ``Retry`` is used.
+        """
+        if httpx is None:
+            raise ImportError(
+                "HTTP2Session requires httpx. Install it with "
+                "'pip install addresscomplete[http2]'."
+            )
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        transport = httpx.HTTPTransport(http2=True, limits=limits,
+                                        retries=_retries(max_retries))
+        self.client = httpx.Client(transport=transport, timeout=None)
+        self.headers = self.client.headers
+
+    def get(self, url, timeout=None, stream=False, **kwargs):
+        """Sends a GET request and returns a ``requests.Response`` with
+        its body read. ``stream`` is accepted for compatibility.
+
+        Raises:
+            requests.RequestException: The ``requests`` counterpart of
+            the httpx error, e.g. ``requests.ConnectionError``.
+        """
+        try:
+            response = self.client.get(url, timeout=_timeout(timeout))
+        except httpx.HTTPError as error:
+            raise _request_error(error) from error
+        return _response(response)
+
+    def close(self):
+        """Closes the connections."""
+        self.client.close()
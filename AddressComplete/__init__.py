@@ -1,6 +1,33 @@
 from .AddressComplete import AddressComplete
+from .AsyncAddressComplete import AsyncAddressComplete
+from .Autocomplete import (
+    AsyncAutocompleteSession,
+    AsyncDebouncedSession,
+    AutocompleteSession,
+    DebouncedSession,
+)
+from .Bulk import BulkValidator
+from .Cache import LRUCache, SQLiteCache
+from .Canonicalize import Canonicalizer
+from .Coalescing import AsyncSingleFlight, SingleFlight
 from .ErrorHandling import FindError, RetrieveError
+from .KeyPool import KeyPool
+from .Ledger import CostLedger
+from .Metrics import Metrics
+from .PostalIndex import PostalCodeIndex
+from .PrefixIndex import PrefixIndex
+from .RateLimit import RateLimiter, TokenBucket
+from .Results import Address, FindItem, LookupResult
+from .Retry import CircuitBreaker, RetryPolicy
+from .Tracing import Tracer
 
 __version__ = "1.0.3"
 
-__all__ = ["AddressComplete", "FindError", "RetrieveError"]
\ No newline at end of file
+__all__ = ["Address", "AddressComplete", "AsyncAddressComplete",
+           "AsyncAutocompleteSession", "AsyncDebouncedSession",
+           "AsyncSingleFlight", "AutocompleteSession", "BulkValidator",
+           "Canonicalizer", "CircuitBreaker", "CostLedger", "DebouncedSession",
+           "FindError", "FindItem", "KeyPool", "LookupResult", "LRUCache",
+           "Metrics", "PostalCodeIndex", "PrefixIndex", "RateLimiter",
+           "RetrieveError", "RetryPolicy", "SingleFlight", "SQLiteCache",
+           "TokenBucket", "Tracer"]
\ No newline at end of file
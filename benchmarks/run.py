@@ -0,0 +1,180 @@
+"""Load-test the AddressComplete clients against the local fake server.
+
+Drives the same workload through four client modes and reports
+throughput and latency percentiles:
+
+    sync      one request at a time, new connection per request
+    pooled    one request at a time over a keep-alive connection pool
+    threaded  concurrent requests from a thread pool
+    async     concurrent requests from AsyncAddressComplete
+
+Example:
+
+    python benchmarks/run.py --requests 2000 --concurrency 32 --latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from addresscomplete import AddressComplete, AsyncAddressComplete
+from addresscomplete.FakeServer import (
+    FakeAddressCompleteServer,
+    lognormal_latency,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+MODES = ("sync", "pooled", "threaded", "async")
+
+
+def build_workload(server, count, retrieve_ratio, seed):
+    """Returns ``count`` (operation, argument) calls: find on address
+    prefixes and retrieve on known Ids."""
+    generator = random.Random(seed)
+    calls = []
+    for _ in range(count):
+        item = generator.choice(server.addresses)
+        if generator.random() < retrieve_ratio:
+            calls.append(("retrieve", item["Id"]))
+        else:
+            line1 = item["Line1"]
+            calls.append(("find", line1[:generator.randint(3, len(line1))]))
+    return calls
+
+
+def percentile(values, q):
+    """Returns the nearest-rank ``q`` percentile of sorted ``values``."""
+    if not values:
+        return float("nan")
+    index = min(len(values) - 1, max(0, round(q * len(values)) - 1))
+    return values[index]
+
+
+def timed_call(client, operation, argument):
+    started = time.perf_counter()
+    try:
+        getattr(client, operation)(argument)
+        error = False
+    except Exception:
+        error = True
+    return time.perf_counter() - started, error
+
+
+async def timed_async_call(client, semaphore, operation, argument):
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            await getattr(client, operation)(argument)
+            error = False
+        except Exception:
+            error = True
+        return time.perf_counter() - started, error
+
+
+def run_sync(base_url, calls, concurrency, keep_alive):
+    with AddressComplete("benchmark", base_url=base_url, pool_maxsize=1,
+                         keep_alive=keep_alive) as client:
+        return [timed_call(client, *call) for call in calls]
+
+
+def run_threaded(base_url, calls, concurrency):
+    with AddressComplete("benchmark", base_url=base_url,
+                         pool_maxsize=concurrency) as client, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda call: timed_call(client, *call),
+                                 calls))
+
+
+async def run_async(base_url, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncAddressComplete("benchmark", base_url=base_url,
+                                    max_connections=concurrency) as client:
+        return await asyncio.gather(*(
+            timed_async_call(client, semaphore, *call) for call in calls
+        ))
+
+
+def run_mode(mode, base_url, calls, concurrency):
+    """Runs the workload in ``mode`` and returns its summary."""
+    started = time.perf_counter()
+    if mode == "sync":
+        outcomes = run_sync(base_url, calls, concurrency, keep_alive=False)
+    elif mode == "pooled":
+        outcomes = run_sync(base_url, calls, concurrency, keep_alive=True)
+    elif mode == "threaded":
+        outcomes = run_threaded(base_url, calls, concurrency)
+    else:
+        outcomes = asyncio.run(run_async(base_url, calls, concurrency))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for latency, _ in outcomes)
+    return {
+        "mode": mode,
+        "requests": len(outcomes),
+        "errors": sum(error for _, error in outcomes),
+        "seconds": elapsed,
+        "requests_per_second": len(outcomes) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def print_table(results):
+    print(f"{'mode':<10}{'requests':>10}{'errors':>8}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for result in results:
+        print(f"{result['mode']:<10}{result['requests']:>10}"
+              f"{result['errors']:>8}{result['requests_per_second']:>10.1f}"
+              f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+              f"{result['p99_ms']:>10.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000,
+                        help="calls per mode (default 1000)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="workers for threaded and async (default 16)")
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="median server latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.5,
+                        help="spread of the log-normal server latency")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of responses that are API errors")
+    parser.add_argument("--retrieve-ratio", type=float, default=0.3,
+                        help="fraction of calls that are retrieves")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true",
+                        help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    latency = lognormal_latency(args.latency, args.sigma, args.seed)
+    server = FakeAddressCompleteServer(latency=latency,
+                                       error_rate=args.error_rate,
+                                       seed=args.seed)
+    calls = build_workload(server, args.requests, args.retrieve_ratio,
+                           args.seed)
+    results = []
+    with server:
+        for mode in args.modes:
+            if mode == "async" and httpx is None:
+                print("Skipping async: install addresscomplete[async]")
+                continue
+            results.append(run_mode(mode, server.url, calls,
+                                    args.concurrency))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+    return results
+
+
+if __name__ == "__main__":
+    main()
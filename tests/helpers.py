@@ -0,0 +1,16 @@
+"""Helpers shared by the test modules."""
+import json
+from unittest.mock import Mock
+
+
+def make_response(json_data, raise_exc=None):
+    """Returns a mock ``requests`` response whose body is ``json_data``
+    encoded as JSON, and whose ``raise_for_status`` raises
+    ``raise_exc`` if given."""
+    response = Mock()
+    response.content = json.dumps(json_data).encode()
+    if raise_exc is None:
+        response.raise_for_status.return_value = None
+    else:
+        response.raise_for_status.side_effect = raise_exc
+    return response
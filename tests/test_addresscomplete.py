@@ -4,7 +4,7 @@ from urllib.parse import parse_qs, urlparse
 
 import requests
 
-from addresscomplete import AddressComplete
+from addresscomplete import AddressComplete, LookupResult, RetryPolicy
 from addresscomplete.ErrorHandling import (
     AccountOutOfCreditError,
     AccountSuspendedError,
@@ -37,22 +37,14 @@ from addresscomplete.ErrorHandling import (
     WrongKeyTypeError,
 )
 
-
-def make_response(json_data, raise_exc=None):
-    response = Mock()
-    response.json.return_value = json_data
-    if raise_exc is None:
-        response.raise_for_status.return_value = None
-    else:
-        response.raise_for_status.side_effect = raise_exc
-    return response
+from helpers import make_response
 
 
 class TestAddressCompleteFind(unittest.TestCase):
     def setUp(self):
         self.client = AddressComplete("test-key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_happy_path_returns_json(self, mock_get):
         payload = {"Error": None, "Items": []}
         mock_get.return_value = make_response(payload)
@@ -75,7 +67,7 @@ class TestAddressCompleteFind(unittest.TestCase):
         self.assertEqual(query["MaxSuggestions"][0], "5")
         self.assertEqual(query["LanguagePreference"][0], "en")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_raises_for_status(self, mock_get):
         mock_get.return_value = make_response(
             {"Error": None},
@@ -85,21 +77,21 @@ class TestAddressCompleteFind(unittest.TestCase):
         with self.assertRaises(requests.HTTPError):
             self.client.find("test")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_mapping_find(self, mock_get):
         mock_get.return_value = make_response({"Error": 1001})
 
         with self.assertRaises(InvalidSearchTermError):
             self.client.find("bad")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_mapping_general(self, mock_get):
         mock_get.return_value = make_response({"Error": 2})
 
         with self.assertRaises(UnknownKeyError):
             self.client.find("test")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_unknown_error_code(self, mock_get):
         mock_get.return_value = make_response({"Error": 9999})
 
@@ -111,7 +103,7 @@ class TestAddressCompleteRetrieve(unittest.TestCase):
     def setUp(self):
         self.client = AddressComplete("test-key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_happy_path_returns_json(self, mock_get):
         payload = {"Error": None, "Address": {"Line1": "123 Main St"}}
         mock_get.return_value = make_response(payload)
@@ -126,7 +118,7 @@ class TestAddressCompleteRetrieve(unittest.TestCase):
         self.assertEqual(query["Key"][0], "test-key")
         self.assertEqual(query["Id"][0], "ABC 123")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_raises_for_status(self, mock_get):
         mock_get.return_value = make_response(
             {"Error": None},
@@ -136,21 +128,21 @@ class TestAddressCompleteRetrieve(unittest.TestCase):
         with self.assertRaises(requests.HTTPError):
             self.client.retrieve("ABC")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_mapping_retrieve(self, mock_get):
         mock_get.return_value = make_response({"Error": 1001})
 
         with self.assertRaises(IDInvalidError):
             self.client.retrieve("bad-id")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_mapping_general(self, mock_get):
         mock_get.return_value = make_response({"Error": 2})
 
         with self.assertRaises(UnknownKeyError):
             self.client.retrieve("ABC")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_unknown_error_code(self, mock_get):
         mock_get.return_value = make_response({"Error": 9999})
 
@@ -158,13 +150,256 @@ class TestAddressCompleteRetrieve(unittest.TestCase):
             self.client.retrieve("ABC")
 
 
+class TestAddressCompleteSession(unittest.TestCase):
+    """Test the pooled session lifecycle."""
+
+    def test_adapter_uses_pool_settings(self):
+        """Test that the mounted adapter is configured from the client."""
+        client = AddressComplete("test-key", pool_connections=4,
+                                 pool_maxsize=32, max_retries=2)
+        adapter = client.session.get_adapter(
+            AddressComplete.DEFAULT_FIND_ENDPOINT
+        )
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.max_retries.total, 2)
+        client.close()
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_session_reused_across_calls(self, mock_get):
+        """Test that find and retrieve share the same session."""
+        mock_get.return_value = make_response({"Items": []})
+        client = AddressComplete("test-key", timeout=5)
+        session = client.session
+
+        client.find("test")
+        client.retrieve("ABC")
+
+        self.assertIs(client.session, session)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args[1]["timeout"], 5)
+
+    def test_keep_alive_disabled_sets_connection_header(self):
+        """Test that keep_alive=False closes connections after use."""
+        client = AddressComplete("test-key", keep_alive=False)
+        self.assertEqual(client.session.headers["Connection"], "close")
+
+    def test_custom_session_is_used(self):
+        """Test that a caller supplied session is used as is."""
+        session = requests.Session()
+        client = AddressComplete("test-key", session=session)
+        self.assertIs(client.session, session)
+
+    def test_context_manager_closes_session(self):
+        """Test that leaving the context closes the session."""
+        session = Mock()
+        with AddressComplete("test-key", session=session) as client:
+            self.assertIs(client.session, session)
+        session.close.assert_called_once_with()
+
+
+class TestAddressCompleteRetrieveMany(unittest.TestCase):
+    """Test concurrent bulk retrieval."""
+
+    def setUp(self):
+        self.client = AddressComplete("test-key")
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_results_preserve_input_order(self, mock_get):
+        """Test that results line up with the input Ids."""
+        def respond(url, **kwargs):
+            id = parse_qs(urlparse(url).query)["Id"][0]
+            return make_response({"Items": [{"Id": id}]})
+        mock_get.side_effect = respond
+
+        results = self.client.retrieve_many(["A", "B", "C"], max_workers=3)
+
+        self.assertEqual(
+            [result["Items"][0]["Id"] for result in results],
+            ["A", "B", "C"],
+        )
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_duplicate_ids_retrieved_once(self, mock_get):
+        """Test that repeated Ids share a single request."""
+        mock_get.return_value = make_response({"Items": []})
+
+        results = self.client.retrieve_many(["A", "B", "A", "A"])
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(len(results), 4)
+        self.assertIs(results[0], results[2])
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_errors_returned_per_id(self, mock_get):
+        """Test that a failing Id does not abort the batch."""
+        def respond(url, **kwargs):
+            if "Id=bad" in url:
+                return make_response({"Error": 1001})
+            return make_response({"Items": [{"Id": "good"}]})
+        mock_get.side_effect = respond
+
+        results = self.client.retrieve_many(["good", "bad"])
+
+        self.assertEqual(results[0], {"Items": [{"Id": "good"}]})
+        self.assertIsInstance(results[1], IDInvalidError)
+
+
+class TestAddressCompleteResultMode(unittest.TestCase):
+    """Test the non-raising raise_errors=False mode."""
+
+    def setUp(self):
+        self.client = AddressComplete("test-key", raise_errors=False)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_success_is_wrapped(self, mock_get):
+        """Test that a successful call returns an ok LookupResult."""
+        mock_get.return_value = make_response({"Items": [{"Id": "A"}]})
+
+        result = self.client.find("test")
+
+        self.assertIsInstance(result, LookupResult)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.response, {"Items": [{"Id": "A"}]})
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_api_error_is_returned(self, mock_get):
+        """Test that API errors are returned with their class and code."""
+        mock_get.return_value = make_response({"Items": [{"Error": "1001"}]})
+
+        find_result = self.client.find("test")
+        retrieve_result = self.client.retrieve("bad")
+
+        self.assertIs(find_result.error_class, InvalidSearchTermError)
+        self.assertIs(retrieve_result.error_class, IDInvalidError)
+        self.assertEqual(retrieve_result.error_code, 1001)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_transport_errors_still_raise(self, mock_get):
+        """Test that errors other than API errors are raised."""
+        mock_get.side_effect = requests.ConnectionError()
+
+        with self.assertRaises(requests.ConnectionError):
+            self.client.find("test")
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_retryable_api_error_is_retried_then_returned(self, mock_get):
+        """Test that the retry policy still sees transient API errors."""
+        mock_get.return_value = make_response({"Error": 1005})
+        client = AddressComplete(
+            "test-key", raise_errors=False,
+            retry_policy=RetryPolicy(max_attempts=2, backoff=0),
+        )
+
+        result = client.find("test")
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIs(result.error_class, NoResponseError)
+        self.assertEqual(result.error_code, 1005)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_retrieve_many_and_projection(self, mock_get):
+        """Test that retrieve_many returns LookupResults per Id."""
+        def respond(url, **kwargs):
+            if "Id=bad" in url:
+                return make_response({"Error": 1001})
+            return make_response({"Items": [{"Id": "good", "City": "X"}]})
+        mock_get.side_effect = respond
+
+        good, bad = self.client.retrieve_many(["good", "bad"],
+                                              fields=("Id",))
+
+        self.assertEqual(good.response, {"Items": [{"Id": "good"}]})
+        self.assertIs(bad.error_class, IDInvalidError)
+
+
+FIND_TREE = {
+    None: [
+        {"Id": "A1", "Next": "Retrieve"},
+        {"Id": "street", "Next": "Find"},
+        {"Id": "building", "Next": "Find"},
+    ],
+    "street": [{"Id": "S1", "Next": "Retrieve"}],
+    "building": [
+        {"Id": "B1", "Next": "Retrieve"},
+        {"Id": "floor", "Next": "Find"},
+    ],
+    "floor": [{"Id": "F1", "Next": "Retrieve"}],
+}
+
+
+def respond_from_tree(url, **kwargs):
+    container = parse_qs(urlparse(url).query).get("Container", [None])[0]
+    return make_response({"Items": FIND_TREE[container]})
+
+
+class TestAddressCompleteFindAll(unittest.TestCase):
+    """Test container drill-down."""
+
+    def setUp(self):
+        self.client = AddressComplete("test-key")
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_find_passes_container(self, mock_get):
+        """Test that the container Id is sent as the Container parameter."""
+        mock_get.return_value = make_response({"Items": []})
+
+        self.client.find("123 Main", container="CA|CP|B|123")
+
+        query = parse_qs(urlparse(mock_get.call_args[0][0]).query)
+        self.assertEqual(query["Container"][0], "CA|CP|B|123")
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_find_all_expands_containers(self, mock_get):
+        """Test that nested containers are expanded to addresses."""
+        mock_get.side_effect = respond_from_tree
+
+        items = self.client.find_all("123 Main", max_workers=3)
+
+        self.assertEqual(
+            sorted(item["Id"] for item in items), ["A1", "B1", "F1", "S1"]
+        )
+        self.assertEqual(mock_get.call_count, 4)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_max_depth_yields_containers_unexpanded(self, mock_get):
+        """Test that containers below max_depth are not queried."""
+        mock_get.side_effect = respond_from_tree
+
+        items = self.client.find_all("123 Main", max_depth=1)
+
+        self.assertEqual(
+            sorted(item["Id"] for item in items), ["A1", "B1", "S1", "floor"]
+        )
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_max_fanout_limits_expansion(self, mock_get):
+        """Test that only max_fanout containers are expanded per level."""
+        mock_get.side_effect = respond_from_tree
+
+        items = self.client.find_all("123 Main", max_fanout=1)
+
+        self.assertEqual(
+            sorted(item["Id"] for item in items), ["A1", "S1", "building"]
+        )
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_iter_find_is_lazy(self, mock_get):
+        """Test that addresses from the first response come first."""
+        mock_get.side_effect = respond_from_tree
+
+        iterator = self.client.iter_find("123 Main")
+        self.assertEqual(next(iterator)["Id"], "A1")
+        iterator.close()
+
+
 class TestFindErrorMappings(unittest.TestCase):
     """Test all FindError specific error code mappings."""
     
     def setUp(self):
         self.client = AddressComplete("test-key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_1001_invalid_search_term(self, mock_get):
         """Test error code 1001 maps to InvalidSearchTermError."""
         mock_get.return_value = make_response({"Error": 1001})
@@ -172,7 +407,7 @@ class TestFindErrorMappings(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "SearchTerm is invalid")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_1002_invalid_search_term(self, mock_get):
         """Test error code 1002 maps to InvalidSearchTermError."""
         mock_get.return_value = make_response({"Error": 1002})
@@ -180,7 +415,7 @@ class TestFindErrorMappings(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "SearchTerm is invalid")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_1003_country_invalid(self, mock_get):
         """Test error code 1003 maps to CountryInvalidError."""
         mock_get.return_value = make_response({"Error": 1003})
@@ -188,7 +423,7 @@ class TestFindErrorMappings(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Country code is invalid")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_1004_language_preference_invalid(self, mock_get):
         """Test error code 1004 maps to LanguagePreferenceInvalidError."""
         mock_get.return_value = make_response({"Error": 1004})
@@ -196,7 +431,7 @@ class TestFindErrorMappings(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "LanguagePreference is invalid")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_1005_no_response(self, mock_get):
         """Test error code 1005 maps to NoResponseError."""
         mock_get.return_value = make_response({"Error": 1005})
@@ -211,7 +446,7 @@ class TestRetrieveErrorMappings(unittest.TestCase):
     def setUp(self):
         self.client = AddressComplete("test-key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_1001_id_invalid(self, mock_get):
         """Test error code 1001 maps to IDInvalidError."""
         mock_get.return_value = make_response({"Error": 1001})
@@ -219,7 +454,7 @@ class TestRetrieveErrorMappings(unittest.TestCase):
             self.client.retrieve("bad-id")
         self.assertEqual(str(context.exception), "ID is invalid")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_1002_not_available(self, mock_get):
         """Test error code 1002 maps to NotAvailableError."""
         mock_get.return_value = make_response({"Error": 1002})
@@ -237,7 +472,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
     def setUp(self):
         self.client = AddressComplete("test-key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_minus_1_unknown_error(self, mock_get):
         """Test error code -1 maps to UnknownError."""
         mock_get.return_value = make_response({"Error": -1})
@@ -245,7 +480,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Unknown error")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_2_unknown_key(self, mock_get):
         """Test error code 2 maps to UnknownKeyError."""
         mock_get.return_value = make_response({"Error": 2})
@@ -253,7 +488,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Unknown key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_3_account_out_of_credit(self, mock_get):
         """Test error code 3 maps to AccountOutOfCreditError."""
         mock_get.return_value = make_response({"Error": 3})
@@ -261,7 +496,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Account out of credit")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_4_ip_not_allowed(self, mock_get):
         """Test error code 4 maps to IPNotAllowedError."""
         mock_get.return_value = make_response({"Error": 4})
@@ -269,7 +504,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Request not allowed from this IP")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_5_url_not_allowed(self, mock_get):
         """Test error code 5 maps to URLNotAllowedError."""
         mock_get.return_value = make_response({"Error": 5})
@@ -277,7 +512,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Request not allowed from this URL")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_6_service_not_available_on_key(self, mock_get):
         """Test error code 6 maps to ServiceNotAvailableOnKeyError."""
         mock_get.return_value = make_response({"Error": 6})
@@ -285,7 +520,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Web service not available on this key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_7_service_not_available_on_plan(self, mock_get):
         """Test error code 7 maps to ServiceNotAvailableOnPlanError."""
         mock_get.return_value = make_response({"Error": 7})
@@ -293,7 +528,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Web service not available on your plan")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_8_key_daily_limit_exceeded(self, mock_get):
         """Test error code 8 maps to KeyDailyLimitExceededError."""
         mock_get.return_value = make_response({"Error": 8})
@@ -301,7 +536,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Key daily limit exceeded")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_9_account_suspended(self, mock_get):
         """Test error code 9 maps to AccountSuspendedError."""
         mock_get.return_value = make_response({"Error": 9})
@@ -309,7 +544,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Your account has been suspended")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_10_surge_protector_triggered(self, mock_get):
         """Test error code 10 maps to SurgeProtectorTriggeredError."""
         mock_get.return_value = make_response({"Error": 10})
@@ -317,7 +552,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Surge protector triggered")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_11_no_valid_license(self, mock_get):
         """Test error code 11 maps to NoValidLicenseError."""
         mock_get.return_value = make_response({"Error": 11})
@@ -325,7 +560,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "No valid license available")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_12_management_key_required(self, mock_get):
         """Test error code 12 maps to ManagementKeyRequiredError."""
         mock_get.return_value = make_response({"Error": 12})
@@ -333,7 +568,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Management key required")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_13_demo_limit_exceeded(self, mock_get):
         """Test error code 13 maps to DemoLimitExceededError."""
         mock_get.return_value = make_response({"Error": 13})
@@ -341,7 +576,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Demo limit exceeded")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_14_free_service_limit_exceeded(self, mock_get):
         """Test error code 14 maps to FreeServiceLimitExceededError."""
         mock_get.return_value = make_response({"Error": 14})
@@ -349,7 +584,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Free service limit exceeded")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_15_wrong_key_type(self, mock_get):
         """Test error code 15 maps to WrongKeyTypeError."""
         mock_get.return_value = make_response({"Error": 15})
@@ -357,7 +592,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Wrong type of key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_16_key_expired(self, mock_get):
         """Test error code 16 maps to KeyExpiredError."""
         mock_get.return_value = make_response({"Error": 16})
@@ -365,7 +600,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Key expired")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_17_user_lookup_limit_exceeded(self, mock_get):
         """Test error code 17 maps to UserLookupLimitExceededError."""
         mock_get.return_value = make_response({"Error": 17})
@@ -373,7 +608,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Individual User exceeded Lookup Limit")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_18_invalid_parameters(self, mock_get):
         """Test error code 18 maps to InvalidParametersError."""
         mock_get.return_value = make_response({"Error": 18})
@@ -381,7 +616,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Missing or invalid parameters")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_19_invalid_json(self, mock_get):
         """Test error code 19 maps to InvalidJSONError."""
         mock_get.return_value = make_response({"Error": 19})
@@ -389,7 +624,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Invalid JSON object")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_20_endpoint_not_available(self, mock_get):
         """Test error code 20 maps to EndpointNotAvailableError."""
         mock_get.return_value = make_response({"Error": 20})
@@ -397,7 +632,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "Endpoint not available")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_21_sandbox_not_available(self, mock_get):
         """Test error code 21 maps to SandboxNotAvailableError."""
         mock_get.return_value = make_response({"Error": 21})
@@ -408,7 +643,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             "Sandbox Mode is not available on this endpoint"
         )
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_22_https_required(self, mock_get):
         """Test error code 22 maps to HTTPSRequiredError."""
         mock_get.return_value = make_response({"Error": 22})
@@ -416,7 +651,7 @@ class TestGeneralErrorMappingsFind(unittest.TestCase):
             self.client.find("test")
         self.assertEqual(str(context.exception), "HTTPS requests only")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_find_error_23_agreement_not_signed(self, mock_get):
         """Test error code 23 maps to AgreementNotSignedError."""
         mock_get.return_value = make_response({"Error": 23})
@@ -431,7 +666,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
     def setUp(self):
         self.client = AddressComplete("test-key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_minus_1_unknown_error(self, mock_get):
         """Test error code -1 maps to UnknownError."""
         mock_get.return_value = make_response({"Error": -1})
@@ -439,7 +674,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Unknown error")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_2_unknown_key(self, mock_get):
         """Test error code 2 maps to UnknownKeyError."""
         mock_get.return_value = make_response({"Error": 2})
@@ -447,7 +682,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Unknown key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_3_account_out_of_credit(self, mock_get):
         """Test error code 3 maps to AccountOutOfCreditError."""
         mock_get.return_value = make_response({"Error": 3})
@@ -455,7 +690,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Account out of credit")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_4_ip_not_allowed(self, mock_get):
         """Test error code 4 maps to IPNotAllowedError."""
         mock_get.return_value = make_response({"Error": 4})
@@ -463,7 +698,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Request not allowed from this IP")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_5_url_not_allowed(self, mock_get):
         """Test error code 5 maps to URLNotAllowedError."""
         mock_get.return_value = make_response({"Error": 5})
@@ -471,7 +706,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Request not allowed from this URL")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_6_service_not_available_on_key(self, mock_get):
         """Test error code 6 maps to ServiceNotAvailableOnKeyError."""
         mock_get.return_value = make_response({"Error": 6})
@@ -479,7 +714,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Web service not available on this key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_7_service_not_available_on_plan(self, mock_get):
         """Test error code 7 maps to ServiceNotAvailableOnPlanError."""
         mock_get.return_value = make_response({"Error": 7})
@@ -487,7 +722,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Web service not available on your plan")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_8_key_daily_limit_exceeded(self, mock_get):
         """Test error code 8 maps to KeyDailyLimitExceededError."""
         mock_get.return_value = make_response({"Error": 8})
@@ -495,7 +730,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Key daily limit exceeded")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_9_account_suspended(self, mock_get):
         """Test error code 9 maps to AccountSuspendedError."""
         mock_get.return_value = make_response({"Error": 9})
@@ -503,7 +738,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Your account has been suspended")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_10_surge_protector_triggered(self, mock_get):
         """Test error code 10 maps to SurgeProtectorTriggeredError."""
         mock_get.return_value = make_response({"Error": 10})
@@ -511,7 +746,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Surge protector triggered")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_11_no_valid_license(self, mock_get):
         """Test error code 11 maps to NoValidLicenseError."""
         mock_get.return_value = make_response({"Error": 11})
@@ -519,7 +754,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "No valid license available")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_12_management_key_required(self, mock_get):
         """Test error code 12 maps to ManagementKeyRequiredError."""
         mock_get.return_value = make_response({"Error": 12})
@@ -527,7 +762,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Management key required")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_13_demo_limit_exceeded(self, mock_get):
         """Test error code 13 maps to DemoLimitExceededError."""
         mock_get.return_value = make_response({"Error": 13})
@@ -535,7 +770,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Demo limit exceeded")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_14_free_service_limit_exceeded(self, mock_get):
         """Test error code 14 maps to FreeServiceLimitExceededError."""
         mock_get.return_value = make_response({"Error": 14})
@@ -543,7 +778,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Free service limit exceeded")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_15_wrong_key_type(self, mock_get):
         """Test error code 15 maps to WrongKeyTypeError."""
         mock_get.return_value = make_response({"Error": 15})
@@ -551,7 +786,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Wrong type of key")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_16_key_expired(self, mock_get):
         """Test error code 16 maps to KeyExpiredError."""
         mock_get.return_value = make_response({"Error": 16})
@@ -559,7 +794,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Key expired")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_17_user_lookup_limit_exceeded(self, mock_get):
         """Test error code 17 maps to UserLookupLimitExceededError."""
         mock_get.return_value = make_response({"Error": 17})
@@ -567,7 +802,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Individual User exceeded Lookup Limit")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_18_invalid_parameters(self, mock_get):
         """Test error code 18 maps to InvalidParametersError."""
         mock_get.return_value = make_response({"Error": 18})
@@ -575,7 +810,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Missing or invalid parameters")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_19_invalid_json(self, mock_get):
         """Test error code 19 maps to InvalidJSONError."""
         mock_get.return_value = make_response({"Error": 19})
@@ -583,7 +818,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Invalid JSON object")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_20_endpoint_not_available(self, mock_get):
         """Test error code 20 maps to EndpointNotAvailableError."""
         mock_get.return_value = make_response({"Error": 20})
@@ -591,7 +826,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "Endpoint not available")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_21_sandbox_not_available(self, mock_get):
         """Test error code 21 maps to SandboxNotAvailableError."""
         mock_get.return_value = make_response({"Error": 21})
@@ -602,7 +837,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             "Sandbox Mode is not available on this endpoint"
         )
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_22_https_required(self, mock_get):
         """Test error code 22 maps to HTTPSRequiredError."""
         mock_get.return_value = make_response({"Error": 22})
@@ -610,7 +845,7 @@ class TestGeneralErrorMappingsRetrieve(unittest.TestCase):
             self.client.retrieve("id")
         self.assertEqual(str(context.exception), "HTTPS requests only")
 
-    @patch("addresscomplete.AddressComplete.requests.get")
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
     def test_retrieve_error_23_agreement_not_signed(self, mock_get):
         """Test error code 23 maps to AgreementNotSignedError."""
         mock_get.return_value = make_response({"Error": 23})
@@ -0,0 +1,146 @@
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import AsyncAddressComplete, RetryPolicy
+from addresscomplete.ErrorHandling import (
+    IDInvalidError,
+    InvalidSearchTermError,
+    NoResponseError,
+    UnknownError,
+    UnknownKeyError,
+)
+
+
+def make_client(payload, status_code=200, requests_seen=None):
+    def handler(request):
+        if requests_seen is not None:
+            requests_seen.append(request)
+        return httpx.Response(status_code, json=payload)
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncAddressComplete("test-key", session=session)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncAddressCompleteFind(unittest.IsolatedAsyncioTestCase):
+    async def test_find_happy_path_returns_json(self):
+        payload = {"Items": [{"Id": "CA|1", "Text": "123 Main St"}]}
+        seen = []
+        async with make_client(payload, requests_seen=seen) as client:
+            result = await client.find("123 Main St", max_suggestions=5)
+
+        self.assertEqual(result, payload)
+        query = parse_qs(urlparse(str(seen[0].url)).query)
+        self.assertEqual(query["Key"][0], "test-key")
+        self.assertEqual(query["SearchTerm"][0], "123 Main St")
+        self.assertEqual(query["MaxSuggestions"][0], "5")
+
+    async def test_find_raises_for_status(self):
+        async with make_client({}, status_code=500) as client:
+            with self.assertRaises(httpx.HTTPStatusError):
+                await client.find("test")
+
+    async def test_find_error_mapping(self):
+        async with make_client({"Error": "1001"}) as client:
+            with self.assertRaises(InvalidSearchTermError):
+                await client.find("bad")
+
+    async def test_find_error_in_items(self):
+        async with make_client({"Items": [{"Error": 1005}]}) as client:
+            with self.assertRaises(NoResponseError):
+                await client.find("test")
+
+    async def test_find_error_mapping_general(self):
+        async with make_client({"Error": 2}) as client:
+            with self.assertRaises(UnknownKeyError):
+                await client.find("test")
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncAddressCompleteRetrieve(unittest.IsolatedAsyncioTestCase):
+    async def test_retrieve_happy_path_returns_json(self):
+        payload = {"Items": [{"Line1": "123 Main St"}]}
+        seen = []
+        async with make_client(payload, requests_seen=seen) as client:
+            result = await client.retrieve("ABC 123")
+
+        self.assertEqual(result, payload)
+        query = parse_qs(urlparse(str(seen[0].url)).query)
+        self.assertEqual(query["Id"][0], "ABC 123")
+
+    async def test_retrieve_error_mapping(self):
+        async with make_client({"Error": 1001}) as client:
+            with self.assertRaises(IDInvalidError):
+                await client.retrieve("bad-id")
+
+    async def test_retrieve_unknown_error_code(self):
+        async with make_client({"Error": 9999}) as client:
+            with self.assertRaises(UnknownError):
+                await client.retrieve("ABC")
+
+    async def test_retrieve_many_preserves_order_and_errors(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            id = request.url.params["Id"]
+            if id == "bad":
+                return httpx.Response(200, json={"Error": 1001})
+            return httpx.Response(200, json={"Items": [{"Id": id}]})
+
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncAddressComplete("test-key", session=session) as client:
+            results = await client.retrieve_many(
+                ["A", "bad", "B", "A"], max_workers=2
+            )
+
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(results[0], {"Items": [{"Id": "A"}]})
+        self.assertIsInstance(results[1], IDInvalidError)
+        self.assertEqual(results[2], {"Items": [{"Id": "B"}]})
+        self.assertIs(results[3], results[0])
+
+    async def test_retries_server_errors(self):
+        statuses = [503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), json={"Items": []})
+
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        policy = RetryPolicy(max_attempts=2, backoff=0)
+        async with AsyncAddressComplete(
+            "test-key", session=session, retry_policy=policy
+        ) as client:
+            self.assertEqual(await client.retrieve("A"), {"Items": []})
+        self.assertEqual(statuses, [])
+
+    async def test_find_all_expands_containers(self):
+        tree = {
+            None: [{"Id": "A1", "Next": "Retrieve"},
+                   {"Id": "street", "Next": "Find"}],
+            "street": [{"Id": "S1", "Next": "Retrieve"}],
+        }
+
+        def handler(request):
+            container = request.url.params.get("Container")
+            return httpx.Response(200, json={"Items": tree[container]})
+
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncAddressComplete("test-key", session=session) as client:
+            items = await client.find_all("123 Main")
+
+        self.assertEqual(sorted(item["Id"] for item in items), ["A1", "S1"])
+
+    def test_pool_limits_are_configurable(self):
+        client = AsyncAddressComplete("test-key", max_connections=7)
+        pool = client.session._transport._pool
+        self.assertEqual(pool._max_connections, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
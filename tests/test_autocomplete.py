@@ -0,0 +1,221 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, Mock
+
+from addresscomplete import (
+    AsyncAutocompleteSession,
+    AsyncDebouncedSession,
+    AutocompleteSession,
+    DebouncedSession,
+    LookupResult,
+)
+from addresscomplete.ErrorHandling import InvalidSearchTermError
+
+MAIN_STREET = {
+    "Items": [
+        {"Id": "1", "Text": "123 Main St", "Description": "Toronto, ON"},
+        {"Id": "2", "Text": "123 Main St", "Description": "Ottawa, ON"},
+        {"Id": "3", "Text": "123 Mainland Ave", "Description": "Regina, SK"},
+    ]
+}
+
+
+class TestAutocompleteSession(unittest.TestCase):
+    def setUp(self):
+        self.client = Mock()
+        self.client.find.return_value = MAIN_STREET
+        self.session = AutocompleteSession(self.client, max_suggestions=5)
+
+    def test_first_keystroke_calls_api(self):
+        result = self.session.find("123 Main")
+
+        self.assertEqual(result, MAIN_STREET)
+        self.client.find.assert_called_once_with("123 Main", "CAN", 5, "en")
+        self.assertEqual(self.session.remote_calls, 1)
+
+    def test_extension_filtered_locally(self):
+        self.session.find("123 Main")
+        result = self.session.find("123 Main St")
+
+        self.assertEqual(self.client.find.call_count, 1)
+        self.assertEqual([item["Id"] for item in result["Items"]], ["1", "2"])
+        self.assertEqual(self.session.local_hits, 1)
+
+    def test_matches_description_tokens(self):
+        self.session.find("123 Main")
+        result = self.session.find("123 Main St Ott")
+
+        self.assertEqual([item["Id"] for item in result["Items"]], ["2"])
+
+    def test_repeated_term_returns_previous_result(self):
+        self.session.find("123 Main")
+        result = self.session.find("123 MAIN")
+
+        self.assertIs(result, MAIN_STREET)
+        self.assertEqual(self.client.find.call_count, 1)
+
+    def test_truncated_result_calls_api(self):
+        session = AutocompleteSession(self.client, max_suggestions=3)
+        session.find("123 Main")
+        session.find("123 Main S")
+
+        self.assertEqual(self.client.find.call_count, 2)
+
+    def test_non_extension_calls_api(self):
+        self.session.find("123 Main")
+        self.session.find("123 Mai")
+        self.session.find("456 Main")
+
+        self.assertEqual(self.client.find.call_count, 3)
+
+    def test_empty_local_result_calls_api(self):
+        self.session.find("123 Main")
+        self.session.find("123 Main Blvd")
+
+        self.assertEqual(self.client.find.call_count, 2)
+
+    def test_reset_forgets_previous_result(self):
+        self.session.find("123 Main")
+        self.session.reset()
+        self.session.find("123 Main S")
+
+        self.assertEqual(self.client.find.call_count, 2)
+
+    def test_non_raising_client(self):
+        self.client.find.return_value = LookupResult(MAIN_STREET)
+        self.session.find("123 Main")
+        result = self.session.find("123 Main St")
+
+        self.assertTrue(result.ok)
+        self.assertEqual([item["Id"] for item in result.response["Items"]],
+                         ["1", "2"])
+        self.assertEqual(self.client.find.call_count, 1)
+
+    def test_failed_result_is_not_remembered(self):
+        self.client.find.return_value = LookupResult(
+            None, InvalidSearchTermError, 1001
+        )
+        self.assertFalse(self.session.find("123 Main").ok)
+        self.client.find.return_value = LookupResult(MAIN_STREET)
+        self.session.find("123 Main S")
+
+        self.assertEqual(self.client.find.call_count, 2)
+
+
+class TestAsyncAutocompleteSession(unittest.IsolatedAsyncioTestCase):
+    async def test_non_raising_client(self):
+        client = Mock()
+        client.find = AsyncMock(return_value=LookupResult(MAIN_STREET))
+        session = AsyncAutocompleteSession(client)
+
+        await session.find("123 Main")
+        result = await session.find("123 Mainl")
+
+        client.find.assert_awaited_once()
+        self.assertEqual([item["Id"] for item in result.response["Items"]],
+                         ["3"])
+
+    async def test_extension_filtered_locally(self):
+        client = Mock()
+        client.find = AsyncMock(return_value=MAIN_STREET)
+        session = AsyncAutocompleteSession(client)
+
+        await session.find("123 Main")
+        result = await session.find("123 Mainl")
+
+        client.find.assert_awaited_once()
+        self.assertEqual([item["Id"] for item in result["Items"]], ["3"])
+
+
+
+class TestDebouncedSession(unittest.TestCase):
+    def _type(self, session, terms, pause=0.01):
+        results = {}
+
+        def keystroke(term):
+            results[term] = session.find(term)
+
+        threads = []
+        for term in terms:
+            thread = threading.Thread(target=keystroke, args=(term,))
+            thread.start()
+            threads.append(thread)
+            time.sleep(pause)
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_only_latest_keystroke_is_sent(self):
+        target = Mock()
+        target.find.side_effect = lambda term: {"Term": term}
+        session = DebouncedSession(target, delay=0.1)
+
+        results = self._type(session, ["1", "12", "123"])
+
+        target.find.assert_called_once_with("123")
+        self.assertEqual(
+            results, {"1": None, "12": None, "123": {"Term": "123"}}
+        )
+        self.assertEqual(session.debounced, 2)
+        self.assertEqual(session.sent, 1)
+
+    def test_superseded_in_flight_result_is_discarded(self):
+        release = threading.Event()
+
+        def find(term):
+            if term == "12":
+                release.wait(1)
+            return {"Term": term}
+
+        target = Mock()
+        target.find.side_effect = find
+        session = DebouncedSession(target, delay=0.01)
+
+        results = self._type(session, ["12", "123"], pause=0.1)
+        release.set()
+
+        self.assertEqual(results, {"12": None, "123": {"Term": "123"}})
+        self.assertEqual(session.discarded, 1)
+        self.assertEqual(session.sent, 2)
+
+
+class TestAsyncDebouncedSession(unittest.IsolatedAsyncioTestCase):
+    async def test_only_latest_keystroke_is_sent(self):
+        target = Mock()
+        target.find = AsyncMock(side_effect=lambda term: {"Term": term})
+        session = AsyncDebouncedSession(target, delay=0.05)
+
+        results = await asyncio.gather(
+            session.find("1"), session.find("12"), session.find("123")
+        )
+
+        self.assertEqual(results, [None, None, {"Term": "123"}])
+        target.find.assert_awaited_once_with("123")
+        self.assertEqual(session.debounced, 2)
+
+    async def test_in_flight_request_is_cancelled(self):
+        started = asyncio.Event()
+
+        async def find(term):
+            if term == "12":
+                started.set()
+                await asyncio.sleep(10)
+            return {"Term": term}
+
+        target = Mock()
+        target.find = find
+        session = AsyncDebouncedSession(target, delay=0)
+
+        first = asyncio.ensure_future(session.find("12"))
+        await started.wait()
+        second = await session.find("123")
+
+        self.assertIsNone(await first)
+        self.assertEqual(second, {"Term": "123"})
+        self.assertEqual(session.discarded, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from addresscomplete import BulkValidator, LookupResult
+from addresscomplete.ErrorHandling import (
+    AccountOutOfCreditError,
+    IDInvalidError,
+    SurgeProtectorTriggeredError,
+    UserLookupLimitExceededError,
+)
+
+
+def fake_client(fail_on=None, stop_on=None,
+                stop_error=AccountOutOfCreditError):
+    client = Mock()
+    client.pool_maxsize = 4
+
+    def find(search_term, country, max_suggestions, language_preference,
+             container=None):
+        if search_term == stop_on:
+            raise stop_error()
+        if search_term == "nowhere":
+            return {"Items": []}
+        if search_term == "building" and container is None:
+            return {"Items": [{"Id": "B", "Next": "Find"}]}
+        return {"Items": [{"Id": f"id:{search_term}", "Next": "Retrieve"}]}
+
+    def retrieve(id):
+        if id == f"id:{fail_on}":
+            raise IDInvalidError()
+        return {"Items": [{"Id": id, "Line1": id.upper(), "City": "Ottawa"}]}
+
+    client.find.side_effect = find
+    client.retrieve.side_effect = retrieve
+    return client
+
+
+class TestBulkValidator(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write_csv(self, name, addresses):
+        with open(self.path(name), "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["customer", "address"])
+            for index, address in enumerate(addresses):
+                writer.writerow([index, address])
+        return self.path(name)
+
+    def read_csv(self, name):
+        with open(self.path(name), newline="") as file:
+            return list(csv.DictReader(file))
+
+    def test_validates_csv_in_order(self):
+        addresses = [f"{n} Main St" for n in range(25)] + ["nowhere", "bad"]
+        source = self.write_csv("in.csv", addresses)
+        validator = BulkValidator(fake_client(fail_on="bad"), max_workers=3,
+                                  max_in_flight=4, checkpoint_every=5)
+
+        summary = validator.run(source, self.path("out.csv"))
+
+        rows = self.read_csv("out.csv")
+        self.assertEqual([row["address"] for row in rows], addresses)
+        self.assertEqual(rows[0]["Line1"], "ID:0 MAIN ST")
+        self.assertEqual(rows[0]["status"], "ok")
+        self.assertEqual(rows[25]["status"], "no_match")
+        self.assertEqual(rows[26]["status"], "error")
+        self.assertEqual(rows[26]["error"], "IDInvalidError")
+        self.assertEqual(summary, {"ok": 25, "no_match": 1, "error": 1})
+
+    def test_non_raising_client(self):
+        client = fake_client()
+        find = client.find.side_effect
+        client.find.side_effect = lambda *args: LookupResult(find(*args))
+        client.retrieve.side_effect = lambda id: LookupResult(
+            None, IDInvalidError, 1001
+        )
+        validator = BulkValidator(client)
+
+        self.assertEqual(validator.validate("1 Main St")["error"],
+                         "IDInvalidError")
+        client.find.side_effect = lambda *args: LookupResult(
+            None, AccountOutOfCreditError, 3
+        )
+        with self.assertRaises(AccountOutOfCreditError):
+            validator.validate("1 Main St")
+
+    def test_expands_container_match(self):
+        source = self.write_csv("in.csv", ["building"])
+        BulkValidator(fake_client()).run(source, self.path("out.csv"))
+
+        self.assertEqual(self.read_csv("out.csv")[0]["status"], "ok")
+
+    def test_jsonl_input_and_output(self):
+        with open(self.path("in.jsonl"), "w") as file:
+            for address in ["1 Main St", "2 Main St"]:
+                file.write(json.dumps({"address": address}) + "\n")
+
+        BulkValidator(fake_client()).run(
+            self.path("in.jsonl"), self.path("out.jsonl")
+        )
+
+        with open(self.path("out.jsonl")) as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual([row["Id"] for row in rows],
+                         ["id:1 Main St", "id:2 Main St"])
+
+    def test_stops_and_resumes_from_checkpoint(self):
+        addresses = [f"{n} Main St" for n in range(20)]
+        source = self.write_csv("in.csv", addresses)
+        client = fake_client(stop_on="12 Main St")
+        validator = BulkValidator(client, max_workers=2, max_in_flight=2,
+                                  checkpoint_every=5)
+
+        with self.assertRaises(AccountOutOfCreditError):
+            validator.run(source, self.path("out.csv"))
+        written = len(self.read_csv("out.csv"))
+        self.assertLessEqual(written, 12)
+
+        resumed_client = fake_client()
+        validator.client = resumed_client
+        summary = validator.run(source, self.path("out.csv"))
+
+        rows = self.read_csv("out.csv")
+        self.assertEqual([row["address"] for row in rows], addresses)
+        self.assertEqual(summary["ok"], 20 - written)
+        self.assertEqual(resumed_client.find.call_count, 20 - written)
+
+    def test_throttling_stops_the_job(self):
+        source = self.write_csv("in.csv", [f"{n} Main St" for n in range(10)])
+        for error in (SurgeProtectorTriggeredError,
+                      UserLookupLimitExceededError):
+            with self.subTest(error=error.__name__):
+                output = self.path(f"{error.__name__}.csv")
+                validator = BulkValidator(
+                    fake_client(stop_on="4 Main St", stop_error=error),
+                    max_workers=1, max_in_flight=1,
+                )
+
+                with self.assertRaises(error):
+                    validator.run(source, output)
+                with open(f"{output}.checkpoint") as file:
+                    self.assertEqual(json.load(file)["rows_done"], 4)
+
+    def test_resume_discards_rows_after_checkpoint(self):
+        source = self.write_csv("in.csv", ["1 Main St", "2 Main St"])
+        validator = BulkValidator(fake_client())
+        validator.run(source, self.path("out.csv"))
+
+        # Simulate a crash after the first row was checkpointed and a
+        # second row was partially written.
+        with open(self.path("out.csv"), newline="") as file:
+            first_row_end = len("".join(file.readlines()[:2]).encode())
+        with open(self.path("out.csv.checkpoint"), "w") as file:
+            json.dump({"rows_done": 1, "output_offset": first_row_end}, file)
+        with open(self.path("out.csv"), "r+") as file:
+            file.truncate(first_row_end + 5)
+
+        validator.run(source, self.path("out.csv"))
+
+        rows = self.read_csv("out.csv")
+        self.assertEqual([row["address"] for row in rows],
+                         ["1 Main St", "2 Main St"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,285 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import (
+    AddressComplete,
+    AsyncAddressComplete,
+    LRUCache,
+    SQLiteCache,
+)
+from addresscomplete.Cache import estimate_size
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_and_set(self):
+        cache = LRUCache()
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", {"Items": []})
+        self.assertEqual(cache.get("a"), {"Items": []})
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    def test_max_bytes_bound(self):
+        cache = LRUCache(max_bytes=2 * estimate_size({"k": "v"}))
+        cache.set("a", {"k": "v"})
+        cache.set("b", {"k": "v"})
+        cache.set("c", {"k": "v"})
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("a"))
+        self.assertLessEqual(cache.stats["bytes"], cache.max_bytes)
+
+    def test_value_larger_than_max_bytes_not_cached(self):
+        cache = LRUCache(max_bytes=4)
+        cache.set("a", {"Items": ["too large"]})
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl_expiry(self):
+        cache = LRUCache(ttl=10)
+        with patch("addresscomplete.Cache.time.monotonic", return_value=100):
+            cache.set("a", 1)
+        with patch("addresscomplete.Cache.time.monotonic", return_value=105):
+            self.assertEqual(cache.get("a"), 1)
+        with patch("addresscomplete.Cache.time.monotonic", return_value=111):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats["expirations"], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_thread_safety(self):
+        cache = LRUCache(max_entries=50)
+
+        def worker(offset):
+            for i in range(500):
+                cache.set((offset, i % 80), i)
+                cache.get((offset, (i * 7) % 80))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(cache), 50)
+        stats = cache.stats
+        self.assertEqual(stats["hits"] + stats["misses"], 8 * 500)
+
+
+def encode(payload):
+    return json.dumps(payload).encode()
+
+
+def _write_entries(path, start):
+    cache = SQLiteCache(path)
+    for i in range(start, start + 50):
+        cache.set(f"CA|CP|{i}", {"Items": [{"Id": i}]})
+    cache.close()
+
+
+class TestSQLiteCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "retrieve.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_survives_reopen(self):
+        cache = SQLiteCache(self.path)
+        cache.set("CA|CP|ENG|3X1-R2J", {"Items": [{"City": "Toronto"}]})
+        cache.close()
+
+        reopened = SQLiteCache(self.path)
+        self.assertEqual(
+            reopened.get("CA|CP|ENG|3X1-R2J"),
+            {"Items": [{"City": "Toronto"}]},
+        )
+        self.assertIsNone(reopened.get("missing"))
+        self.assertEqual(reopened.stats["hits"], 1)
+        self.assertEqual(reopened.stats["misses"], 1)
+        reopened.close()
+
+    def test_uses_wal_and_compression(self):
+        cache = SQLiteCache(self.path)
+        value = {"Items": [{"Line1": "123 Main St"} for _ in range(50)]}
+        cache.set("a", value)
+        cache.close()
+
+        connection = sqlite3.connect(self.path)
+        (mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+        (size,) = connection.execute("SELECT size FROM responses").fetchone()
+        connection.close()
+        self.assertEqual(mode, "wal")
+        self.assertLess(size, len(str(value)) / 4)
+
+    def test_ttl_expiry(self):
+        cache = SQLiteCache(self.path, ttl=10)
+        with patch("addresscomplete.Cache.time.time", return_value=100):
+            cache.set("a", {"Items": []})
+        with patch("addresscomplete.Cache.time.time", return_value=105):
+            self.assertEqual(cache.get("a"), {"Items": []})
+        with patch("addresscomplete.Cache.time.time", return_value=111):
+            self.assertIsNone(cache.get("a"))
+            cache.vacuum()
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    def test_vacuum_enforces_max_bytes(self):
+        cache = SQLiteCache(self.path, vacuum_interval=10 ** 6)
+        for i in range(20):
+            cache.set(f"id-{i}", {"Items": [{"Id": i}]})
+        cache.max_bytes = cache.stats["bytes"] // 2
+        cache.vacuum()
+
+        self.assertLessEqual(cache.stats["bytes"], cache.max_bytes)
+        self.assertIsNone(cache.get("id-0"))
+        self.assertIsNotNone(cache.get("id-19"))
+        self.assertGreater(cache.stats["evictions"], 0)
+        cache.close()
+
+    def test_shared_across_processes(self):
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=_write_entries, args=(self.path, start))
+            for start in (0, 50)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+
+        cache = SQLiteCache(self.path)
+        self.assertEqual(len(cache), 100)
+        cache.close()
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_retrieve_served_from_cache(self, mock_get):
+        mock_get.return_value.content = encode({"Items": [{"Id": "A"}]})
+        cache = SQLiteCache(self.path)
+        client = AddressComplete("test-key", retrieve_cache=cache)
+
+        client.retrieve("A")
+        self.assertEqual(client.retrieve("A"), {"Items": [{"Id": "A"}]})
+        self.assertEqual(mock_get.call_count, 1)
+        cache.close()
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_worker_threads_share_bounded_connections(self, mock_get):
+        mock_get.return_value.content = encode({"Items": [{"Id": "A"}]})
+        cache = SQLiteCache(self.path, max_connections=3)
+        client = AddressComplete("test-key", retrieve_cache=cache,
+                                 pool_maxsize=8)
+
+        for batch in range(20):
+            client.retrieve_many([f"{batch}-{n}" for n in range(16)])
+
+        self.assertLessEqual(cache.connections, 3)
+        self.assertEqual(len(cache), 320)
+        self.assertEqual(cache.stats["misses"], 320)
+        cache.close()
+        self.assertEqual(cache.connections, 0)
+
+
+class TestFindCache(unittest.TestCase):
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_find_served_from_cache(self, mock_get):
+        mock_get.return_value.content = encode({"Items": [{"Id": "A"}]})
+        client = AddressComplete("test-key", find_cache=LRUCache())
+
+        first = client.find("123 Main")
+        second = client.find("123 Main")
+
+        self.assertIs(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_cache_key_includes_all_parameters(self, mock_get):
+        mock_get.return_value.content = encode({"Items": []})
+        client = AddressComplete("test-key", find_cache=LRUCache())
+
+        client.find("123 Main")
+        client.find("123 Main", country="USA")
+        client.find("123 Main", max_suggestions=5)
+        client.find("123 Main", language_preference="fr")
+
+        self.assertEqual(mock_get.call_count, 4)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_errors_are_not_cached(self, mock_get):
+        mock_get.return_value.content = encode({"Error": 1001})
+        cache = LRUCache()
+        client = AddressComplete("test-key", find_cache=cache)
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                client.find("bad")
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(len(cache), 0)
+
+
+class ThreadRecordingCache(SQLiteCache):
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value):
+        self.threads.append(threading.get_ident())
+        super().set(key, value)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncSQLiteCache(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_off_the_event_loop(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"Items": [{"Id": "A"}]})
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ThreadRecordingCache(
+                os.path.join(directory, "retrieve.sqlite")
+            )
+            session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with AsyncAddressComplete("test-key", session=session,
+                                            retrieve_cache=cache) as client:
+                await client.retrieve("A")
+                second = await client.retrieve("A")
+            cache.close()
+
+        self.assertEqual(second, {"Items": [{"Id": "A"}]})
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(len(cache.threads), 3)
+        self.assertNotIn(threading.get_ident(), cache.threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+from addresscomplete import AddressComplete, Canonicalizer, LRUCache
+from addresscomplete.FakeServer import FakeAddressCompleteServer
+
+
+class TestCanonicalizer(unittest.TestCase):
+    def setUp(self):
+        self.canonicalizer = Canonicalizer()
+
+    def assertCanonical(self, expected, *terms, language="en"):
+        for term in terms:
+            self.assertEqual(self.canonicalizer(term, language), expected,
+                             term)
+
+    def test_case_whitespace_and_punctuation(self):
+        self.assertCanonical("123 main st", "123 Main St", "123  MAIN ST.",
+                             " 123 main st, ")
+
+    def test_street_types(self):
+        self.assertCanonical("123 main st", "123 Main Street")
+        self.assertCanonical("9 elm ave", "9 Elm Avenue")
+        self.assertCanonical("1234 boul saint laurent",
+                             "1234 Boulevard Saint-Laurent", language="fr")
+        self.assertCanonical("1234 boulevard saint laurent",
+                             "1234 Boulevard Saint-Laurent")
+
+    def test_street_type_words_in_street_names(self):
+        self.assertCanonical("100 avenue rd", "100 Avenue Road")
+        self.assertCanonical("1 court st", "1 Court Street")
+        self.assertCanonical("123 place ville marie", "123 Place Ville Marie")
+        self.assertCanonical("5 avenue rd n", "5 Avenue Road North")
+        self.assertCanonical("10 av du parc", "10 Avenue du Parc",
+                             language="fr")
+        self.assertCanonical("10 av de la place", "10 Avenue de la Place",
+                             language="fr")
+
+    def test_directions_only_after_street_type_or_at_end(self):
+        self.assertCanonical("100 king st w", "100 King Street West")
+        self.assertCanonical("north rd", "North Road")
+        self.assertCanonical("rue sherbrooke o", "Rue Sherbrooke Ouest",
+                             language="fr-CA")
+
+    def test_unit_forms(self):
+        self.assertCanonical("4-123 main st", "Apt 4, 123 Main St",
+                             "123 Main St #4", "#4 123 Main Street",
+                             "Unit 4 123 Main St", "4-123 Main St")
+        self.assertCanonical("100 rue ste catherine",
+                             "100 Rue Ste-Catherine")
+
+    def test_accents(self):
+        self.assertCanonical("montreal", "Montréal")
+        self.assertEqual(Canonicalizer(strip_accents=False)("Montréal"),
+                         "montréal")
+
+    def test_options_and_replacements(self):
+        canonicalizer = Canonicalizer(street_types=False, units=False,
+                                      replacements={"saint": "st"})
+
+        self.assertEqual(canonicalizer("Apt 4 5 Saint Street"),
+                         "apt 4 5 st street")
+
+    def test_stats(self):
+        for term in ("123 Main St", "123 main street", "123 main st",
+                     "123 Main St", "9 Elm Ave"):
+            self.canonicalizer(term)
+
+        self.assertEqual(self.canonicalizer.stats, {
+            "terms": 5, "rewritten": 4, "forms": 2, "collapsed": 2,
+        })
+        self.assertEqual(self.canonicalizer.top(1), [("123 main st", 3)])
+        self.assertEqual(self.canonicalizer.raw_terms("9 elm ave"),
+                         ["9 Elm Ave"])
+        self.canonicalizer.clear()
+        self.assertEqual(self.canonicalizer.stats["terms"], 0)
+
+    def test_max_tracked(self):
+        canonicalizer = Canonicalizer(max_tracked=1)
+        canonicalizer("1 A St")
+        canonicalizer("2 B St")
+
+        self.assertEqual(canonicalizer.stats["forms"], 1)
+        self.assertEqual(canonicalizer.stats["terms"], 2)
+
+
+class TestClientCanonicalization(unittest.TestCase):
+    def test_variants_share_one_cache_entry(self):
+        with FakeAddressCompleteServer(addresses=50) as server:
+            line1 = server.addresses[0]["Line1"]
+            with AddressComplete("test-key", base_url=server.url,
+                                 find_cache=LRUCache(),
+                                 canonicalizer=Canonicalizer()) as client:
+                first = client.find(line1)
+                second = client.find(f"  {line1.upper()}. ")
+
+            self.assertEqual(server.requests_served, 1)
+        self.assertIs(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
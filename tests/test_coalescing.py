@@ -0,0 +1,163 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import (
+    AddressComplete,
+    AsyncAddressComplete,
+    AsyncSingleFlight,
+    SingleFlight,
+)
+from addresscomplete.ErrorHandling import IDInvalidError
+
+
+class TestSingleFlight(unittest.TestCase):
+    def _run_concurrently(self, func, callers=5):
+        started = threading.Barrier(callers)
+        outcomes = [None] * callers
+
+        def caller(index):
+            started.wait()
+            try:
+                outcomes[index] = func()
+            except Exception as error:
+                outcomes[index] = error
+
+        threads = [
+            threading.Thread(target=caller, args=(i,)) for i in range(callers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_identical_calls_run_once(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(1)
+            return {"Items": []}
+
+        threading.Timer(0.2, release.set).start()
+        outcomes = self._run_concurrently(
+            lambda: single_flight.do("key", func)
+        )
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(outcomes, [{"Items": []}] * 5)
+        self.assertEqual(single_flight.coalesced, 4)
+
+    def test_followers_receive_exception(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def func():
+            release.wait(1)
+            raise IDInvalidError()
+
+        threading.Timer(0.2, release.set).start()
+        outcomes = self._run_concurrently(
+            lambda: single_flight.do("key", func), callers=3
+        )
+
+        for outcome in outcomes:
+            self.assertIsInstance(outcome, IDInvalidError)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        single_flight = SingleFlight()
+        func = Mock(return_value=1)
+
+        single_flight.do("key", func)
+        single_flight.do("key", func)
+
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(single_flight.coalesced, 0)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_client_coalesces_find(self, mock_get):
+        release = threading.Event()
+
+        def respond(url, **kwargs):
+            release.wait(1)
+            response = Mock()
+            response.content = json.dumps({"Items": []}).encode()
+            return response
+
+        mock_get.side_effect = respond
+        client = AddressComplete("test-key", coalesce=True)
+        threading.Timer(0.2, release.set).start()
+
+        outcomes = self._run_concurrently(lambda: client.find("123 Main"))
+
+        self.assertEqual(outcomes, [{"Items": []}] * 5)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(client.single_flight.coalesced, 4)
+
+
+class TestAsyncSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_identical_calls_run_once(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        results = await asyncio.gather(
+            *(single_flight.do("key", func) for _ in range(5))
+        )
+
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(single_flight.coalesced, 4)
+
+    async def test_cancelled_caller_does_not_cancel_call(self):
+        single_flight = AsyncSingleFlight()
+
+        async def func():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.ensure_future(single_flight.do("key", func))
+        second = asyncio.ensure_future(single_flight.do("key", func))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, "result")
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    async def test_client_coalesces_retrieve(self):
+        seen = []
+
+        async def handler(request):
+            seen.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"Items": [{"Id": "A"}]})
+
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncAddressComplete(
+            "test-key", session=session, coalesce=True
+        ) as client:
+            results = await asyncio.gather(
+                *(client.retrieve("A") for _ in range(4))
+            )
+
+        self.assertEqual(len(seen), 1)
+        self.assertEqual(results, [{"Items": [{"Id": "A"}]}] * 4)
+        self.assertEqual(client.single_flight.coalesced, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
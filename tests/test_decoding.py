@@ -0,0 +1,84 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from addresscomplete import AddressComplete
+from addresscomplete.Decoding import get_decoder, project
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+BODY = b'{"Items": [{"Id": "A", "Line1": "123 Main St", "City": "Ottawa"}]}'
+
+
+class TestGetDecoder(unittest.TestCase):
+    def test_json_decoder(self):
+        self.assertIs(get_decoder("json"), json.loads)
+        self.assertEqual(get_decoder()(BODY)["Items"][0]["Id"], "A")
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_decoder(self):
+        self.assertEqual(get_decoder("orjson")(BODY), json.loads(BODY))
+
+    @unittest.skipIf(msgspec is None, "msgspec is not installed")
+    def test_msgspec_decoder(self):
+        self.assertEqual(get_decoder("msgspec")(BODY), json.loads(BODY))
+
+    def test_auto_decoder(self):
+        self.assertEqual(get_decoder("auto")(BODY), json.loads(BODY))
+
+    def test_callable_passthrough(self):
+        decoder = Mock()
+        self.assertIs(get_decoder(decoder), decoder)
+
+    def test_unknown_decoder(self):
+        with self.assertRaises(ValueError):
+            get_decoder("yaml")
+
+    @patch("addresscomplete.Decoding.orjson", None)
+    def test_missing_library(self):
+        with self.assertRaises(ImportError):
+            get_decoder("orjson")
+
+
+class TestProject(unittest.TestCase):
+    def test_keeps_only_requested_fields(self):
+        response = json.loads(BODY)
+        projected = project(response, ["Line1", "PostalCode"])
+
+        self.assertEqual(projected, {"Items": [{"Line1": "123 Main St"}]})
+        self.assertIn("City", response["Items"][0])
+
+
+class TestClientDecoding(unittest.TestCase):
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_decodes_raw_content(self, mock_get):
+        mock_get.return_value = Mock(content=BODY)
+        decoder = Mock(side_effect=json.loads)
+        client = AddressComplete("test-key", decoder=decoder)
+
+        client.find("test")
+
+        decoder.assert_called_once_with(BODY)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_retrieve_projection(self, mock_get):
+        mock_get.return_value = Mock(content=BODY)
+        client = AddressComplete("test-key")
+
+        result = client.retrieve("A", fields=("Id", "City"))
+        results = client.retrieve_many(["A"], fields=("Line1",))
+
+        self.assertEqual(result, {"Items": [{"Id": "A", "City": "Ottawa"}]})
+        self.assertEqual(results, [{"Items": [{"Line1": "123 Main St"}]}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -46,6 +46,8 @@ from addresscomplete.ErrorHandling import (
     SandboxNotAvailableError,
     HTTPSRequiredError,
     AgreementNotSignedError,
+    get_error_class,
+    get_error_code,
     # Additional imports for new error codes
 )
 
@@ -468,5 +470,45 @@ class TestErrorCodeMaps(unittest.TestCase):
             self.assertIn(code, GENERAL_ERROR_CODE_MAP)
 
 
+
+class TestGetErrorCode(unittest.TestCase):
+    """Test error code extraction from decoded responses."""
+
+    def test_no_error_returns_none(self):
+        """Test that a successful response has no error code."""
+        self.assertIsNone(get_error_code({"Items": [{"Id": "A"}]}))
+        self.assertIsNone(get_error_code({"Items": []}))
+
+    def test_top_level_error(self):
+        """Test that a top-level Error field is returned."""
+        self.assertEqual(get_error_code({"Error": 2}), 2)
+
+    def test_error_in_first_item(self):
+        """Test that an Error in the first item is returned."""
+        self.assertEqual(get_error_code({"Items": [{"Error": "1001"}]}), 1001)
+
+    def test_non_numeric_error_kept_as_string(self):
+        """Test that non-numeric error codes are left unchanged."""
+        self.assertEqual(get_error_code({"Error": "abc"}), "abc")
+
+
+class TestGetErrorClass(unittest.TestCase):
+    """Test the precomputed code to class tables."""
+
+    def test_operation_specific_codes(self):
+        """Test that codes shared by find and retrieve map per operation."""
+        self.assertIs(get_error_class(1001, "find"), InvalidSearchTermError)
+        self.assertIs(get_error_class(1001, "retrieve"), IDInvalidError)
+
+    def test_general_codes(self):
+        """Test that general codes map the same for both operations."""
+        for operation in ("find", "retrieve"):
+            self.assertIs(get_error_class(2, operation), UnknownKeyError)
+
+    def test_unknown_code(self):
+        """Test that unmapped codes map to UnknownError."""
+        self.assertIs(get_error_class(9999, "find"), UnknownError)
+        self.assertIs(get_error_class("abc", "retrieve"), UnknownError)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import AddressComplete, AsyncAddressComplete
+from addresscomplete.ErrorHandling import (
+    IDInvalidError,
+    InvalidSearchTermError,
+    UnknownError,
+    UnknownKeyError,
+)
+from addresscomplete.FakeServer import (
+    FakeAddressCompleteServer,
+    lognormal_latency,
+    synthetic_addresses,
+)
+
+
+class TestFakeServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeAddressCompleteServer(addresses=200).start()
+        cls.client = AddressComplete("test-key", base_url=cls.server.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.client.close()
+        cls.server.stop()
+
+    def test_base_url_replaces_host(self):
+        self.assertTrue(self.client.find_endpoint.startswith(
+            f"{self.server.url}/addresscomplete/interactive/find/"
+        ))
+
+    def test_find_and_retrieve(self):
+        address = self.server.addresses[0]
+
+        found = self.client.find(address["Line1"], max_suggestions=3)
+        first = found["Items"][0]
+        details = self.client.retrieve(first["Id"])
+
+        self.assertLessEqual(len(found["Items"]), 3)
+        self.assertIn(address["Line1"], first["Text"])
+        self.assertEqual(details["Items"][0]["Line1"], first["Text"])
+
+    def test_street_containers_expand(self):
+        items = self.client.find_all("Main St", max_suggestions=500)
+
+        self.assertTrue(items)
+        self.assertTrue(all(item["Next"] == "Retrieve" for item in items))
+        self.assertTrue(all("Main St" in item["Text"] for item in items))
+
+    def test_error_injection(self):
+        with self.assertRaises(InvalidSearchTermError):
+            self.client.find("ERROR:1001")
+        with self.assertRaises(IDInvalidError):
+            self.client.retrieve("FAKE|missing")
+        with self.assertRaises(UnknownKeyError):
+            AddressComplete("", base_url=self.server.url).find("Main")
+
+    def test_random_errors(self):
+        with FakeAddressCompleteServer(error_rate=1.0) as server:
+            client = AddressComplete("test-key", base_url=server.url)
+            with self.assertRaises(UnknownError):
+                client.find("Main")
+            self.assertEqual(server.requests_served, 1)
+
+
+class TestSyntheticData(unittest.TestCase):
+    def test_addresses_are_reproducible(self):
+        self.assertEqual(synthetic_addresses(5, seed=1),
+                         synthetic_addresses(5, seed=1))
+
+    def test_lognormal_latency_median(self):
+        latency = lognormal_latency(median=0.02, sigma=0.5, seed=0)
+        samples = sorted(latency() for _ in range(1001))
+
+        self.assertAlmostEqual(samples[500], 0.02, delta=0.003)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestFakeServerAsync(unittest.IsolatedAsyncioTestCase):
+    async def test_async_client(self):
+        with FakeAddressCompleteServer(addresses=50) as server:
+            async with AsyncAddressComplete(
+                "test-key", base_url=server.url
+            ) as client:
+                details = await client.retrieve("FAKE|3")
+
+        self.assertEqual(details["Items"][0]["Id"], "FAKE|3")
+
+
+if __name__ == "__main__":
+    unittest.main()
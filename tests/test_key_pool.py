@@ -0,0 +1,184 @@
+import unittest
+import urllib.parse
+from unittest.mock import patch
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import AddressComplete, AsyncAddressComplete, KeyPool
+from addresscomplete.ErrorHandling import (
+    AccountOutOfCreditError,
+    IDInvalidError,
+    KeyDailyLimitExceededError,
+    KeyExpiredError,
+    KeyPoolExhaustedError,
+)
+
+from helpers import make_response
+
+DAY = 86400
+
+
+class KeyedSession:
+    """Answers each request with the error code set for its key."""
+
+    def __init__(self, errors=None):
+        self.errors = errors or {}
+        self.keys = []
+        self.headers = {}
+
+    def get(self, url, **kwargs):
+        query = urllib.parse.urlsplit(url).query
+        params = dict(urllib.parse.parse_qsl(query))
+        key = params["Key"]
+        self.keys.append(key)
+        if key in self.errors:
+            return make_response({"Items": [{"Error": self.errors[key]}]})
+        return make_response({"Items": [{"Id": params.get("Id", "")}]})
+
+    def close(self):
+        pass
+
+
+class AsyncKeyedSession(KeyedSession):
+    async def get(self, url, **kwargs):
+        return KeyedSession.get(self, url)
+
+    async def aclose(self):
+        pass
+
+
+class TestKeyPool(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("addresscomplete.KeyPool.time.time",
+                        return_value=10 * DAY + 100)
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_needs_a_key(self):
+        with self.assertRaises(ValueError):
+            KeyPool([])
+
+    def test_prefers_most_remaining_quota(self):
+        pool = KeyPool({"a": 10, "b": 3})
+
+        self.assertEqual([pool.acquire() for _ in range(7)], ["a"] * 7)
+        self.assertEqual(pool.acquire(), "b")
+        self.assertEqual(pool.acquire(), "a")
+        self.assertEqual(pool.stats["a"]["remaining"], 2)
+
+    def test_unknown_quotas_balance_usage(self):
+        pool = KeyPool(["a", "b", "c"])
+
+        self.assertEqual(sorted(pool.acquire() for _ in range(6)),
+                         ["a", "a", "b", "b", "c", "c"])
+        self.assertIsNone(pool.stats["a"]["remaining"])
+
+    def test_quota_exhaustion_resets_next_day(self):
+        pool = KeyPool({"a": 1})
+        pool.acquire()
+
+        with self.assertRaises(KeyPoolExhaustedError):
+            pool.acquire()
+        self.clock.return_value += DAY
+        self.assertEqual(pool.acquire(), "a")
+
+    def test_daily_limit_sets_key_aside_until_next_day(self):
+        pool = KeyPool(["a", "b"], day_start=3600)
+
+        self.assertTrue(pool.release("a", KeyDailyLimitExceededError()))
+        self.assertFalse(pool.stats["a"]["available"])
+        self.assertEqual(pool.stats["a"]["last_error"],
+                         "KeyDailyLimitExceededError")
+        self.assertEqual(pool.acquire(), "b")
+        self.clock.return_value = 11 * DAY + 3600
+        self.assertTrue(pool.stats["a"]["available"])
+
+    def test_expired_key_is_probed_after_cooldown(self):
+        pool = KeyPool(["a"], cooldown=60)
+        pool.release("a", KeyExpiredError())
+
+        with self.assertRaises(KeyPoolExhaustedError):
+            pool.acquire()
+        self.clock.return_value += 60
+        self.assertEqual(pool.acquire(), "a")
+        self.assertEqual(pool.rotations, 1)
+
+    def test_other_errors_keep_key(self):
+        pool = KeyPool({"a": 5})
+        pool.acquire()
+        pool.acquire()
+
+        self.assertFalse(pool.release("a", IDInvalidError()))
+        self.assertFalse(pool.release("a", requests.Timeout()))
+        self.assertEqual(pool.stats["a"]["used"], 2)
+        self.assertTrue(pool.stats["a"]["available"])
+
+
+class TestClientKeyPool(unittest.TestCase):
+    def test_rotates_to_another_key(self):
+        session = KeyedSession({"a": 8, "b": 3})
+        pool = KeyPool({"a": 100, "b": 50, "c": 10})
+        client = AddressComplete(pool, session=session)
+
+        self.assertEqual(client.retrieve("x"), {"Items": [{"Id": "x"}]})
+        self.assertEqual(session.keys, ["a", "b", "c"])
+        client.retrieve("y")
+        self.assertEqual(session.keys[-1], "c")
+        self.assertEqual(pool.rotations, 2)
+
+    def test_key_errors_rotate_in_non_raising_mode(self):
+        session = KeyedSession({"a": 16})
+        client = AddressComplete(KeyPool(["a", "b"]), session=session,
+                                 raise_errors=False)
+
+        self.assertTrue(client.find("main").ok)
+        self.assertEqual(session.keys, ["a", "b"])
+
+    def test_exhausted_pool_raises(self):
+        session = KeyedSession({"a": 3, "b": 3})
+        client = AddressComplete(KeyPool(["a", "b"]), session=session)
+
+        with self.assertRaises(KeyPoolExhaustedError):
+            client.find("main")
+        self.assertEqual(session.keys, ["a", "b"])
+
+    def test_other_errors_are_not_rotated(self):
+        session = KeyedSession({"a": 1001})
+        client = AddressComplete(KeyPool(["a", "b"]), session=session)
+
+        with self.assertRaises(IDInvalidError):
+            client.retrieve("x")
+        self.assertEqual(session.keys, ["a"])
+
+    def test_key_is_not_in_cache_key_or_single_key_urls(self):
+        client = AddressComplete(KeyPool(["a"]))
+
+        self.assertNotIn("Key=", client._find_url("x", "CAN", 10, "en"))
+        self.assertIn("Key=k", AddressComplete("k")._retrieve_url("x"))
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncClientKeyPool(unittest.IsolatedAsyncioTestCase):
+    async def test_rotates_to_another_key(self):
+        session = AsyncKeyedSession({"a": 3})
+        async with AsyncAddressComplete(KeyPool(["a", "b"]),
+                                        session=session) as client:
+            response = await client.retrieve("x")
+
+        self.assertEqual(response, {"Items": [{"Id": "x"}]})
+        self.assertEqual(session.keys, ["a", "b"])
+
+
+class TestKeyPoolErrors(unittest.TestCase):
+    def test_account_out_of_credit_is_a_key_error(self):
+        self.assertTrue(KeyPool.is_key_error(AccountOutOfCreditError))
+        self.assertFalse(KeyPool.is_key_error(IDInvalidError))
+
+
+if __name__ == "__main__":
+    unittest.main()
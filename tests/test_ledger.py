@@ -0,0 +1,187 @@
+import threading
+import time
+import unittest
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import (
+    AddressComplete,
+    AsyncAddressComplete,
+    CostLedger,
+    LRUCache,
+    PrefixIndex,
+)
+from addresscomplete.ErrorHandling import (
+    BudgetExceededError,
+    IDInvalidError,
+)
+from addresscomplete.FakeServer import FakeAddressCompleteServer
+
+
+class TestCostLedger(unittest.TestCase):
+    def setUp(self):
+        self.ledger = CostLedger(prices={"find": 0.5})
+
+    def test_records_by_labels(self):
+        with self.ledger.labels(tenant="acme"):
+            self.ledger.record("find", "api")
+            with self.ledger.labels(job=7):
+                self.ledger.record("retrieve", "api")
+                self.ledger.record("retrieve", "cache")
+        self.ledger.record("find", "index")
+
+        rows = {row["tenant"]: row for row in self.ledger.report("tenant")}
+        self.assertEqual(rows["acme"]["calls"], 3)
+        self.assertEqual(rows["acme"]["cost"], 1.5)
+        self.assertEqual(rows["acme"]["saved"], 1.0)
+        self.assertEqual(rows[None]["index"], 1)
+        self.assertEqual(rows[None]["saved"], 0.5)
+        job = [row for row in self.ledger.report() if "job" in row]
+        self.assertEqual(len(job), 1)
+        self.assertEqual((job[0]["job"], job[0]["operation"],
+                          job[0]["tenant"], job[0]["api"]),
+                         ("7", "retrieve", "acme", 1))
+
+    def test_reject_budget(self):
+        self.ledger.set_budget(1.0, tenant="acme")
+        with self.ledger.labels(tenant="acme"):
+            self.assertIsNone(self.ledger.check("retrieve"))
+            self.ledger.record("retrieve", "api")
+            with self.assertRaises(BudgetExceededError) as raised:
+                self.ledger.check("find")
+        self.assertEqual(raised.exception.labels, {"tenant": "acme"})
+        self.assertIsNone(self.ledger.check("find"))
+        self.assertEqual(self.ledger.report("tenant")[0]["rejected"], 1)
+
+    def test_degrade_budget(self):
+        self.ledger.set_budget(0, action="degrade")
+
+        self.assertEqual(self.ledger.check("find"), "degrade")
+        with self.assertRaises(BudgetExceededError):
+            self.ledger.check("retrieve")
+
+    def test_budgets_and_reset(self):
+        self.ledger.set_budget(5, operation="retrieve")
+        self.ledger.set_budget(3, operation="retrieve")
+        self.ledger.record("retrieve", "api")
+
+        self.assertEqual(self.ledger.budgets(), [{
+            "labels": {"operation": "retrieve"}, "limit": 3, "spent": 1.0,
+            "action": "reject",
+        }])
+        self.ledger.reset()
+        self.assertEqual(self.ledger.report(), [])
+        self.assertEqual(self.ledger.budgets()[0]["spent"], 0.0)
+        with self.assertRaises(ValueError):
+            self.ledger.set_budget(1, action="ignore")
+
+
+class TestClientLedger(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeAddressCompleteServer(addresses=100).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def client(self, ledger, **kwargs):
+        return AddressComplete("test-key", base_url=self.server.url,
+                               ledger=ledger, **kwargs)
+
+    def test_billable_and_free_outcomes(self):
+        ledger = CostLedger()
+        index = PrefixIndex(min_matches=1)
+        item = self.server.addresses[0]
+        with self.client(ledger, find_cache=LRUCache(),
+                         prefix_index=index) as client:
+            client.find("Main")
+            client.find("Main")
+            client.retrieve(item["Id"])
+            client.find(item["Line1"], max_suggestions=1)
+            with self.assertRaises(IDInvalidError):
+                client.retrieve("FAKE|missing")
+
+        rows = {row["operation"]: row for row in ledger.report()}
+        self.assertEqual(rows["find"]["api"], 1)
+        self.assertEqual(rows["find"]["cache"], 1)
+        self.assertEqual(rows["find"]["index"], 1)
+        self.assertEqual(rows["retrieve"]["api"], 1)
+        self.assertEqual(rows["retrieve"]["failed"], 1)
+        self.assertEqual(rows["retrieve"]["cost"], 1.0)
+
+    def test_labels_reach_worker_threads(self):
+        ledger = CostLedger()
+        with self.client(ledger) as client, ledger.labels(job="batch"):
+            client.retrieve_many(["FAKE|1", "FAKE|2", "FAKE|3"])
+
+        self.assertEqual(ledger.report("job"), [{
+            "job": "batch", "api": 3, "cache": 0, "coalesced": 0,
+            "index": 0, "failed": 0, "rejected": 0, "degraded": 0,
+            "calls": 3, "cost": 3.0, "saved": 0.0,
+        }])
+
+    def test_coalesced_calls_are_free(self):
+        ledger = CostLedger()
+        release = threading.Event()
+        with self.client(ledger, coalesce=True) as client:
+            fetch = client._fetch
+
+            def slow_fetch(*args):
+                release.wait(5)
+                return fetch(*args)
+
+            client._fetch = slow_fetch
+            threads = [threading.Thread(target=client.retrieve,
+                                        args=("FAKE|4",))
+                       for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            while client.single_flight.coalesced < 2:
+                time.sleep(0.01)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        row = ledger.report()[0]
+        self.assertEqual((row["api"], row["coalesced"]), (1, 2))
+
+    def test_budget_rejects_and_degrades(self):
+        ledger = CostLedger()
+        ledger.set_budget(1, tenant="small")
+        ledger.set_budget(0, action="degrade", tenant="free")
+        with self.client(ledger) as client:
+            with ledger.labels(tenant="small"):
+                client.retrieve("FAKE|5")
+                served = self.server.requests_served
+                with self.assertRaises(BudgetExceededError):
+                    client.retrieve("FAKE|6")
+            with ledger.labels(tenant="free"):
+                self.assertEqual(client.find("Main"), {"Items": []})
+            self.assertEqual(self.server.requests_served, served)
+            client.retrieve("FAKE|6")
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncClientLedger(unittest.IsolatedAsyncioTestCase):
+    async def test_records_async_calls(self):
+        ledger = CostLedger()
+        with FakeAddressCompleteServer(addresses=20) as server:
+            async with AsyncAddressComplete(
+                "test-key", base_url=server.url, ledger=ledger,
+                retrieve_cache=LRUCache(),
+            ) as client:
+                with ledger.labels(tenant="acme"):
+                    await client.retrieve("FAKE|1")
+                    await client.retrieve("FAKE|1")
+
+        row = ledger.report("tenant")[0]
+        self.assertEqual((row["tenant"], row["api"], row["cache"]),
+                         ("acme", 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
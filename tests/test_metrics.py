@@ -0,0 +1,130 @@
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+import requests
+
+from addresscomplete import AddressComplete, LRUCache, Metrics, RetryPolicy
+from addresscomplete.ErrorHandling import IDInvalidError
+from addresscomplete.Metrics import Histogram
+
+from helpers import make_response
+
+
+class TestHistogram(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(Histogram().quantile(0.5))
+
+    def test_quantiles_interpolate_within_buckets(self):
+        histogram = Histogram(buckets=(1.0, 2.0, 4.0))
+        for value in (0.5, 1.5, 1.5, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [1, 2, 1, 0])
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.sum, 6.5)
+        self.assertEqual(histogram.quantile(0.5), 1.5)
+        self.assertEqual(histogram.quantile(1.0), 4.0)
+
+    def test_overflow_reports_largest_bound(self):
+        histogram = Histogram(buckets=(1.0,))
+        histogram.observe(30.0)
+
+        self.assertEqual(histogram.quantile(0.99), 1.0)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(buckets=(0.1, 1.0))
+        self.metrics.observe_request("find", 0.05, 100)
+        self.metrics.observe_request("find", 0.5, 300)
+        self.metrics.count_error("find", "InvalidSearchTermError")
+        self.metrics.count_retry("find")
+
+    def test_snapshot(self):
+        find = self.metrics.snapshot()["operations"]["find"]
+
+        self.assertEqual(find["requests"], 2)
+        self.assertEqual(find["bytes"], 400)
+        self.assertEqual(find["retries"], 1)
+        self.assertEqual(find["errors"], {"InvalidSearchTermError": 1})
+        self.assertEqual(find["latency"]["count"], 2)
+        self.assertIsNotNone(find["latency"]["p99"])
+
+    def test_cache_hit_ratio(self):
+        cache = LRUCache()
+        cache.set("a", {})
+        cache.get("a")
+        cache.get("b")
+        self.metrics.register_cache("find", cache)
+
+        stats = self.metrics.snapshot()["caches"]["find"]
+
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_prometheus_export(self):
+        self.metrics.register_cache("retrieve", LRUCache())
+
+        text = self.metrics.to_prometheus()
+
+        self.assertIn("# TYPE addresscomplete_request_duration_seconds "
+                      "histogram", text)
+        self.assertIn('addresscomplete_request_duration_seconds_bucket'
+                      '{operation="find",le="0.1"} 1', text)
+        self.assertIn('addresscomplete_request_duration_seconds_bucket'
+                      '{operation="find",le="+Inf"} 2', text)
+        self.assertIn('addresscomplete_requests_total{operation="find"} 2',
+                      text)
+        self.assertIn('addresscomplete_errors_total{operation="find",'
+                      'error="InvalidSearchTermError"} 1', text)
+        self.assertIn('addresscomplete_cache_hits_total{cache="retrieve"} 0',
+                      text)
+
+    def test_reset(self):
+        self.metrics.reset()
+
+        self.assertEqual(self.metrics.snapshot()["operations"], {})
+
+    def test_serve(self):
+        server = self.metrics.serve(port=0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode()
+
+        self.assertEqual(body, self.metrics.to_prometheus())
+
+
+class TestClientMetrics(unittest.TestCase):
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_records_requests_errors_and_retries(self, mock_get):
+        mock_get.side_effect = [
+            requests.ConnectionError(),
+            make_response({"Items": [{"Id": "A"}]}),
+            make_response({"Error": 1001}),
+        ]
+        metrics = Metrics()
+        cache = LRUCache()
+        client = AddressComplete(
+            "test-key", metrics=metrics, retrieve_cache=cache,
+            retry_policy=RetryPolicy(max_attempts=2, backoff=0),
+        )
+
+        client.retrieve("A")
+        client.retrieve("A")
+        with self.assertRaises(IDInvalidError):
+            client.retrieve("bad")
+
+        snapshot = metrics.snapshot()
+        retrieve = snapshot["operations"]["retrieve"]
+        self.assertEqual(retrieve["requests"], 2)
+        self.assertEqual(retrieve["retries"], 1)
+        self.assertEqual(retrieve["errors"],
+                         {"ConnectionError": 1, "IDInvalidError": 1})
+        self.assertEqual(snapshot["caches"]["retrieve"]["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from addresscomplete import AddressComplete, PostalCodeIndex, PrefixIndex
+from addresscomplete.FakeServer import (
+    FakeAddressCompleteServer,
+    synthetic_addresses,
+)
+from addresscomplete.PostalIndex import compact_postal_code
+
+
+def address(id, line1, postal_code, city="Ottawa", country="CAN"):
+    return {"Id": id, "Line1": line1, "City": city, "ProvinceCode": "ON",
+            "PostalCode": postal_code, "CountryIso3": country}
+
+
+def count_in_child(path, postal_code, queue):
+    with PostalCodeIndex(path) as index:
+        queue.put(len(index.search(postal_code, limit=100)))
+
+
+class TestPostalCodeIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "postal.idx")
+        self.items = [
+            address("1", "1 Wellington St", "K1A 0A9"),
+            address("2", "3 Wellington St", "K1A 0A9"),
+            address("3", "24 Sussex Dr", "K1M 1M4"),
+            address("4", "100 Queen St W", "M5H 2N2", city="Toronto"),
+            address("5", "1 Main St", "90210", country="USA"),
+            address("6", "No postal code", ""),
+        ]
+        PostalCodeIndex.build(self.path, self.items)
+        self.index = PostalCodeIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        self.directory.cleanup()
+
+    def test_compact_postal_code(self):
+        self.assertEqual(compact_postal_code(" k1a-0a9"), "K1A0A9")
+
+    def test_build_skips_foreign_and_invalid_addresses(self):
+        count = PostalCodeIndex.build(self.path,
+                                      self.items + [{"Items": self.items}])
+
+        self.assertEqual(count, 4)
+        self.assertEqual(len(self.index), 4)
+
+    def test_search_full_code_and_fsa(self):
+        items = self.index.search("k1a 0a9")
+
+        self.assertEqual([item["Id"] for item in items], ["1", "2"])
+        self.assertEqual(items[0]["Description"], "Ottawa, ON, K1A 0A9")
+        self.assertEqual(len(self.index.search("K1")), 3)
+        self.assertEqual(len(self.index.search("K1", limit=2)), 2)
+        self.assertEqual(self.index.search("Wellington"), [])
+        self.assertEqual(self.index.search("K1Z"), [])
+
+    def test_places(self):
+        self.assertEqual(self.index.places("K1"), [("Ottawa", "ON")])
+        self.assertEqual(self.index.places("M5H 2N2"),
+                         [("Toronto", "ON")])
+
+    def test_lookup(self):
+        self.assertIsNone(self.index.lookup("K1"))
+        self.assertIsNone(self.index.lookup("K1A", country="USA"))
+        self.assertIsNone(self.index.lookup("K1A 0A9"))
+        response = self.index.lookup("K1A 0A9", max_suggestions=2)
+
+        self.assertEqual(len(response["Items"]), 2)
+        self.assertEqual((self.index.hits, self.index.misses), (1, 1))
+
+    def test_reload_after_rebuild(self):
+        self.assertFalse(self.index.reload())
+        PostalCodeIndex.build(self.path, self.items[:1])
+
+        self.assertTrue(self.index.reload())
+        self.assertEqual(len(self.index), 1)
+
+    def test_rejects_other_files(self):
+        other = os.path.join(self.directory.name, "other")
+        with open(other, "wb") as file:
+            file.write(b"not an index at all")
+
+        with self.assertRaises(ValueError):
+            PostalCodeIndex(other)
+
+    def test_shared_across_processes(self):
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(target=count_in_child,
+                                  args=(self.path, "K1", queue))
+        process.start()
+        process.join(30)
+
+        self.assertEqual(queue.get(timeout=5), 3)
+
+
+class TestClientPostalCodeIndex(unittest.TestCase):
+    def test_postal_code_find_is_answered_locally(self):
+        addresses = synthetic_addresses(200)
+        prefix_index = PrefixIndex()
+        for item in addresses:
+            prefix_index.add(item)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "postal.idx")
+            PostalCodeIndex.build(path, prefix_index.items())
+            postal_code = addresses[0]["PostalCode"]
+            with FakeAddressCompleteServer(addresses=200) as server, \
+                    PostalCodeIndex(path, min_matches=1) as index, \
+                    AddressComplete("test-key", base_url=server.url,
+                                    postal_index=index) as client:
+                found = client.find(postal_code.lower())
+                client.find(addresses[0]["Line1"])
+
+                self.assertEqual(server.requests_served, 1)
+        self.assertIn(addresses[0]["Id"],
+                      [item["Id"] for item in found["Items"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
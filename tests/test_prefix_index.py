@@ -0,0 +1,157 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import AddressComplete, AsyncAddressComplete, PrefixIndex
+from addresscomplete.FakeServer import FakeAddressCompleteServer
+from addresscomplete.PrefixIndex import normalize
+from addresscomplete.Tracing import Tracer
+
+
+def address(id, line1, city="Toronto", province="ON", postal_code="M5V 1J1",
+            country="CAN"):
+    return {"Id": id, "Line1": line1, "City": city,
+            "ProvinceCode": province, "PostalCode": postal_code,
+            "CountryIso3": country}
+
+
+class TestNormalize(unittest.TestCase):
+    def test_folds_case_accents_and_punctuation(self):
+        self.assertEqual(normalize("  12, Rue Sainte-Thérèse "),
+                         "12 rue sainte therese")
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.add(address("1", "100 Main St"))
+        self.index.add(address("2", "102 Main St", postal_code="M5V 1J2"))
+        self.index.add(address("3", "100 Queen St E", city="Ottawa",
+                               province="ON", postal_code="K1P 1J9"))
+
+    def test_search_by_prefix(self):
+        items = self.index.search("100 ")
+
+        self.assertEqual({item["Id"] for item in items}, {"1", "3"})
+        self.assertEqual(items[0]["Next"], "Retrieve")
+        self.assertEqual(items[0]["Description"], "Toronto, ON, M5V 1J1")
+
+    def test_search_ignores_case_and_punctuation(self):
+        items = self.index.search("100 MAIN ST., toronto")
+
+        self.assertEqual([item["Id"] for item in items], ["1"])
+
+    def test_search_by_postal_code(self):
+        self.assertEqual([item["Id"] for item in self.index.search("k1p1")],
+                         ["3"])
+        self.assertEqual(len(self.index.search("M5V 1J")), 2)
+
+    def test_country_filter_and_limit(self):
+        self.assertEqual(self.index.search("100", country="USA"), [])
+        self.assertEqual(len(self.index.search("10", limit=1)), 1)
+
+    def test_duplicates_are_skipped(self):
+        self.assertFalse(self.index.add(address("1", "100 Main St")))
+        self.assertEqual(len(self.index), 3)
+
+    def test_lookup_requires_enough_matches(self):
+        self.assertIsNone(self.index.lookup("10"))
+        self.assertIsNone(self.index.lookup("100", max_suggestions=10))
+        response = self.index.lookup("100", max_suggestions=2)
+
+        self.assertEqual(len(response["Items"]), 2)
+        self.assertEqual((self.index.hits, self.index.misses), (1, 2))
+
+    def test_min_matches(self):
+        index = PrefixIndex(min_matches=1)
+        index.add(address("1", "100 Main St"))
+
+        self.assertEqual(len(index.lookup("100 main")["Items"]), 1)
+
+    def test_search_spans_merged_runs(self):
+        index = PrefixIndex()
+        for number in range(20000):
+            index.add(address(str(number), f"{number} Main St",
+                              postal_code=""))
+
+        self.assertEqual(len(index), 20000)
+        self.assertLessEqual(len(index._runs), 5)
+        self.assertEqual([item["Text"] for item in index.search("1999")],
+                         ["1999 Main St"] + [f"{number} Main St"
+                                             for number in range(19990,
+                                                                 19999)])
+        self.assertEqual(index.search("19999 main")[0]["Id"], "19999")
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.jsonl")
+            self.index.save(path)
+            loaded = PrefixIndex()
+
+            self.assertEqual(loaded.load(path), 3)
+        self.assertEqual(loaded.search("100"), self.index.search("100"))
+
+
+class TestClientPrefixIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeAddressCompleteServer(addresses=200).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_find_is_answered_after_retrieve(self):
+        index = PrefixIndex(min_matches=1)
+        tracer = Tracer(slow_calls=10)
+        item = self.server.addresses[0]
+        with AddressComplete("test-key", base_url=self.server.url,
+                             prefix_index=index, tracer=tracer) as client:
+            client.retrieve(item["Id"], fields=("City",))
+            served = self.server.requests_served
+            found = client.find(item["Line1"], max_suggestions=1)
+
+            self.assertEqual(self.server.requests_served, served)
+            self.assertEqual(found["Items"][0]["Id"], item["Id"])
+            self.assertEqual(index.hits, 1)
+            self.assertIn("index", tracer.slowest()[-1].breakdown())
+
+            client.find("zzz", max_suggestions=1)
+            self.assertEqual(self.server.requests_served, served + 1)
+
+    def test_containers_and_errors_bypass_index(self):
+        index = PrefixIndex(min_matches=1)
+        with AddressComplete("test-key", base_url=self.server.url,
+                             prefix_index=index,
+                             raise_errors=False) as client:
+            self.assertFalse(client.retrieve("FAKE|missing").ok)
+            client.retrieve("FAKE|1")
+            result = client.find("x", container="FAKE|STREET|Main St")
+
+        self.assertTrue(result.ok)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.hits, 0)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncClientPrefixIndex(unittest.IsolatedAsyncioTestCase):
+    async def test_find_is_answered_after_retrieve(self):
+        index = PrefixIndex(min_matches=1)
+        with FakeAddressCompleteServer(addresses=50) as server:
+            item = server.addresses[5]
+            async with AsyncAddressComplete("test-key", base_url=server.url,
+                                            prefix_index=index) as client:
+                await client.retrieve(item["Id"])
+                found = await client.find(item["Line1"], max_suggestions=1)
+
+            self.assertEqual(server.requests_served, 1)
+        self.assertEqual(found["Items"][0]["Id"], item["Id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from addresscomplete import AddressComplete, RateLimiter, TokenBucket
+from addresscomplete.ErrorHandling import (
+    SurgeProtectorTriggeredError,
+    UnknownKeyError,
+    UserLookupLimitExceededError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("addresscomplete.RateLimit.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        bucket.reserve()
+        self.clock.now += 0.1
+        self.assertEqual(bucket.reserve(), 0)
+
+    def test_penalize_reduces_rate_and_recovers(self):
+        bucket = TokenBucket(rate=10, backoff=0.5, min_rate=1,
+                             recovery_time=9)
+        bucket.penalize()
+        self.assertEqual(bucket.rate, 5)
+        bucket.penalize()
+        self.assertEqual(bucket.rate, 2.5)
+
+        self.clock.now += 2
+        bucket.reserve()
+        self.assertAlmostEqual(bucket.rate, 4.5)
+        self.clock.now += 100
+        bucket.reserve()
+        self.assertEqual(bucket.rate, 10)
+
+    def test_penalize_respects_min_rate(self):
+        bucket = TokenBucket(rate=10, backoff=0.1, min_rate=2)
+        bucket.penalize()
+        self.assertEqual(bucket.rate, 2)
+        self.assertEqual(bucket.penalties, 1)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_shared_bucket_by_default(self):
+        limiter = RateLimiter(rate=5)
+        self.assertIs(limiter.bucket("a"), limiter.bucket("b"))
+
+    def test_per_key_buckets(self):
+        limiter = RateLimiter(rate=5, per_key=True)
+        self.assertIsNot(limiter.bucket("a"), limiter.bucket("b"))
+        self.assertIs(limiter.bucket("a"), limiter.bucket("a"))
+
+
+class TestClientRateLimiting(unittest.TestCase):
+    def _client(self, mock_get, payload):
+        mock_get.return_value = Mock(content=json.dumps(payload).encode())
+        limiter = Mock(spec=RateLimiter)
+        return AddressComplete("test-key", rate_limiter=limiter), limiter
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_acquires_before_each_request(self, mock_get):
+        client, limiter = self._client(mock_get, {"Items": []})
+        client.find("test")
+        client.retrieve("id")
+        self.assertEqual(limiter.acquire.call_count, 2)
+        limiter.acquire.assert_called_with("test-key")
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_surge_protector_penalizes(self, mock_get):
+        client, limiter = self._client(mock_get, {"Error": 10})
+        with self.assertRaises(SurgeProtectorTriggeredError):
+            client.find("test")
+        limiter.penalize.assert_called_once_with("test-key")
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_user_lookup_limit_penalizes(self, mock_get):
+        client, limiter = self._client(mock_get, {"Error": "17"})
+        with self.assertRaises(UserLookupLimitExceededError):
+            client.retrieve("id")
+        limiter.penalize.assert_called_once_with("test-key")
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_other_errors_do_not_penalize(self, mock_get):
+        client, limiter = self._client(mock_get, {"Error": 2})
+        with self.assertRaises(UnknownKeyError):
+            client.find("test")
+        limiter.penalize.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import gzip
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import AddressComplete, AsyncAddressComplete, LRUCache
+from addresscomplete.ErrorHandling import IDInvalidError, ReplayMissError
+from addresscomplete.FakeServer import FakeAddressCompleteServer
+from addresscomplete.Recording import (
+    AsyncRecordingSession,
+    AsyncReplaySession,
+    RecordingSession,
+    ReplaySession,
+    async_replay,
+    read_exchanges,
+    replay,
+)
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "traffic.jsonl.gz")
+        with FakeAddressCompleteServer(addresses=100) as server:
+            session = RecordingSession(cls.path)
+            with AddressComplete("secret-key", session=session,
+                                 base_url=server.url) as client:
+                cls.found = client.find("Main", max_suggestions=3)
+                cls.details = client.retrieve("FAKE|1")
+                client.find("Main", max_suggestions=3)
+                with cls.assertRaises(cls, IDInvalidError):
+                    client.retrieve("FAKE|missing")
+            cls.recorded = session.recorded
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_recording_omits_key(self):
+        exchanges = list(read_exchanges(self.path))
+
+        self.assertEqual(self.recorded, 4)
+        self.assertEqual([exchange["op"] for exchange in exchanges],
+                         ["find", "retrieve", "find", "retrieve"])
+        self.assertEqual(exchanges[1]["params"]["Id"], "FAKE|1")
+        with gzip.open(self.path, "rt") as file:
+            self.assertNotIn("secret-key", file.read())
+
+    def test_replay_answers_offline(self):
+        client = AddressComplete("other-key", session=ReplaySession(self.path))
+
+        self.assertEqual(client.find("Main", max_suggestions=3), self.found)
+        self.assertEqual(client.retrieve("FAKE|1"), self.details)
+        with self.assertRaises(IDInvalidError):
+            client.retrieve("FAKE|missing")
+        with self.assertRaises(ReplayMissError):
+            client.retrieve("FAKE|2")
+
+    def test_replay_with_recorded_latency(self):
+        session = ReplaySession(self.path, speed=2.0)
+        client = AddressComplete("key", session=session)
+
+        with patch("addresscomplete.Recording.time.sleep") as sleep:
+            client.retrieve("FAKE|1")
+
+        exchange = list(read_exchanges(self.path))[1]
+        sleep.assert_called_once_with(exchange["elapsed"] / 2.0)
+
+    def test_replay_traffic_through_client(self):
+        cache = LRUCache()
+        client = AddressComplete("key", session=ReplaySession(self.path),
+                                 find_cache=cache)
+
+        summary = replay(client, self.path, max_workers=1)
+
+        self.assertEqual(summary["calls"], 4)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(cache.stats["hits"], 1)
+
+    def test_replay_reads_the_recording_lazily(self):
+        read = []
+
+        def exchanges(path):
+            for number in range(200):
+                read.append(number)
+                yield {"t": 0, "op": "retrieve", "params": {"Id": "x"}}
+
+        release = threading.Event()
+        client = Mock()
+        client.retrieve.side_effect = lambda id: release.wait(5)
+        summaries = []
+        with patch("addresscomplete.Recording.read_exchanges", exchanges):
+            worker = threading.Thread(target=lambda: summaries.append(
+                replay(client, "unused", max_workers=2)
+            ))
+            worker.start()
+            time.sleep(0.2)
+            self.assertLessEqual(len(read), 5)
+            release.set()
+            worker.join()
+
+        self.assertEqual(summaries[0]["calls"], 200)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncReplay(unittest.IsolatedAsyncioTestCase):
+    async def test_async_record_and_replay(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "traffic.jsonl.gz")
+            with FakeAddressCompleteServer(addresses=10) as server:
+                async with AsyncAddressComplete(
+                    "key", base_url=server.url,
+                    session=AsyncRecordingSession(path),
+                ) as client:
+                    recorded = await client.retrieve("FAKE|1")
+            client = AsyncAddressComplete("key",
+                                          session=AsyncReplaySession(path))
+
+            replayed = await client.retrieve("FAKE|1")
+            summary = await async_replay(client, path)
+
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(summary["calls"], 1)
+        self.assertEqual(summary["errors"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import sys
+import unittest
+
+from addresscomplete import Address, FindItem, LookupResult
+from addresscomplete.ErrorHandling import IDInvalidError
+
+RETRIEVE_ITEM = {
+    "Id": "CA|CP|B|123",
+    "DomesticId": "123",
+    "Language": "ENG",
+    "Company": "",
+    "BuildingNumber": "123",
+    "Street": "Main St",
+    "Line1": "123 Main St",
+    "Line2": "",
+    "City": "Toronto",
+    "Province": "ON",
+    "ProvinceName": "Ontario",
+    "ProvinceCode": "ON",
+    "PostalCode": "M5V 3L9",
+    "CountryIso2": "CA",
+    "CountryName": "Canada",
+    "Label": "123 Main St\nTORONTO ON  M5V 3L9\nCANADA",
+    "Type": "Residential",
+    "Field1": "",
+}
+
+
+class TestFindItem(unittest.TestCase):
+    def test_from_response(self):
+        response = {"Items": [
+            {"Id": "A", "Text": "123 Main St", "Next": "Retrieve"},
+            {"Id": "B", "Text": "Main St", "Next": "Find"},
+        ]}
+        items = FindItem.from_response(response)
+
+        self.assertEqual([item.Id for item in items], ["A", "B"])
+        self.assertEqual(items[1].Next, "Find")
+        self.assertEqual(items[0].Description, "")
+
+    def test_has_no_instance_dict(self):
+        item = FindItem.from_dict({"Id": "A"})
+        self.assertFalse(hasattr(item, "__dict__"))
+        with self.assertRaises(AttributeError):
+            item.Unknown = 1
+
+
+class TestAddress(unittest.TestCase):
+    def test_slotted_fields(self):
+        address = Address.from_dict(RETRIEVE_ITEM)
+        self.assertEqual(address.Line1, "123 Main St")
+        self.assertEqual(address.PostalCode, "M5V 3L9")
+        self.assertEqual(address.Line2, "")
+        self.assertFalse(hasattr(address, "__dict__"))
+
+    def test_rarely_used_fields_are_lazy(self):
+        address = Address.from_dict(RETRIEVE_ITEM)
+        self.assertEqual(address.ProvinceName, "Ontario")
+        self.assertEqual(address.Label.splitlines()[1], "TORONTO ON  M5V 3L9")
+        self.assertEqual(address.Field1, "")
+        self.assertEqual(address.Barcode, "")
+        self.assertNotIn("Field1", dict(address._extra))
+        with self.assertRaises(AttributeError):
+            address.NotAField
+
+    def test_repeated_strings_are_interned(self):
+        first = Address.from_dict(RETRIEVE_ITEM)
+        second = Address.from_dict(
+            {key: "".join(list(value)) for key, value in RETRIEVE_ITEM.items()}
+        )
+        self.assertIs(first.City, second.City)
+        self.assertIs(first.ProvinceName, second.ProvinceName)
+        self.assertIs(first.City, sys.intern("Toronto"))
+
+    def test_round_trip(self):
+        address = Address.from_dict(RETRIEVE_ITEM)
+        data = address.to_dict()
+        self.assertEqual(data["ProvinceName"], "Ontario")
+        self.assertEqual(Address.from_dict(data), address)
+
+    def test_hashable(self):
+        first = Address.from_dict(RETRIEVE_ITEM)
+        same = Address.from_dict(dict(RETRIEVE_ITEM))
+        other = Address.from_dict({**RETRIEVE_ITEM, "Id": "CA|CP|B|124"})
+        items = {FindItem.from_dict({"Id": "1"}),
+                 FindItem.from_dict({"Id": "1"})}
+
+        self.assertEqual(len({first, same, other}), 2)
+        self.assertEqual({first: "seen"}[same], "seen")
+        self.assertEqual(len(items), 1)
+
+    def test_smaller_than_dict(self):
+        address = Address.from_dict(RETRIEVE_ITEM)
+        size = sys.getsizeof(address) + sys.getsizeof(address._extra)
+        self.assertLess(size, sys.getsizeof(dict(RETRIEVE_ITEM)))
+
+
+class TestLookupResult(unittest.TestCase):
+    def test_success(self):
+        result = LookupResult({"Items": []})
+
+        self.assertTrue(result.ok)
+        self.assertEqual(result.unwrap(), {"Items": []})
+
+    def test_failure(self):
+        result = LookupResult(None, IDInvalidError, 1001)
+
+        self.assertFalse(result.ok)
+        self.assertEqual(repr(result),
+                         "LookupResult(IDInvalidError, error_code=1001)")
+        with self.assertRaises(IDInvalidError) as raised:
+            result.unwrap()
+        self.assertEqual(raised.exception.error_code, 1001)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+import asyncio
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import (
+    AddressComplete,
+    AsyncAddressComplete,
+    CircuitBreaker,
+    RetryPolicy,
+)
+from addresscomplete.ErrorHandling import (
+    AccountSuspendedError,
+    CircuitOpenError,
+    IDInvalidError,
+    KeyExpiredError,
+    NoResponseError,
+    SurgeProtectorTriggeredError,
+    UnknownKeyError,
+)
+from addresscomplete.Retry import is_transient
+
+from helpers import make_response
+
+
+def http_error(status_code):
+    return requests.HTTPError(response=Mock(status_code=status_code))
+
+
+class TestIsTransient(unittest.TestCase):
+    def test_transient_errors(self):
+        for error in (requests.Timeout(), requests.ConnectionError(),
+                      http_error(503), http_error(429), NoResponseError(),
+                      SurgeProtectorTriggeredError()):
+            self.assertTrue(is_transient(error), error)
+
+    def test_non_transient_errors(self):
+        for error in (http_error(404), UnknownKeyError(), IDInvalidError(),
+                      ValueError()):
+            self.assertFalse(is_transient(error), error)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_fatal_errors_never_retried(self):
+        policy = RetryPolicy(retryable=lambda error: True)
+        for error in (UnknownKeyError(), KeyExpiredError(),
+                      AccountSuspendedError()):
+            self.assertFalse(policy.is_retryable(error))
+        self.assertTrue(policy.is_retryable(IDInvalidError()))
+
+    def test_exponential_backoff_without_jitter(self):
+        policy = RetryPolicy(backoff=0.1, max_backoff=0.5, jitter=False)
+        self.assertEqual(
+            [policy.delay(attempt) for attempt in range(1, 5)],
+            [0.1, 0.2, 0.4, 0.5],
+        )
+
+    def test_full_jitter_stays_within_backoff(self):
+        policy = RetryPolicy(backoff=1, max_backoff=10)
+        for _ in range(100):
+            self.assertTrue(0 <= policy.delay(3) <= 4)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        patcher = patch("addresscomplete.Retry.time.monotonic",
+                        lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record(requests.Timeout())
+        breaker.before_call()
+        breaker.record(requests.Timeout())
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        self.assertEqual(breaker.rejected, 1)
+
+    def test_non_transient_error_counts_as_success(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record(requests.Timeout())
+        breaker.record(IDInvalidError())
+        breaker.record(requests.Timeout())
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record(requests.Timeout())
+        self.now = 10
+
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record(None)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        breaker.before_call()
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+        for _ in range(3):
+            breaker.record(requests.Timeout())
+        self.now = 10
+        breaker.before_call()
+        breaker.record(requests.Timeout())
+
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_released_probe_lets_next_call_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record(requests.Timeout())
+        self.now = 10
+        breaker.before_call()
+
+        breaker.release()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+    def test_stale_probe_is_replaced(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record(requests.Timeout())
+        self.now = 10
+        breaker.before_call()
+
+        self.now = 15
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        self.now = 20
+        breaker.before_call()
+        breaker.record(None)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+@patch("addresscomplete.AddressComplete.time.sleep")
+@patch("addresscomplete.AddressComplete.requests.Session.get")
+class TestClientRetries(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, jitter=False)
+
+    def test_retries_transient_then_succeeds(self, mock_get, mock_sleep):
+        mock_get.side_effect = [
+            requests.ConnectionError(),
+            make_response({"Error": 1005}),
+            make_response({"Items": []}),
+        ]
+        client = AddressComplete("test-key", retry_policy=self.policy)
+
+        self.assertEqual(client.find("test"), {"Items": []})
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(
+            [call[0][0] for call in mock_sleep.call_args_list], [0.1, 0.2]
+        )
+
+    def test_gives_up_after_max_attempts(self, mock_get, mock_sleep):
+        mock_get.side_effect = requests.Timeout()
+        client = AddressComplete("test-key", retry_policy=self.policy)
+
+        with self.assertRaises(requests.Timeout):
+            client.retrieve("id")
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_fatal_error_not_retried(self, mock_get, mock_sleep):
+        mock_get.return_value = make_response({"Error": 16})
+        client = AddressComplete("test-key", retry_policy=self.policy)
+
+        with self.assertRaises(KeyExpiredError):
+            client.find("test")
+        self.assertEqual(mock_get.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_open_circuit_fails_fast(self, mock_get, mock_sleep):
+        mock_get.side_effect = requests.ConnectionError()
+        client = AddressComplete(
+            "test-key",
+            circuit_breaker=CircuitBreaker(failure_threshold=2),
+        )
+
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                client.find("test")
+        with self.assertRaises(CircuitOpenError):
+            client.find("test")
+        self.assertEqual(mock_get.call_count, 2)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    async def test_cancelled_probe_is_released(self):
+        started = asyncio.Event()
+        hang = asyncio.Event()
+
+        async def handler(request):
+            if not hang.is_set():
+                return httpx.Response(200, json={"Items": []})
+            started.set()
+            await asyncio.sleep(60)
+
+        now = [0.0]
+        patcher = patch("addresscomplete.Retry.time.monotonic",
+                        lambda: now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record(requests.Timeout())
+        now[0] = 10
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncAddressComplete("test-key", session=session,
+                                        circuit_breaker=breaker) as client:
+            hang.set()
+            probe = asyncio.ensure_future(client.find("1"))
+            await started.wait()
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            probe.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await probe
+            hang.clear()
+
+            self.assertEqual(await client.find("12"), {"Items": []})
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
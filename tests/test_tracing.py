@@ -0,0 +1,128 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+from addresscomplete import (
+    AddressComplete,
+    AsyncAddressComplete,
+    LRUCache,
+    Tracer,
+)
+from addresscomplete.ErrorHandling import IDInvalidError
+
+from helpers import make_response
+
+
+class TestTracer(unittest.TestCase):
+    def test_callbacks_and_breakdown(self):
+        spans = []
+        traces = []
+        tracer = Tracer(on_span=lambda trace, span: spans.append(span.name),
+                        on_trace=traces.append)
+
+        trace = tracer.start("find", "key")
+        trace.add("send", 0.0, 0.25)
+        trace.add("backoff", 0.25, 1.0)
+        trace.add("send", 1.25, 0.5)
+        trace.finish(IDInvalidError())
+
+        self.assertEqual(spans, ["send", "backoff", "send"])
+        self.assertEqual(traces, [trace])
+        self.assertEqual(trace.breakdown(), {"send": 0.75, "backoff": 1.0})
+        self.assertIs(trace.error, IDInvalidError)
+
+    def test_keeps_slowest_calls(self):
+        tracer = Tracer(slow_calls=2)
+        for duration in (0.3, 0.1, 0.5, 0.2):
+            trace = tracer.start("retrieve", duration)
+            with patch("addresscomplete.Tracing.time.perf_counter",
+                       return_value=trace.started + duration):
+                trace.finish()
+
+        self.assertEqual([trace.key for trace in tracer.slowest()],
+                         [0.5, 0.3])
+        tracer.clear()
+        self.assertEqual(tracer.slowest(), [])
+
+    def test_httpx_hook(self):
+        trace = Tracer().start("find", "key")
+        hook = trace.httpx_hook()
+
+        async def replay():
+            for event in ("connection.connect_tcp.started",
+                          "connection.connect_tcp.complete",
+                          "connection.start_tls.started",
+                          "connection.start_tls.complete",
+                          "http11.send_request_headers.started",
+                          "http11.send_request_headers.complete",
+                          "http11.receive_response_headers.started",
+                          "http11.receive_response_headers.complete",
+                          "http11.receive_response_body.started",
+                          "http11.receive_response_body.complete",
+                          "http11.response_closed.started"):
+                await hook(event, {})
+
+        asyncio.run(replay())
+
+        self.assertEqual(
+            list(trace.breakdown()),
+            ["acquire", "connect", "tls", "send", "first_byte", "read"],
+        )
+
+
+class TestClientTracing(unittest.TestCase):
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_sync_phases(self, mock_get):
+        mock_get.return_value = make_response({"Items": []})
+        tracer = Tracer(slow_calls=5)
+        client = AddressComplete("test-key", tracer=tracer,
+                                 find_cache=LRUCache())
+
+        client.find("123 Main")
+
+        self.assertTrue(mock_get.call_args[1]["stream"])
+        trace, = tracer.slowest()
+        self.assertEqual(trace.key, ("123 Main", "CAN", 10, "en", None))
+        self.assertEqual(
+            list(trace.breakdown()),
+            ["build", "cache", "first_byte", "read", "decode", "classify"],
+        )
+        self.assertIsNone(trace.error)
+
+    @patch("addresscomplete.AddressComplete.requests.Session.get")
+    def test_sync_error_is_recorded(self, mock_get):
+        mock_get.return_value = make_response({"Error": 1001})
+        tracer = Tracer(slow_calls=5)
+        client = AddressComplete("test-key", tracer=tracer)
+
+        with self.assertRaises(IDInvalidError):
+            client.retrieve("bad")
+
+        self.assertIs(tracer.slowest()[0].error, IDInvalidError)
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncClientTracing(unittest.IsolatedAsyncioTestCase):
+    async def test_async_phases(self):
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"Items": []})
+        )
+        tracer = Tracer(slow_calls=5)
+        async with AsyncAddressComplete(
+            "test-key", tracer=tracer,
+            session=httpx.AsyncClient(transport=transport),
+        ) as client:
+            await client.retrieve("A")
+
+        trace, = tracer.slowest()
+        self.assertEqual(list(trace.breakdown()),
+                         ["build", "decode", "classify"])
+
+
+if __name__ == "__main__":
+    unittest.main()
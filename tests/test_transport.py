@@ -0,0 +1,104 @@
+import socket
+import unittest
+import warnings
+from unittest.mock import patch
+
+import requests
+from urllib3.util import Retry
+
+try:
+    import httpx
+    import h2
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = h2 = None
+
+from addresscomplete import AddressComplete, AsyncAddressComplete
+from addresscomplete.FakeServer import FakeAddressCompleteServer
+from addresscomplete.Transport import (
+    HTTP2Session,
+    _retries,
+    _timeout,
+    resolve_http2,
+)
+
+
+class TestResolveHTTP2(unittest.TestCase):
+    def test_not_requested(self):
+        self.assertFalse(resolve_http2(False))
+
+    def test_falls_back_without_h2(self):
+        with patch("addresscomplete.Transport.h2", None), \
+                warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            client = AddressComplete("test-key", http2=True)
+
+        self.assertIsInstance(client.session, requests.Session)
+        self.assertEqual(caught[0].category, RuntimeWarning)
+        self.assertIn("HTTP/1.1", str(caught[0].message))
+
+
+@unittest.skipIf(h2 is None, "httpx and h2 are not installed")
+class TestHTTP2Session(unittest.TestCase):
+    def test_client_uses_multiplexed_session(self):
+        client = AddressComplete("test-key", http2=True, pool_maxsize=4,
+                                 keep_alive=False)
+        pool = client.session.client._transport._pool
+
+        self.assertIsInstance(client.session, HTTP2Session)
+        self.assertTrue(pool._http2)
+        self.assertEqual(pool._max_connections, 4)
+        self.assertNotEqual(client.session.headers.get("Connection"),
+                            "close")
+        client.close()
+
+    def test_timeouts(self):
+        self.assertIsNone(_timeout(None))
+        self.assertEqual(_timeout(2.5), 2.5)
+        self.assertEqual(_timeout((1, 5)),
+                         httpx.Timeout(None, connect=1, read=5))
+
+    def test_falls_back_to_http11(self):
+        with FakeAddressCompleteServer(addresses=20) as server, \
+                AddressComplete("test-key", base_url=server.url,
+                                http2=True) as client:
+            details = client.retrieve("FAKE|2")
+            response = client.session.get(f"{server.url}/missing")
+
+        self.assertEqual(details["Items"][0]["Id"], "FAKE|2")
+        self.assertEqual(response.raw.http_version, "HTTP/1.1")
+        with self.assertRaises(requests.HTTPError):
+            response.raise_for_status()
+
+    def test_connection_errors_are_requests_errors(self):
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            port = listener.getsockname()[1]
+        client = AddressComplete("test-key",
+                                 base_url=f"http://127.0.0.1:{port}",
+                                 http2=True, max_retries=Retry(connect=1))
+        with client, self.assertRaises(requests.ConnectionError):
+            client.find("Main")
+
+    def test_retries(self):
+        self.assertEqual(_retries(2), 2)
+        self.assertEqual(_retries(Retry(total=5, connect=1)), 1)
+        self.assertEqual(_retries(Retry(total=3)), 3)
+        with self.assertRaises(TypeError):
+            _retries(Retry(total=None))
+
+
+@unittest.skipIf(h2 is None, "httpx and h2 are not installed")
+class TestAsyncHTTP2(unittest.IsolatedAsyncioTestCase):
+    async def test_async_client(self):
+        with FakeAddressCompleteServer(addresses=20) as server:
+            async with AsyncAddressComplete("test-key", base_url=server.url,
+                                            http2=True) as client:
+                pool = client.session._transport._pool
+                details = await client.retrieve("FAKE|3")
+
+        self.assertTrue(pool._http2)
+        self.assertEqual(details["Items"][0]["Id"], "FAKE|3")
+
+
+if __name__ == "__main__":
+    unittest.main()